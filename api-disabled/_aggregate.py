@@ -0,0 +1,113 @@
+"""
+Concurrent multi-submolt aggregation
+====================================
+
+Fetches many sub-molts at once and merges their posts into one
+newest-first list. Blocking fetches run on worker threads (sharing the
+pooled HTTP session) under an asyncio scheduler that enforces:
+
+    - a global concurrency limit (semaphore)
+    - a per-host token-bucket rate limit
+
+Per-sub-molt lists are merged with a heap-based k-way merge on
+``createdAt`` and de-duplicated by post id, so a merge costs
+O(limit * log k) instead of re-sorting everything.
+"""
+
+import time
+import heapq
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from _trace import note
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` requests/second with bursts up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def merge_newest(post_lists, limit: int) -> list:
+    """k-way merge of newest-first post lists, de-duplicated by id."""
+    merged = []
+    seen = set()
+    ordered = heapq.merge(*post_lists, key=lambda p: p.get('createdAt') or '', reverse=True)
+    for post in ordered:
+        post_id = post.get('id')
+        if post_id in seen:
+            continue
+        seen.add(post_id)
+        merged.append(post)
+        if len(merged) >= limit:
+            break
+    return merged
+
+
+async def fetch_all(submolt_ids, fetch, concurrency: int = 32,
+                    rate: float = 50.0, burst: int = 50, host: str = 'molthub'):
+    """Run ``fetch(submolt_id)`` for every id concurrently.
+
+    Args:
+        fetch: Blocking callable returning ``(posts, changed)`` for one id
+        concurrency: Maximum fetches in flight
+        rate, burst: Token-bucket limit for requests to ``host``
+
+    Returns:
+        Dict of submolt_id -> ``(posts, changed)``, or the exception raised
+        for that sub-molt.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    buckets = {host: TokenBucket(rate, burst)}
+
+    # The default executor is sized by CPU count, which would silently cap
+    # I/O-bound fetches well below ``concurrency``
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='submolt') as executor:
+        async def one(submolt_id):
+            async with semaphore:
+                await buckets[host].acquire()
+                return await loop.run_in_executor(executor, fetch, submolt_id)
+
+        results = await asyncio.gather(*(one(sid) for sid in submolt_ids), return_exceptions=True)
+    return dict(zip(submolt_ids, results))
+
+
+def aggregate(submolt_ids, fetch, limit: int, **limits):
+    """Fetch and merge several sub-molts from synchronous code.
+
+    Sub-molts that fail are logged and left out, so one broken sub-molt
+    can't take the merged feed down.
+
+    Returns:
+        Tuple of (merged posts newest first, changed flag)
+    """
+    results = asyncio.run(fetch_all(list(submolt_ids), fetch, **limits))
+    post_lists = []
+    changed = False
+    for submolt_id, result in results.items():
+        if isinstance(result, BaseException):
+            note('submolt_error', submolt=submolt_id, error=str(result))
+            continue
+        posts, submolt_changed = result
+        post_lists.append(posts)
+        changed = changed or submolt_changed
+    if not post_lists and results:
+        raise RuntimeError("All sub-molt fetches failed")
+    return merge_newest(post_lists, limit), changed
@@ -0,0 +1,90 @@
+"""
+HTTP conditional request helpers
+================================
+
+Strong ETags, Last-Modified dates and If-None-Match / If-Modified-Since
+evaluation (RFC 9110 section 13) shared by both feed handlers.
+
+Each content coding of a body is a different representation, so gzip and
+br responses carry their own ETag (``"<tag>-gzip"``, see variant_etag). A
+cache holding one coding must not revalidate it into another; the coding
+suffix is dropped again when If-None-Match is compared, since a 304 sends
+no body and any coding's tag proves the client has the current content.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+
+from _dates import format_rfc822
+from _request import get_header
+
+
+def strong_etag(body) -> str:
+    """Quoted strong ETag derived from the response body."""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+# Suffixes variant_etag appends for each compressed coding
+CODING_SUFFIXES = ('-gzip', '-br')
+
+
+def variant_etag(etag: str, coding: str) -> str:
+    """ETag of one content coding of a representation."""
+    if not etag or coding == 'identity':
+        return etag
+    return f'{etag[:-1]}-{coding}"'
+
+
+def http_date(timestamp: float) -> str:
+    """Format a POSIX timestamp as an IMF-fixdate (Last-Modified style)."""
+    return format_rfc822(datetime.fromtimestamp(int(timestamp), timezone.utc))
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith('W/'):
+        tag = tag[2:]
+    for suffix in CODING_SUFFIXES:
+        if tag.endswith(suffix + '"'):
+            return tag[:-len(suffix) - 1] + '"'
+    return tag
+
+
+def is_not_modified(request, etag: str = None, last_modified: float = None) -> bool:
+    """Whether a GET/HEAD for this representation can be answered with 304.
+
+    If-None-Match takes precedence over If-Modified-Since and uses weak
+    comparison, as RFC 9110 requires for GET.
+    """
+    if_none_match = get_header(request, 'If-None-Match')
+    if if_none_match is not None:
+        if not etag:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        current = _opaque(etag)
+        return any(_opaque(tag) == current for tag in if_none_match.split(','))
+
+    if_modified_since = get_header(request, 'If-Modified-Since')
+    if if_modified_since is not None and last_modified is not None:
+        # email.utils is slow to import; most requests never get here
+        from email.utils import parsedate_to_datetime
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return False
+        # HTTP dates have one-second resolution
+        return int(last_modified) <= int(since)
+    return False
+
+
+def validator_headers(etag: str = None, last_modified: float = None) -> dict:
+    """ETag / Last-Modified response headers for a representation."""
+    headers = {}
+    if etag:
+        headers['ETag'] = etag
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+    return headers
@@ -0,0 +1,171 @@
+"""
+Date parsing and formatting for feeds
+=====================================
+
+Strict ISO 8601 parsing and locale-independent RFC 822 / RFC 3339
+formatting, memoized with LRU caches: feeds re-render the same timestamps
+on every build, so each distinct string is parsed and formatted once.
+
+Unparsable input never turns into "now" (which would change pubDates on
+every build and break reader de-duplication). Parsers return None, count
+the failure in ``stats`` and as the ``dates.invalid`` trace counter, and
+keep the latest offending values in ``invalid_samples``; a value not seen
+there recently is also logged as an ``invalid_date`` trace event.
+"""
+
+import re
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from _trace import count, note
+
+CACHE_SIZE = 4096
+
+# English names regardless of the process locale (strftime %a/%b are not)
+_DAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+           'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# The shape upstream APIs actually send, which fromisoformat parses directly
+_CANONICAL_RE = re.compile(
+    r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d{3}|\.\d{6})?(?:Z|[+-]\d{2}:\d{2})'
+)
+
+ISO_8601_RE = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,9}))?)?'
+    r'(Z|[+-]\d{2}(?::?\d{2})?)?)?'
+)
+
+stats = {'parsed': 0, 'invalid': 0}
+invalid_samples = deque(maxlen=20)
+
+
+def _invalid(value):
+    stats['invalid'] += 1
+    count('dates.invalid')
+    if value not in invalid_samples:
+        note('invalid_date', value=repr(value))
+    invalid_samples.append(value)
+    return None
+
+
+def _offset(text):
+    if text is None or text == 'Z':
+        return timezone.utc
+    sign = -1 if text[0] == '-' else 1
+    digits = text[1:].replace(':', '')
+    minutes = int(digits[:2]) * 60 + (int(digits[2:4]) if len(digits) > 2 else 0)
+    return timezone(sign * timedelta(minutes=minutes))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse(value):
+    if _CANONICAL_RE.fullmatch(value):
+        try:
+            dt = datetime.fromisoformat(value[:-1] + '+00:00' if value[-1] == 'Z' else value)
+        except ValueError:
+            return None
+        stats['parsed'] += 1
+        return dt.astimezone(timezone.utc)
+
+    match = ISO_8601_RE.fullmatch(value)
+    if not match:
+        return None
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    try:
+        dt = datetime(
+            int(year), int(month), int(day),
+            int(hour or 0), int(minute or 0), int(second or 0),
+            int((fraction or '0')[:6].ljust(6, '0')),
+            tzinfo=_offset(offset),
+        )
+    except ValueError:
+        # e.g. month 13 or February 30th
+        return None
+    stats['parsed'] += 1
+    return dt.astimezone(timezone.utc)
+
+
+def parse_iso8601(value):
+    """Parse an ISO 8601 date or timestamp as an aware UTC datetime.
+
+    Accepts ``YYYY-MM-DD`` and ``YYYY-MM-DD[T ]HH:MM[:SS[.fff]][Z|±HH[:MM]]``;
+    timestamps without an offset are taken as UTC. Returns None (and records
+    the failure) for anything else, including empty values.
+    """
+    if not value:
+        return None
+    if not isinstance(value, str):
+        return _invalid(value)
+    dt = _parse(value)
+    if dt is None:
+        return _invalid(value)
+    return dt
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def format_rfc822(dt):
+    """RFC 822 date as used by RSS, e.g. ``Fri, 13 Feb 2026 13:14:45 GMT``.
+
+    Naive datetimes are taken as UTC.
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    elif dt.tzinfo is not timezone.utc:
+        dt = dt.astimezone(timezone.utc)
+    return '%s, %02d %s %04d %02d:%02d:%02d GMT' % (
+        _DAYS[dt.weekday()], dt.day, _MONTHS[dt.month - 1], dt.year,
+        dt.hour, dt.minute, dt.second,
+    )
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def format_rfc3339(dt):
+    """RFC 3339 timestamp as used by Atom and JSON Feed, always in UTC."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    elif dt.tzinfo is not timezone.utc:
+        dt = dt.astimezone(timezone.utc)
+    return '%04d-%02d-%02dT%02d:%02d:%02dZ' % (
+        dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second,
+    )
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _rfc822_from_iso(value):
+    dt = _parse(value)
+    # This cache already holds the result; skip format_rfc822's own LRU
+    return format_rfc822.__wrapped__(dt) if dt is not None else None
+
+
+def rfc822_from_iso(value):
+    """RFC 822 form of an ISO 8601 string, or None if it doesn't parse.
+
+    Memoized on the input string, so a repeat costs one cache lookup.
+    """
+    if not value:
+        return None
+    if not isinstance(value, str):
+        return _invalid(value)
+    formatted = _rfc822_from_iso(value)
+    if formatted is None:
+        return _invalid(value)
+    return formatted
+
+
+def clear_caches():
+    """Empty every LRU cache (benchmarks use this to measure cold runs)."""
+    for cached in (_parse, _rfc822_from_iso, format_rfc822, format_rfc3339):
+        cached.cache_clear()
+
+
+def cache_info():
+    """LRU statistics of the parse and format caches."""
+    return {
+        'parse': _parse.cache_info()._asdict(),
+        'rfc822_from_iso': _rfc822_from_iso.cache_info()._asdict(),
+        'rfc822': format_rfc822.cache_info()._asdict(),
+        'rfc3339': format_rfc3339.cache_info()._asdict(),
+    }
@@ -0,0 +1,521 @@
+"""
+Typed document model for daily reports
+======================================
+
+Parses a report's Markdown once into a section tree (headings nest by
+level; each section holds its blocks: paragraphs, bullet/numbered lists,
+tables as rows of cells, fenced code, blockquotes, rules). Title, summary,
+HTML (_markdown.py), search sections (_search.py) and per-section feeds are
+all derived from the tree instead of re-scanning the text with their own
+regexes.
+
+Inline spans (bold, links, ...) are kept as source text on the blocks;
+``plain_inline`` strips them and _markdown.render_inline renders them.
+
+Reports also mark sub-sections with bold labels rather than headings
+(``**Strategic Signal:** ...``). ``Document.labels()`` exposes each such
+paragraph, with the lists, tables and quotes directly under it, as a
+``Label`` that can be looked up and rendered like a section.
+
+Each source line is visited once by the block-level state machine; every
+block and section records the character offset it starts at, so callers
+can cut a document at a source position without splitting a block.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+RULE_RE = re.compile(r'^ {0,3}([-*_])(?:\s*\1){2,}\s*$')
+FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})\s*([\w+-]*)')
+LIST_RE = re.compile(r'^(\s*)([-*+]|\d+[.)])\s+(.*)$')
+TABLE_SEP_RE = re.compile(r'^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$')
+# Every alternative starts with a literal character (emphasis checks the
+# character before its ``*`` in a lookbehind after it), which lets the
+# regex engine skip ahead to candidate positions instead of trying each one
+INLINE_RE = re.compile(
+    r'`([^`]+)`'                              # code span
+    r'|\*\*(.+?)\*\*'                         # strong
+    r'|\*(?<![\w*]\*)(?!\s)(.+?)(?<!\s)\*(?!\*)'  # emphasis
+    r'|\[([^\]]+)\]\(([^)\s]+)\)'             # link
+)
+_SLUG_RE = re.compile(r'[^\w]+')
+# ``**Label:**`` or ``**Label**:`` at the start of a paragraph
+LABEL_RE = re.compile(r'\*\*([^*]+?):\*\*|\*\*([^*]+?)\*\*:')
+
+DIGITS = frozenset('0123456789')
+LIST_STARTS = frozenset('-*+') | DIGITS
+
+
+def plain_inline(text):
+    """Inline Markdown with span markup removed (``**a** [b](u)`` -> ``a b``)."""
+    if '*' not in text and '`' not in text and '[' not in text:
+        return text
+
+    def strip(match):
+        code, strong, em, link_text, _ = match.groups()
+        if code is not None:
+            return code
+        return plain_inline(strong if strong is not None else em if em is not None else link_text)
+
+    return INLINE_RE.sub(strip, text)
+
+
+def slugify(text):
+    """URL-safe id of a heading: ``📈 GitHub Trending Analysis`` -> ``github-trending-analysis``."""
+    return _SLUG_RE.sub('-', plain_inline(text).casefold()).replace('_', '-').strip('-')
+
+
+# --- Blocks ------------------------------------------------------------
+
+class Paragraph:
+    """Lines of one paragraph; ``hard_break`` marks a trailing two-space break."""
+
+    __slots__ = ('offset', 'lines')
+
+    def __init__(self, offset):
+        self.offset = offset
+        # (inline text, hard_break) per source line
+        self.lines = []
+
+    def inlines(self):
+        return [text for text, _ in self.lines]
+
+    def text(self):
+        return ' '.join(plain_inline(text) for text, _ in self.lines)
+
+
+class ListItem:
+    """One bullet: its first line, lazy continuation lines and nested lists."""
+
+    __slots__ = ('text', 'continuation', 'children')
+
+    def __init__(self, text):
+        self.text = text
+        self.continuation = []
+        self.children = []
+
+    def inlines(self):
+        texts = [self.text, *self.continuation]
+        for child in self.children:
+            texts.extend(child.inlines())
+        return texts
+
+    def plain(self):
+        lines = [' '.join(plain_inline(text) for text in (self.text, *self.continuation))]
+        lines.extend(child.text() for child in self.children)
+        return '\n'.join(lines)
+
+
+class BulletList:
+    """A bullet (``ordered=False``) or numbered list."""
+
+    __slots__ = ('offset', 'ordered', 'start', 'items')
+
+    def __init__(self, offset, ordered, start=1):
+        self.offset = offset
+        self.ordered = ordered
+        self.start = start
+        self.items = []
+
+    def inlines(self):
+        texts = []
+        for item in self.items:
+            texts.extend(item.inlines())
+        return texts
+
+    def text(self):
+        return '\n'.join(item.plain() for item in self.items)
+
+
+class Table:
+    """Pipe table: header cells, per-column alignment and body rows."""
+
+    __slots__ = ('offset', 'header', 'aligns', 'rows')
+
+    def __init__(self, offset, header, aligns):
+        self.offset = offset
+        self.header = header
+        # 'left' | 'center' | 'right' | None per column
+        self.aligns = aligns
+        self.rows = []
+
+    def inlines(self):
+        texts = list(self.header)
+        for row in self.rows:
+            texts.extend(row)
+        return texts
+
+    def text(self):
+        return '\n'.join(' | '.join(plain_inline(cell) for cell in row)
+                         for row in [self.header, *self.rows])
+
+
+class CodeBlock:
+    """Fenced code; lines are literal."""
+
+    __slots__ = ('offset', 'lang', 'lines')
+
+    def __init__(self, offset, lang):
+        self.offset = offset
+        self.lang = lang
+        self.lines = []
+
+    def inlines(self):
+        return []
+
+    def text(self):
+        return '\n'.join(self.lines)
+
+
+class Quote:
+    """Blockquote; one inline text per ``>`` line."""
+
+    __slots__ = ('offset', 'lines')
+
+    def __init__(self, offset):
+        self.offset = offset
+        self.lines = []
+
+    def inlines(self):
+        return list(self.lines)
+
+    def text(self):
+        return ' '.join(plain_inline(line) for line in self.lines)
+
+
+class Rule:
+    """Thematic break (``---``)."""
+
+    __slots__ = ('offset',)
+
+    def __init__(self, offset):
+        self.offset = offset
+
+    def inlines(self):
+        return []
+
+    def text(self):
+        return ''
+
+
+# --- Sections ----------------------------------------------------------
+
+class Section:
+    """A heading, the blocks up to the next heading, and deeper sections."""
+
+    __slots__ = ('offset', 'level', 'heading', '_title', '_slug', 'blocks', 'children')
+
+    def __init__(self, offset, level, heading):
+        self.offset = offset
+        self.level = level
+        # Inline source of the heading
+        self.heading = heading
+        # Plain text and slug are derived on first use; rendering needs neither
+        self._title = self._slug = None
+        self.blocks = []
+        self.children = []
+
+    @property
+    def title(self):
+        """Plain text of the heading."""
+        if self._title is None:
+            self._title = plain_inline(self.heading)
+        return self._title
+
+    @property
+    def slug(self):
+        """URL-safe id of the heading (see slugify)."""
+        if self._slug is None:
+            self._slug = slugify(self.heading)
+        return self._slug
+
+    def walk(self):
+        """This section and every section below it, in document order."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def text(self, heading=True):
+        """Plain text of the section and its subsections."""
+        parts = [self.title] if heading else []
+        parts.extend(block.text() for block in self.blocks)
+        parts.extend(child.text() for child in self.children)
+        return '\n'.join(part for part in parts if part)
+
+
+class Label(Section):
+    """A bold-labelled paragraph and the non-paragraph blocks that follow it.
+
+    ``heading`` is the label text; it is rendered as part of the paragraph,
+    not as a heading. Labels have no children.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, offset, heading):
+        super().__init__(offset, 0, heading)
+
+
+def _labels(blocks):
+    # Built whole before returning: a label owns the blocks after it, so a
+    # lazily yielded label would be handed out before it is complete
+    labels = []
+    label = None
+    for block in blocks:
+        if type(block) is Paragraph:
+            match = LABEL_RE.match(block.lines[0][0])
+            label = Label(block.offset, match.group(1) or match.group(2)) if match else None
+            if label is not None:
+                labels.append(label)
+        elif type(block) is Rule:
+            label = None
+            continue
+        if label is not None:
+            label.blocks.append(block)
+    return labels
+
+
+class Document:
+    """A parsed report: blocks before the first heading, then the section tree."""
+
+    __slots__ = ('blocks', 'sections')
+
+    def __init__(self):
+        self.blocks = []
+        self.sections = []
+
+    def walk(self):
+        """Every section, in document order."""
+        for section in self.sections:
+            yield from section.walk()
+
+    @property
+    def title(self):
+        """Plain text of the first level-1 heading, or None."""
+        for section in self.walk():
+            if section.level == 1:
+                return section.title
+        return None
+
+    def labels(self):
+        """Every bold-labelled paragraph as a ``Label``, in document order."""
+        yield from _labels(self.blocks)
+        for section in self.walk():
+            yield from _labels(section.blocks)
+
+    def find(self, slug):
+        """First section whose slug is, or starts with, ``slug``; None if absent.
+
+        ``find('github-trending')`` matches ``## 📈 GitHub Trending Analysis``.
+        Headings are searched first, then labels (``find('strategic-signal')``
+        matches ``**Strategic Signal:** ...``).
+        """
+        slug = slugify(slug)
+        if not slug:
+            return None
+        for sections in (self.walk(), self.labels()):
+            fallback = None
+            for section in sections:
+                if section.slug == slug:
+                    return section
+                if fallback is None and section.slug.startswith(slug + '-'):
+                    fallback = section
+            if fallback is not None:
+                return fallback
+        return None
+
+    def inlines(self):
+        """Inline source texts of headings and blocks in document order (no code)."""
+        for block in self.blocks:
+            yield from block.inlines()
+        for section in self.walk():
+            yield section.heading
+            for block in section.blocks:
+                yield from block.inlines()
+
+
+# --- Parser ------------------------------------------------------------
+
+def _split_row(line):
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|'):
+        line = line[:-1]
+    return [cell.strip() for cell in line.split('|')]
+
+
+def _alignments(separator):
+    # One entry per column; body cells beyond the header's width are dropped
+    aligns = []
+    for cell in _split_row(separator):
+        if cell.startswith(':') and cell.endswith(':'):
+            aligns.append('center')
+        elif cell.endswith(':'):
+            aligns.append('right')
+        elif cell.startswith(':'):
+            aligns.append('left')
+        else:
+            aligns.append(None)
+    return aligns
+
+
+def parse(content):
+    """Parse Markdown ``content`` into a ``Document``."""
+    document = Document()
+    lines = content.split('\n')
+    n = len(lines)
+
+    blocks = document.blocks  # where new blocks go: the innermost open section
+    sections = []       # open sections, outermost first
+    paragraph = None    # open paragraph
+    quote = None        # open blockquote
+    lists = []          # open lists as (indent, BulletList)
+    code = None         # open fenced code block
+    fence = None        # its opening fence marker
+    table = None        # open table
+
+    offset = 0
+    i = 0
+    while i < n:
+        line = lines[i]
+        start = offset
+        offset += len(line) + 1
+        i += 1
+
+        # Inside a fenced code block everything is literal until the fence
+        if fence is not None:
+            if line.strip().startswith(fence):
+                code = fence = None
+            else:
+                code.lines.append(line)
+            continue
+
+        stripped = line.strip()
+
+        if table is not None:
+            if stripped.startswith('|'):
+                table.rows.append(_split_row(line))
+                continue
+            table = None
+
+        if not stripped:
+            paragraph = quote = None
+            # A blank line only ends a list if the next content isn't part of it
+            if lists:
+                j = i
+                while j < n and not lines[j].strip():
+                    j += 1
+                if j >= n or not (lines[j][:1] in (' ', '\t') or LIST_RE.match(lines[j])):
+                    lists.clear()
+            continue
+
+        first = stripped[0]
+
+        fence_match = FENCE_RE.match(line) if first in '`~' else None
+        if fence_match:
+            paragraph = quote = None
+            lists.clear()
+            fence = fence_match.group(1)
+            code = CodeBlock(start, fence_match.group(2))
+            blocks.append(code)
+            continue
+
+        heading = HEADING_RE.match(line) if first == '#' else None
+        if heading:
+            paragraph = quote = None
+            lists.clear()
+            section = Section(start, len(heading.group(1)), heading.group(2))
+            while sections and sections[-1].level >= section.level:
+                sections.pop()
+            (sections[-1].children if sections else document.sections).append(section)
+            sections.append(section)
+            blocks = section.blocks
+            continue
+
+        if first in '-*_' and stripped.count(first) >= 3 and RULE_RE.match(line):
+            paragraph = quote = None
+            lists.clear()
+            blocks.append(Rule(start))
+            continue
+
+        if first == '|' and i < n and TABLE_SEP_RE.match(lines[i]):
+            paragraph = quote = None
+            lists.clear()
+            table = Table(start, _split_row(line), _alignments(lines[i]))
+            blocks.append(table)
+            offset += len(lines[i]) + 1
+            i += 1
+            continue
+
+        if first == '>':
+            paragraph = None
+            lists.clear()
+            if quote is None:
+                quote = Quote(start)
+                blocks.append(quote)
+            quote.lines.append(stripped[1:].strip())
+            continue
+
+        # A bullet marker needs whitespace after it (``**bold**`` is a paragraph)
+        item = None
+        if first in LIST_STARTS and (first in DIGITS or len(stripped) == 1 or stripped[1].isspace()):
+            item = LIST_RE.match(line)
+        if item:
+            paragraph = quote = None
+            indent = len(item.group(1).expandtabs(4))
+            marker = item.group(2)
+            ordered = marker not in '-*+'
+            while lists and lists[-1][0] > indent:
+                lists.pop()
+            if lists and lists[-1][0] == indent and lists[-1][1].ordered != ordered:
+                lists.pop()
+            if not lists or lists[-1][0] < indent:
+                bullets = BulletList(start, ordered, int(marker[:-1]) if ordered else 1)
+                (lists[-1][1].items[-1].children if lists else blocks).append(bullets)
+                lists.append((indent, bullets))
+            lists[-1][1].items.append(ListItem(item.group(3).strip()))
+            continue
+
+        if lists and line[:1] in (' ', '\t'):
+            # Lazy continuation of the current list item
+            lists[-1][1].items[-1].continuation.append(stripped)
+            continue
+
+        lists.clear()
+        quote = None
+        if paragraph is None:
+            paragraph = Paragraph(start)
+            blocks.append(paragraph)
+        paragraph.lines.append((stripped, line.endswith('  ')))
+
+    return document
+
+
+class DocumentCache:
+    """Bounded LRU of parsed documents, keyed by content hash."""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, key, load) -> Document:
+        """Return the document for ``key``, calling ``load()`` on a miss."""
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+                self.stats['hits'] += 1
+                return document
+        document = load()
+        with self._lock:
+            self.stats['misses'] += 1
+            self._documents[key] = document
+            while len(self._documents) > self.max_entries:
+                self._documents.popitem(last=False)
+        return document
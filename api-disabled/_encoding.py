@@ -0,0 +1,169 @@
+"""
+Precompressed, content-negotiated response bodies
+=================================================
+
+Feed bodies are compressed once per content change (keyed by ETag) into
+identity, gzip and - when the ``brotli`` package is installed - br
+variants. Each request then only picks one from ``Accept-Encoding``
+(RFC 9110 section 12.5.3), so compression is never paid per request.
+
+Compressed variants are returned base64-encoded with
+``isBase64Encoded: true``, as the Vercel/Lambda dict response format
+requires for binary bodies.
+"""
+
+import gzip
+import base64
+import threading
+from collections import OrderedDict
+
+from _request import get_header
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Server preference when the client weights codings equally
+PREFERENCE = ('br', 'gzip', 'identity')
+
+# Bodies smaller than this gain nothing worth the header overhead
+MIN_SIZE = 512
+
+ALIASES = {'x-gzip': 'gzip'}
+
+
+def compress(data: bytes, coding: str) -> bytes:
+    """Compress ``data`` with one content coding at maximum ratio."""
+    if coding == 'gzip':
+        # mtime=0 keeps the output byte-for-byte reproducible
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if coding == 'br':
+        if brotli is None:
+            raise ValueError("brotli is not installed")
+        return brotli.compress(data, quality=11)
+    if coding == 'identity':
+        return data
+    raise ValueError(f"Unsupported content coding: {coding}")
+
+
+def available_codings():
+    """Codings this process can produce, in preference order."""
+    return [c for c in PREFERENCE if c != 'br' or brotli is not None]
+
+
+def compress_variants(body) -> dict:
+    """Every available encoding of ``body``, keyed by coding name."""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    variants = {'identity': body}
+    if len(body) < MIN_SIZE:
+        return variants
+    for coding in available_codings():
+        if coding != 'identity':
+            variants[coding] = compress(body, coding)
+    return variants
+
+
+def parse_accept_encoding(value: str) -> dict:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    weights = {}
+    for part in value.split(','):
+        fields = part.strip().split(';')
+        coding = ALIASES.get(fields[0].strip().lower(), fields[0].strip().lower())
+        if not coding:
+            continue
+        q = 1.0
+        for param in fields[1:]:
+            name, _, raw = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(raw)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def choose_encoding(accept_encoding, available) -> str:
+    """Pick the best coding from ``available`` for an Accept-Encoding value.
+
+    No header means the client didn't ask for compression, so identity is
+    served. Identity is also the fallback when nothing listed is acceptable.
+    """
+    if accept_encoding is None:
+        return 'identity'
+    weights = parse_accept_encoding(accept_encoding)
+    default = weights.get('*', 0.0)
+    best, best_q = 'identity', 0.0
+    for coding in PREFERENCE:
+        if coding not in available:
+            continue
+        q = weights.get(coding, 1.0 if coding == 'identity' and '*' not in weights else default)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class VariantCache:
+    """Per-process map of ETag -> compressed variants, bounded to a few entries."""
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag: str, body) -> dict:
+        """Variants for ``body``, compressing only the first time ``etag`` is seen."""
+        with self._lock:
+            variants = self._entries.get(etag)
+            if variants is not None:
+                self._entries.move_to_end(etag)
+                return variants
+        variants = compress_variants(body)
+        with self._lock:
+            self._entries[etag] = variants
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return variants
+
+
+def negotiated_coding(request, body) -> str:
+    """Coding select_variant will pick for ``body``, without compressing it.
+
+    Lets a handler send the coding's ETag on a 304 before (or instead of)
+    building the variants.
+    """
+    size = len(body)
+    if isinstance(body, str) and size < MIN_SIZE:
+        size = len(body.encode('utf-8'))
+    available = available_codings() if size >= MIN_SIZE else ('identity',)
+    return choose_encoding(get_header(request, 'Accept-Encoding'), available)
+
+
+def select_variant(request, variants: dict):
+    """Choose the variant for a request.
+
+    Returns:
+        Tuple of (coding, body bytes)
+    """
+    coding = choose_encoding(get_header(request, 'Accept-Encoding'), variants)
+    return coding, variants[coding]
+
+
+def encoding_headers(coding: str) -> dict:
+    """Vary / Content-Encoding headers for a negotiated response."""
+    headers = {'Vary': 'Accept-Encoding'}
+    if coding != 'identity':
+        headers['Content-Encoding'] = coding
+    return headers
+
+
+def response_body(coding: str, data: bytes) -> dict:
+    """``body`` (plus ``isBase64Encoded``) fields of a dict-style response."""
+    if coding == 'identity':
+        return {'body': data.decode('utf-8')}
+    return {'body': base64.b64encode(data).decode('ascii'), 'isBase64Encoded': True}
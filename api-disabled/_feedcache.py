@@ -0,0 +1,299 @@
+"""
+Shared cache backends for rendered feeds
+========================================
+
+A rendered feed is cached as an entry dict::
+
+    {'body': str, 'etag': str, 'timestamp': float}
+
+where ``timestamp`` is when the upstream data was fetched. Freshness is
+decided by the caller from ``timestamp``; the optional ``ttl`` passed to
+``set`` only bounds how long a backend keeps the entry at all.
+
+``lock(key)`` returns a context manager held while refreshing a key. The
+file backend uses an ``flock`` so processes sharing the cache directory
+refresh one at a time; the other backends return a no-op lock.
+
+Backends:
+    memory  - per-process dict (the previous behaviour)
+    file    - one JSON file per key, written with an atomic rename
+    sqlite  - a single SQLite database file
+    redis   - any server speaking the Redis protocol (RESP)
+
+Environment Variables:
+    RSS_CACHE_BACKEND - memory | file | sqlite | redis (default: memory)
+    RSS_CACHE_PATH    - Directory (file) or database path (sqlite)
+                        (default: /tmp/eschaton-rss-cache[.sqlite3])
+    RSS_CACHE_URL     - redis://[:password@]host[:port][/db]
+"""
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+class MemoryCache:
+    """In-process cache; each serverless instance has its own."""
+
+    def __init__(self):
+        self._data = {}
+
+    def get(self, key: str):
+        stored = self._data.get(key)
+        if stored is None:
+            return None
+        entry, expires = stored
+        if expires is not None and expires <= time.time():
+            # Another thread may be expiring the same key right now
+            self._data.pop(key, None)
+            return None
+        return entry
+
+    def set(self, key: str, entry: dict, ttl: float = None):
+        expires = time.time() + ttl if ttl else None
+        self._data[key] = (dict(entry), expires)
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def lock(self, key: str):
+        return nullcontext()
+
+
+class FileCache:
+    """One JSON file per key, shared by every process on the same filesystem."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, key: str):
+        try:
+            with open(self.path_for(key), 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        expires = stored.pop('expires', None)
+        if expires is not None and expires <= time.time():
+            return None
+        return stored
+
+    def set(self, key: str, entry: dict, ttl: float = None):
+        stored = dict(entry, expires=time.time() + ttl if ttl else None)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(stored, f, ensure_ascii=False)
+            # Readers see either the old file or the new one, never a partial write
+            os.replace(tmp_path, self.path_for(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def delete(self, key: str):
+        try:
+            os.unlink(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def lock(self, key: str):
+        """Exclusive cross-process lock for refreshing ``key``."""
+        if fcntl is None:
+            yield
+            return
+        lock_path = self.path_for(key)[:-len('.json')] + '.lock'
+        with open(lock_path, 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class SQLiteCache:
+    """Entries in one SQLite table; safe across threads and processes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS feed_entries ("
+                " key TEXT PRIMARY KEY, entry TEXT NOT NULL, expires REAL)"
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        row = self._connect().execute(
+            "SELECT entry, expires FROM feed_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry, expires = row
+        if expires is not None and expires <= time.time():
+            return None
+        return json.loads(entry)
+
+    def set(self, key: str, entry: dict, ttl: float = None):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO feed_entries (key, entry, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(entry, ensure_ascii=False), time.time() + ttl if ttl else None),
+            )
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM feed_entries WHERE key = ?", (key,))
+
+    def lock(self, key: str):
+        return nullcontext()
+
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+class RedisCache:
+    """Minimal RESP client storing entries as JSON strings.
+
+    Speaks only the commands it needs (AUTH, SELECT, GET, SET, DEL), so it
+    works against Redis, Valkey, KeyDB or a local fake server without any
+    client library.
+    """
+
+    def __init__(self, url: str, timeout: float = 2.0, prefix: str = 'eschaton-rss:'):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self.prefix = prefix
+        self._sock = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock = sock
+        self._file = sock.makefile('rb')
+        if self.password:
+            self._command('AUTH', self.password)
+        if self.db:
+            self._command('SELECT', str(self.db))
+
+    def _close(self):
+        for closable in (self._file, self._sock):
+            if closable is not None:
+                try:
+                    closable.close()
+                except OSError:
+                    pass
+        self._sock = self._file = None
+
+    def _command(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b''.join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode()
+        if kind == b'-':
+            raise RedisError(payload.decode())
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            count = int(payload)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def execute(self, *args):
+        """Send one command, reconnecting once if the connection went stale."""
+        with self._lock:
+            for attempt in (0, 1):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._command(*args)
+                except (OSError, ConnectionError):
+                    self._close()
+                    if attempt:
+                        raise
+
+    def get(self, key: str):
+        raw = self.execute('GET', self.prefix + key)
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def set(self, key: str, entry: dict, ttl: float = None):
+        payload = json.dumps(entry, ensure_ascii=False)
+        if ttl:
+            self.execute('SET', self.prefix + key, payload, 'EX', max(1, int(ttl)))
+        else:
+            self.execute('SET', self.prefix + key, payload)
+
+    def delete(self, key: str):
+        self.execute('DEL', self.prefix + key)
+
+    def lock(self, key: str):
+        return nullcontext()
+
+
+def cache_from_env():
+    """Build the cache backend selected by RSS_CACHE_BACKEND."""
+    backend = os.getenv('RSS_CACHE_BACKEND', 'memory').lower()
+    tmp = tempfile.gettempdir()
+    if backend == 'file':
+        return FileCache(os.getenv('RSS_CACHE_PATH', os.path.join(tmp, 'eschaton-rss-cache')))
+    if backend == 'sqlite':
+        return SQLiteCache(os.getenv('RSS_CACHE_PATH', os.path.join(tmp, 'eschaton-rss-cache.sqlite3')))
+    if backend == 'redis':
+        return RedisCache(os.getenv('RSS_CACHE_URL', 'redis://localhost:6379/0'))
+    if backend != 'memory':
+        raise ValueError(f"Unknown RSS_CACHE_BACKEND: {backend}")
+    return MemoryCache()
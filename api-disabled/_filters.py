@@ -0,0 +1,153 @@
+"""
+Filtered feed variants
+======================
+
+``?section=``, ``?category=`` and ``?author=`` narrow a feed to matching
+items. Filtering happens on the already-built item model (FeedItem, and
+for reports the parsed document of _document.py), so a filtered variant
+costs no upstream fetch and no Markdown parsing - only a render of the
+matching items, most of which come out of the fragment cache.
+
+Rendered variants are kept in a per-process LRU bounded by the total size
+of the cached bodies rather than by entry count, so a few large archive
+variants can't crowd out memory the way many small ones might.
+
+Environment Variables:
+    FEED_VARIANT_CACHE_BYTES - Budget for cached filtered feeds
+                               (default: 8388608 = 8 MiB)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from _document import slugify
+from _request import get_query
+
+FILTER_PARAMS = ('section', 'category', 'author')
+MAX_FILTER_LENGTH = 100
+VARIANT_CACHE_BYTES = int(os.getenv('FEED_VARIANT_CACHE_BYTES', str(8 * 1024 * 1024)))
+
+
+class BadFilter(ValueError):
+    """A filter parameter can't be applied to this feed."""
+
+
+class UnknownFilter(LookupError):
+    """A filter names a section, category or author the feed doesn't have."""
+
+
+class FeedFilter:
+    """Requested filters; None for each one that isn't set.
+
+    ``section`` is a heading slug (see _document.slugify), ``category`` and
+    ``author`` are casefolded.
+    """
+
+    __slots__ = FILTER_PARAMS
+
+    def __init__(self, section: str = None, category: str = None, author: str = None):
+        self.section = section
+        self.category = category
+        self.author = author
+
+    @property
+    def key(self) -> tuple:
+        """Hashable identity, for cache keys."""
+        return (self.section, self.category, self.author)
+
+    def query(self) -> str:
+        """Query string that reproduces these filters (without ``?``)."""
+        return urlencode([(name, getattr(self, name)) for name in FILTER_PARAMS
+                          if getattr(self, name) is not None])
+
+    def require_known(self, categories=(), authors=()):
+        """Reject a category or author outside the ones the feed has.
+
+        Raises:
+            UnknownFilter: so a typo answers 404 instead of an empty feed
+        """
+        if self.category is not None and self.category not in {c.casefold() for c in categories}:
+            raise UnknownFilter(f"Unknown category: {self.category}")
+        if self.author is not None and self.author not in {a.casefold() for a in authors}:
+            raise UnknownFilter(f"Unknown author: {self.author}")
+
+    def matches(self, item) -> bool:
+        """Whether a FeedItem passes the category and author filters.
+
+        Matching is case-insensitive and exact. ``section`` is applied by the
+        generator, which knows how its items are divided.
+        """
+        if self.category is not None and self.category not in (
+                category.casefold() for category in item.categories):
+            return False
+        if self.author is not None and (item.author_name or '').casefold() != self.author:
+            return False
+        return True
+
+
+def from_request(request):
+    """The request's filters, or None when it asks for the unfiltered feed.
+
+    Raises:
+        BadFilter: A filter value is longer than MAX_FILTER_LENGTH
+    """
+    values = {}
+    for name in FILTER_PARAMS:
+        value = get_query(request, name)
+        if value is None or not value.strip():
+            continue
+        if len(value) > MAX_FILTER_LENGTH:
+            raise BadFilter(f"{name} is longer than {MAX_FILTER_LENGTH} characters")
+        value = slugify(value) if name == 'section' else value.strip().casefold()
+        if value:
+            values[name] = value
+    return FeedFilter(**values) if values else None
+
+
+class VariantLRU:
+    """LRU of rendered feed variants, bounded by the total size of the bodies.
+
+    Values are tuples whose first element is the body; its length (in
+    characters, close to bytes for feed XML/JSON) is what counts against
+    ``max_bytes``. Bodies larger than the whole budget are rendered but not
+    kept.
+    """
+
+    def __init__(self, max_bytes: int = VARIANT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key, render):
+        """Return the value for ``key``, calling ``render()`` on a miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return value
+        value = render()
+        cost = len(value[0])
+        with self._lock:
+            self.stats['misses'] += 1
+            if cost > self.max_bytes:
+                return value
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous[0])
+            self._entries[key] = value
+            self.size += cost
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted[0])
+                self.stats['evictions'] += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
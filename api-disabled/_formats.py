@@ -0,0 +1,363 @@
+"""
+Feed serializers: RSS 2.0, Atom 1.0 and JSON Feed 1.1
+=====================================================
+
+Each format renders a ``Channel`` and its ``FeedItem``s from _model.py.
+Formats are registered in ``FORMATS`` by name; a handler resolves the
+requested one with ``format_for(request)`` and calls ``render_feed``.
+
+Item output is cached per format in an optional ``FragmentCache`` under
+``(format, item.key)``, so each format pays for serializing an item once
+per content change.
+
+Channel metadata is split the same way: the static part (title,
+description, image, categories, ...) is serialized once per process into a
+per-format header template, and only the parts that vary per document
+(build date, self/archive links) are rendered on each call.
+"""
+
+import json
+from collections import namedtuple
+
+from _dates import format_rfc822 as rfc822, format_rfc3339 as rfc3339
+from _request import get_query
+from _rss import INDENT, XML_DECLARATION, iter_element, render_item
+from _xmlescape import CData
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+HISTORY_NS = "http://purl.org/syndication/history/1.0"
+JSON_FEED_VERSION = "https://jsonfeed.org/version/1.1"
+
+Format = namedtuple('Format', 'name content_type render label')
+
+# Serialized static channel headers keyed by (format, static fields)
+_templates = {}
+MAX_TEMPLATES = 64
+
+
+def _static_key(channel) -> tuple:
+    return (
+        channel.title, channel.home_url, channel.description, channel.language,
+        channel.generator, channel.docs, channel.managing_editor,
+        channel.web_master, channel.ttl, channel.icon, channel.image,
+        tuple(channel.categories), channel.author_name, channel.author_email,
+        channel.archive, channel.hub,
+    )
+
+
+def _template(fmt, channel, build) -> str:
+    """Static header of ``channel`` in ``fmt``, built by ``build(channel)`` once."""
+    key = (fmt, _static_key(channel))
+    template = _templates.get(key)
+    if template is None:
+        template = build(channel)
+        if len(_templates) >= MAX_TEMPLATES:
+            _templates.clear()
+        _templates[key] = template
+    return template
+
+
+def _fragment(fragments, fmt, item, render):
+    if fragments is None or item.key is None:
+        return render(item)
+    return fragments.get((fmt, item.key), lambda: render(item))
+
+
+# --- RSS 2.0 -----------------------------------------------------------
+
+def rss_item(item) -> list:
+    """RSS element tuples for one item."""
+    elements = [('title', item.title)]
+    if item.url:
+        elements.append(('link', item.url))
+    elements.append(('guid', item.id, {'isPermaLink': 'true' if item.id == item.url else 'false'}))
+    if item.published:
+        elements.append(('pubDate', rfc822(item.published)))
+    if item.author_email:
+        author = item.author_email
+        if item.author_name:
+            author = f"{author} ({item.author_name})"
+        elements.append(('author', author))
+    for category in item.categories:
+        elements.append(('category', category))
+    if item.summary is not None:
+        elements.append(('description', item.summary))
+    if item.content_html:
+        elements.append(('content:encoded', CData(item.content_html)))
+    if item.comments_url:
+        elements.append(('comments', item.comments_url))
+    return elements
+
+
+def rss_channel_static(channel) -> list:
+    """RSS element tuples for the channel metadata that is the same in every document."""
+    elements = [
+        ('title', channel.title),
+        ('link', channel.home_url),
+        ('description', channel.description),
+    ]
+    if channel.language:
+        elements.append(('language', channel.language))
+    for tag, value in (('generator', channel.generator), ('docs', channel.docs),
+                       ('managingEditor', channel.managing_editor),
+                       ('webMaster', channel.web_master), ('ttl', channel.ttl)):
+        if value is not None:
+            elements.append((tag, str(value)))
+    if channel.image:
+        elements.append(('image', [
+            ('url', channel.image),
+            ('title', channel.title),
+            ('link', channel.home_url),
+        ]))
+    for category in channel.categories:
+        elements.append(('category', category))
+    if channel.hub:
+        elements.append(('atom:link', None, {'href': channel.hub, 'rel': 'hub'}))
+    return elements
+
+
+def rss_channel_dynamic(channel) -> list:
+    """RSS element tuples for the per-document channel metadata."""
+    elements = [('lastBuildDate', rfc822(channel.updated))]
+    for rel, page in [('self', channel.page)] + channel.links:
+        elements.append(('atom:link', None, {
+            'href': channel.feed_url('rss', page),
+            'rel': rel,
+            'type': 'application/rss+xml',
+        }))
+    if channel.archive:
+        elements.append(('fh:archive', None))
+    return elements
+
+
+def rss_channel(channel) -> list:
+    """RSS element tuples for the channel metadata."""
+    return rss_channel_static(channel) + rss_channel_dynamic(channel)
+
+
+def _rss_head(channel) -> str:
+    namespaces = {'atom': ATOM_NS, 'content': CONTENT_NS}
+    if channel.archive:
+        namespaces['fh'] = HISTORY_NS
+    ns = ''.join(f' xmlns:{prefix}="{uri}"' for prefix, uri in namespaces.items())
+    chunks = [XML_DECLARATION, f'<rss version="2.0"{ns}>\n{INDENT}<channel>\n']
+    for element in rss_channel_static(channel):
+        chunks.extend(iter_element(element, 2))
+    return ''.join(chunks)
+
+
+RSS_TAIL = f'{INDENT}</channel>\n</rss>\n'
+
+
+def render_rss_feed(channel, items, fragments=None) -> str:
+    chunks = [_template('rss', channel, _rss_head)]
+    for element in rss_channel_dynamic(channel):
+        chunks.extend(iter_element(element, 2))
+    chunks.extend(_fragment(fragments, 'rss', item, lambda i: render_item(rss_item(i))) for item in items)
+    chunks.append(RSS_TAIL)
+    return ''.join(chunks)
+
+
+# --- Atom 1.0 ----------------------------------------------------------
+
+def _atom_author(name, email):
+    person = [('name', name or email)]
+    if email:
+        person.append(('email', email))
+    return ('author', person)
+
+
+def atom_entry(item, fallback_updated) -> tuple:
+    """Atom ``<entry>`` element tuple for one item."""
+    updated = item.updated or item.published or fallback_updated
+    children = [('id', item.id), ('title', item.title)]
+    if item.url:
+        children.append(('link', None, {'rel': 'alternate', 'type': 'text/html', 'href': item.url}))
+    if item.published:
+        children.append(('published', rfc3339(item.published)))
+    children.append(('updated', rfc3339(updated)))
+    if item.author_name or item.author_email:
+        children.append(_atom_author(item.author_name, item.author_email))
+    for category in item.categories:
+        children.append(('category', None, {'term': category}))
+    if item.summary is not None:
+        children.append(('summary', item.summary, {'type': 'text'}))
+    if item.content_html:
+        children.append(('content', CData(item.content_html), {'type': 'html'}))
+    if item.comments_url:
+        children.append(('link', None, {'rel': 'replies', 'type': 'text/html', 'href': item.comments_url}))
+    return ('entry', children)
+
+
+def atom_header_static(channel) -> list:
+    """Atom feed-level element tuples that are the same in every document."""
+    elements = [
+        ('title', channel.title),
+        ('subtitle', channel.description),
+        ('link', None, {'rel': 'alternate', 'type': 'text/html', 'href': channel.home_url}),
+    ]
+    if channel.author_name or channel.author_email:
+        elements.append(_atom_author(channel.author_name, channel.author_email))
+    if channel.generator:
+        elements.append(('generator', channel.generator))
+    if channel.icon:
+        elements.append(('icon', channel.icon))
+    for category in channel.categories:
+        elements.append(('category', None, {'term': category}))
+    if channel.hub:
+        elements.append(('link', None, {'rel': 'hub', 'href': channel.hub}))
+    return elements
+
+
+def atom_header_dynamic(channel) -> list:
+    """Atom feed-level element tuples that vary per document."""
+    elements = [
+        ('id', channel.feed_url('atom', channel.page)),
+        ('updated', rfc3339(channel.updated)),
+    ]
+    for rel, page in [('self', channel.page)] + channel.links:
+        elements.append(('link', None, {
+            'rel': rel,
+            'type': 'application/atom+xml',
+            'href': channel.feed_url('atom', page),
+        }))
+    if channel.archive:
+        elements.append(('fh:archive', None))
+    return elements
+
+
+def atom_header(channel) -> list:
+    """Atom feed-level element tuples."""
+    return atom_header_dynamic(channel) + atom_header_static(channel)
+
+
+def _atom_head(channel) -> str:
+    ns = f' xmlns="{ATOM_NS}"'
+    if channel.archive:
+        ns += f' xmlns:fh="{HISTORY_NS}"'
+    if channel.language:
+        ns += f' xml:lang="{channel.language}"'
+    chunks = [XML_DECLARATION, f'<feed{ns}>\n']
+    for element in atom_header_static(channel):
+        chunks.extend(iter_element(element, 1))
+    return ''.join(chunks)
+
+
+def render_atom_feed(channel, items, fragments=None) -> str:
+    def render(item):
+        return ''.join(iter_element(atom_entry(item, channel.updated), 1))
+
+    chunks = [_template('atom', channel, _atom_head)]
+    for element in atom_header_dynamic(channel):
+        chunks.extend(iter_element(element, 1))
+    chunks.extend(_fragment(fragments, 'atom', item, render) for item in items)
+    chunks.append('</feed>\n')
+    return ''.join(chunks)
+
+
+# --- JSON Feed 1.1 -----------------------------------------------------
+
+def json_item(item) -> dict:
+    """JSON Feed item object for one item."""
+    data = {'id': item.id}
+    if item.url:
+        data['url'] = item.url
+    data['title'] = item.title
+    if item.content_html:
+        data['content_html'] = item.content_html
+    else:
+        data['content_text'] = item.summary or ''
+    if item.summary is not None:
+        data['summary'] = item.summary
+    if item.published:
+        data['date_published'] = rfc3339(item.published)
+    if item.updated:
+        data['date_modified'] = rfc3339(item.updated)
+    if item.author_name or item.author_email:
+        data['authors'] = [{'name': item.author_name or item.author_email}]
+    if item.categories:
+        data['tags'] = list(item.categories)
+    return data
+
+
+def json_header_static(channel) -> dict:
+    """JSON Feed top-level members that are the same in every document."""
+    data = {
+        'version': JSON_FEED_VERSION,
+        'title': channel.title,
+        'home_page_url': channel.home_url,
+        'description': channel.description,
+    }
+    if channel.icon:
+        data['icon'] = channel.icon
+    if channel.language:
+        data['language'] = channel.language
+    if channel.author_name:
+        data['authors'] = [{'name': channel.author_name}]
+    if channel.hub:
+        data['hubs'] = [{'type': 'WebSub', 'url': channel.hub}]
+    return data
+
+
+def json_header_dynamic(channel) -> dict:
+    """JSON Feed top-level members that vary per document."""
+    data = {'feed_url': channel.feed_url('json', channel.page)}
+    older = dict(channel.links).get('prev-archive')
+    if older is not None:
+        # JSON Feed pages towards older items through next_url
+        data['next_url'] = channel.feed_url('json', older)
+    return data
+
+
+def json_header(channel) -> dict:
+    """JSON Feed top-level object, without ``items``."""
+    return {**json_header_static(channel), **json_header_dynamic(channel)}
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def _json_head(channel) -> str:
+    # Open object holding the static members, ready for more to follow
+    return _dumps(json_header_static(channel))[:-1]
+
+
+def render_json_feed(channel, items, fragments=None) -> str:
+    dynamic = _dumps(json_header_dynamic(channel))[1:-1]
+    rendered = [_fragment(fragments, 'json', item, lambda i: _dumps(json_item(i))) for item in items]
+    # Splice the dynamic members and cached item objects into the static header
+    return (_template('json', channel, _json_head) + ',' + dynamic
+            + ',"items":[' + ','.join(rendered) + ']}')
+
+
+FORMATS = {
+    'rss': Format('rss', 'application/rss+xml; charset=utf-8', render_rss_feed, 'RSS 2.0'),
+    'atom': Format('atom', 'application/atom+xml; charset=utf-8', render_atom_feed, 'Atom 1.0'),
+    'json': Format('json', 'application/feed+json; charset=utf-8', render_json_feed, 'JSON Feed 1.1'),
+}
+
+# Path suffixes that select a format when no ?format= is given
+PATH_SUFFIXES = (('.json', 'json'), ('atom.xml', 'atom'), ('.atom', 'atom'))
+
+
+def render_feed(fmt: str, channel, items, fragments=None) -> str:
+    """Render ``items`` under ``channel`` in the named format."""
+    return FORMATS[fmt].render(channel, items, fragments)
+
+
+def format_for(request, default: str = 'rss'):
+    """Feed format a request asks for, or None for an unknown ``?format=``."""
+    requested = get_query(request, 'format')
+    if requested is not None:
+        return requested if requested in FORMATS else None
+    path = None
+    if request is not None:
+        path = request.get('path') if isinstance(request, dict) else getattr(request, 'path', None)
+    if path:
+        path = str(path).split('?', 1)[0]
+        for suffix, fmt in PATH_SUFFIXES:
+            if path.endswith(suffix):
+                return fmt
+    return default
@@ -0,0 +1,48 @@
+"""
+Per-item fragment cache
+=======================
+
+Keeps the serialized output of each feed entry (an RSS ``<item>``, Atom
+``<entry>`` or JSON Feed item), keyed by format plus the identity of its
+content (report hash, or post id + version). Building a feed after one new
+report or post then renders a single fragment and concatenates the rest,
+so build cost tracks what changed rather than feed size.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class FragmentCache:
+    """Bounded LRU of rendered item fragments."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, key, render) -> str:
+        """Return the fragment for ``key``, calling ``render()`` on a miss.
+
+        Args:
+            key: Hashable content identity; equal keys must render equally
+            render: Callable returning the serialized fragment
+        """
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+                self.stats['hits'] += 1
+                return fragment
+        fragment = render()
+        with self._lock:
+            self.stats['misses'] += 1
+            self._fragments[key] = fragment
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+        return fragment
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
@@ -0,0 +1,289 @@
+"""
+Pooled HTTP client for Molthub calls
+====================================
+
+A module-scoped ``requests.Session`` that survives across warm serverless
+invocations, so refreshes reuse keep-alive connections instead of paying a
+new TCP + TLS handshake each time.
+
+Every call runs under a latency budget: retries use jittered exponential
+backoff, and each attempt's timeouts are clipped to what is left of the
+budget, so retries can never push a request past the function deadline.
+The budget also covers reading the body: a response that trickles in past
+the deadline is abandoned, and a body cut short or undecodable
+(``ChunkedEncodingError`` / ``ContentDecodingError``) is retried like a
+connection error.
+
+Each response carries ``response.timings`` (seconds):
+    connect - DNS lookup + TCP connect (0 when a pooled connection is reused)
+    tls     - TLS handshake (0 when reused or plain HTTP)
+    ttfb    - request sent until response headers received
+    body    - reading (and decompressing) the response body
+    total   - the successful attempt, end to end
+    attempts, retry_wait, reused
+
+Environment Variables:
+    MOLTHUB_CONNECT_TIMEOUT - Per-attempt connect timeout (default: 3.05)
+    MOLTHUB_READ_TIMEOUT    - Per-attempt read timeout (default: 10)
+    MOLTHUB_RETRIES         - Retries after the first attempt (default: 2)
+    MOLTHUB_BUDGET_SECONDS  - Total time allowed per call, including
+                              retries and backoff (default: 20)
+    MOLTHUB_POOL_SIZE       - Keep-alive connections kept per host (default: 32)
+"""
+
+import os
+import time
+import random
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError, SSLError
+
+
+CONNECT_TIMEOUT = float(os.getenv('MOLTHUB_CONNECT_TIMEOUT', '3.05'))
+READ_TIMEOUT = float(os.getenv('MOLTHUB_READ_TIMEOUT', '10'))
+RETRIES = int(os.getenv('MOLTHUB_RETRIES', '2'))
+BUDGET_SECONDS = float(os.getenv('MOLTHUB_BUDGET_SECONDS', '20'))
+
+BACKOFF_BASE = 0.25
+BACKOFF_MAX = 4.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+POOL_SIZE = int(os.getenv('MOLTHUB_POOL_SIZE', '32'))
+BODY_CHUNK_SIZE = 64 * 1024
+
+# Transport failures worth another attempt; a body read can fail after the
+# status line arrived, leaving a truncated or undecodable response
+RETRY_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ContentDecodingError,
+)
+
+try:
+    import brotli  # noqa: F401 - urllib3 decodes br when this is importable
+    ACCEPT_ENCODING = 'br, gzip, deflate'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'br, gzip, deflate'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+
+class BudgetExceeded(requests.exceptions.Timeout):
+    """The call's latency budget ran out before a response arrived."""
+
+
+# Timings of the attempt running on this thread, filled in by the pool hooks
+_attempt = threading.local()
+
+
+def _record(phase, seconds):
+    timings = getattr(_attempt, 'timings', None)
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _record('connect', time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _record('connect', time.perf_counter() - start)
+
+    def connect(self):
+        start = time.perf_counter()
+        timings = getattr(_attempt, 'timings', None)
+        connect_before = timings.get('connect', 0.0) if timings is not None else 0.0
+        try:
+            super().connect()
+        finally:
+            if timings is not None:
+                elapsed = time.perf_counter() - start
+                _record('tls', elapsed - (timings.get('connect', 0.0) - connect_before))
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = _TimedAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({
+                    'Accept-Encoding': ACCEPT_ENCODING,
+                    'Connection': 'keep-alive',
+                })
+                _session = session
+    return _session
+
+
+def _backoff(attempt: int) -> float:
+    # "Full jitter": uniform over [0, capped exponential]
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _body_chunks(response):
+    raw = response.raw
+    if not hasattr(raw, 'read1'):
+        # urllib3 < 2: chunks only arrive once full, so the budget is
+        # checked less often on a slow body
+        yield from response.iter_content(BODY_CHUNK_SIZE)
+        return
+    # read1 returns whatever has arrived; errors mapped as iter_content does
+    try:
+        while True:
+            chunk = raw.read1(BODY_CHUNK_SIZE, decode_content=True)
+            if not chunk:
+                return
+            yield chunk
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e)
+    except DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e)
+    except ReadTimeoutError as e:
+        raise requests.ConnectionError(e)
+    except SSLError as e:
+        raise requests.exceptions.SSLError(e)
+
+
+def _read_body(response, deadline: float, url: str):
+    # Like ``response.content``, but gives up once the deadline passes; the
+    # socket timeout only bounds the gap between reads, not the whole body
+    chunks = []
+    try:
+        for chunk in _body_chunks(response):
+            chunks.append(chunk)
+            if time.monotonic() > deadline:
+                raise BudgetExceeded(f"GET {url} exceeded its budget reading the body")
+    except BaseException:
+        response.close()
+        raise
+    response._content = b''.join(chunks)
+    response._content_consumed = True
+
+
+def _retry_after(response) -> float:
+    value = response.headers.get('Retry-After')
+    if value and value.strip().isdigit():
+        return float(value)
+    return None
+
+
+def get(url: str, params=None, headers=None, budget: float = None,
+        retries: int = None) -> requests.Response:
+    """GET with pooling, retries and a hard latency budget.
+
+    Returns:
+        The final ``requests.Response`` (body already read), with a
+        ``timings`` dict attached. Non-retryable error statuses are returned
+        as-is for the caller to ``raise_for_status()``.
+
+    Raises:
+        BudgetExceeded: the budget ran out before a complete response
+            arrived, including a last attempt whose body was cut short or
+            could not be decoded
+        requests.RequestException: the last attempt's transport error
+    """
+    budget = BUDGET_SECONDS if budget is None else budget
+    retries = RETRIES if retries is None else retries
+    session = get_session()
+    deadline = time.monotonic() + budget
+    retry_wait = 0.0
+    last_error = None
+
+    response = None
+    for attempt in range(retries + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+
+        timings = {'connect': 0.0, 'tls': 0.0}
+        _attempt.timings = timings
+        start = time.perf_counter()
+        try:
+            response = session.get(
+                url, params=params, headers=headers, stream=True,
+                timeout=(min(CONNECT_TIMEOUT, remaining), min(READ_TIMEOUT, remaining)),
+            )
+            headers_at = time.perf_counter()
+            _read_body(response, deadline, url)  # inside the timed window
+            done = time.perf_counter()
+            last_error = None
+        except RETRY_ERRORS as e:
+            last_error = e
+            response = None
+        finally:
+            _attempt.timings = None
+
+        wait = None
+        if response is not None:
+            timings.update(
+                ttfb=max(0.0, headers_at - start - timings['connect'] - timings['tls']),
+                body=done - headers_at,
+                total=done - start,
+                attempts=attempt + 1,
+                retry_wait=retry_wait,
+                reused=timings['connect'] == 0.0,
+            )
+            response.timings = timings
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            wait = _retry_after(response)
+
+        if attempt == retries:
+            break
+        wait = _backoff(attempt) if wait is None else wait
+        if time.monotonic() + wait >= deadline:
+            # Sleeping would leave no time for another attempt
+            break
+        time.sleep(wait)
+        retry_wait += wait
+
+    if response is not None:
+        # Retryable status but out of attempts or budget: let the caller raise
+        return response
+    if isinstance(last_error, (requests.exceptions.ChunkedEncodingError,
+                               requests.exceptions.ContentDecodingError)):
+        raise BudgetExceeded(f"GET {url} got no complete body: {last_error}") from last_error
+    if last_error is not None:
+        raise last_error
+    raise BudgetExceeded(f"GET {url} exceeded its {budget:.1f}s budget")
@@ -0,0 +1,158 @@
+"""
+Single-pass Markdown renderer for daily reports
+================================================
+
+Renders the Markdown subset the daily reports use (ATX headings, ``---``
+rules, pipe tables, fenced code blocks, nested bullet/numbered lists,
+blockquotes, bold/italic/code/link spans) to HTML.
+
+Blocks come from the typed document model in _document.py (one pass over
+the source lines); this module serializes that tree. Inline spans are
+resolved in a single left-to-right scan with one precompiled pattern.
+Output is accumulated in a list and joined once.
+"""
+
+from _document import INLINE_RE, parse
+from _document import BulletList, CodeBlock, Label, Paragraph, Quote, Rule, Section, Table
+from _xmlescape import escape_attr, escape_text
+
+ALIGN_STYLES = {
+    'left': ' style="text-align:left"',
+    'center': ' style="text-align:center"',
+    'right': ' style="text-align:right"',
+    None: '',
+}
+
+
+def render_inline(text):
+    """Render inline spans of one line of text."""
+    if '*' not in text and '`' not in text and '[' not in text:
+        return escape_text(text)
+    # Escaping first never creates or hides a span delimiter (entities are
+    # made of &, ; and word characters), so the whole line is escaped once
+    # and spans are substituted in a single pass over the escaped text
+    return INLINE_RE.sub(_render_span, escape_text(text))
+
+
+def _render_escaped(text):
+    if '*' not in text and '`' not in text and '[' not in text:
+        return text
+    return INLINE_RE.sub(_render_span, text)
+
+
+def _render_span(match):
+    code, strong, em, link_text, href = match.groups()
+    if code is not None:
+        return f'<code>{code}</code>'
+    if strong is not None:
+        return f'<strong>{_render_escaped(strong)}</strong>'
+    if em is not None:
+        return f'<em>{_render_escaped(em)}</em>'
+    # escape_attr adds only the quote on top of escape_text
+    href = href.replace('"', '&quot;')
+    return f'<a href="{href}">{_render_escaped(link_text)}</a>'
+
+
+def _render_list(bullets, out):
+    tag = 'ol' if bullets.ordered else 'ul'
+    out.append(f'<{tag} start="{bullets.start}">' if bullets.start != 1 else f'<{tag}>')
+    for item in bullets.items:
+        out.append(f'<li>{render_inline(item.text)}')
+        for line in item.continuation:
+            out.append(' ' + render_inline(line))
+        for child in item.children:
+            _render_list(child, out)
+        out[-1] += '</li>'
+    out[-1] += f'</{tag}>'
+
+
+def _render_paragraph(block, out):
+    parts = []
+    for text, hard_break in block.lines:
+        if parts and parts[-1] != '<br/>':
+            parts.append(' ')
+        parts.append(render_inline(text))
+        if hard_break:
+            parts.append('<br/>')
+    out.append(f'<p>{"".join(parts)}</p>')
+
+
+def _render_table(block, out):
+    aligns = [ALIGN_STYLES[align] for align in block.aligns]
+    out.append('<table><thead><tr>' + ''.join([
+        f'<th{align}>{render_inline(cell)}</th>'
+        for cell, align in zip(block.header, aligns)
+    ]) + '</tr></thead><tbody>')
+    for row in block.rows:
+        out.append('<tr>' + ''.join([
+            f'<td{align}>{render_inline(cell)}</td>'
+            for cell, align in zip(row, aligns)
+        ]) + '</tr>')
+    out.append('</tbody></table>')
+
+
+def _render_code(block, out):
+    cls = f' class="language-{escape_attr(block.lang)}"' if block.lang else ''
+    out.append(f'<pre><code{cls}>' + '\n'.join([escape_text(line) for line in block.lines])
+               + '</code></pre>')
+
+
+def _render_quote(block, out):
+    out.append(f'<blockquote><p>{"<br/>".join([render_inline(line) for line in block.lines])}</p></blockquote>')
+
+
+def _render_rule(block, out):
+    out.append('<hr/>')
+
+
+_RENDERERS = {
+    Paragraph: _render_paragraph,
+    BulletList: _render_list,
+    Table: _render_table,
+    CodeBlock: _render_code,
+    Quote: _render_quote,
+    Rule: _render_rule,
+}
+
+
+def _render_section(section, out, limit):
+    if limit is not None and section.offset >= limit:
+        return False
+    if type(section) is not Label:
+        # A label's text is the start of its own paragraph
+        out.append(f'<h{section.level}>{render_inline(section.heading)}</h{section.level}>')
+    for block in section.blocks:
+        if limit is not None and block.offset >= limit:
+            return False
+        _RENDERERS[type(block)](block, out)
+    for child in section.children:
+        if not _render_section(child, out, limit):
+            return False
+    return True
+
+
+def render_document(document, limit=None):
+    """Render a parsed document (or a ``Section`` of one) to HTML.
+
+    Args:
+        document: ``_document.Document`` or ``_document.Section``
+        limit: Only render blocks and headings that start before this
+            source offset, for previews that don't cut a block in half
+    """
+    out = []
+    if isinstance(document, Section):
+        _render_section(document, out, limit)
+        return '\n'.join(out)
+    for block in document.blocks:
+        if limit is not None and block.offset >= limit:
+            return '\n'.join(out)
+        _RENDERERS[type(block)](block, out)
+    for section in document.sections:
+        if not _render_section(section, out, limit):
+            break
+    return '\n'.join(out)
+
+
+def render(content):
+    """Render Markdown ``content`` to an HTML string."""
+    return render_document(parse(content))
@@ -0,0 +1,93 @@
+"""
+Format-neutral feed model
+=========================
+
+Both generators fill these - feed.py from Molthub posts, index.py from
+markdown reports - and every serializer in _formats.py renders from them,
+so field logic (dates, authors, permalinks) lives in one place.
+
+Dates are timezone-aware ``datetime`` objects (see _dates.py); serializers
+format them.
+"""
+
+from datetime import datetime
+
+
+class FeedItem:
+    """One entry of a feed."""
+
+    __slots__ = (
+        'id', 'title', 'url', 'published', 'updated', 'author_name',
+        'author_email', 'summary', 'content_html', 'categories',
+        'comments_url', 'key',
+    )
+
+    def __init__(self, id: str, title: str, url: str = None,
+                 published: datetime = None, updated: datetime = None,
+                 author_name: str = None, author_email: str = None,
+                 summary: str = None, content_html: str = None,
+                 categories=(), comments_url: str = None, key=None):
+        """
+        Args:
+            id: Stable unique id; a permalink when equal to ``url``
+            key: Content identity for the fragment cache, or None to always
+                render
+        """
+        self.id = id
+        self.title = title
+        self.url = url
+        self.published = published
+        self.updated = updated
+        self.author_name = author_name
+        self.author_email = author_email
+        self.summary = summary
+        self.content_html = content_html
+        self.categories = list(categories)
+        self.comments_url = comments_url
+        self.key = key
+
+
+class Channel:
+    """Feed-level metadata plus the links needed to address the document.
+
+    ``feed_url(fmt, page)`` returns the URL of this feed in a given format
+    (and archive page); ``links`` holds RFC 5005 ``(rel, page)`` pairs that
+    serializers turn into format-appropriate URLs.
+    """
+
+    __slots__ = (
+        'title', 'home_url', 'description', 'language', 'updated',
+        'generator', 'feed_url', 'page', 'links', 'archive', 'icon',
+        'image', 'categories', 'author_name', 'author_email', 'docs',
+        'managing_editor', 'web_master', 'ttl', 'hub',
+    )
+
+    def __init__(self, title: str, home_url: str, description: str,
+                 feed_url, updated: datetime, language: str = None,
+                 generator: str = None, page: int = None, links=(),
+                 archive: bool = False, icon: str = None, image: str = None,
+                 categories=(), author_name: str = None,
+                 author_email: str = None, docs: str = None,
+                 managing_editor: str = None, web_master: str = None,
+                 ttl: int = None, hub: str = None):
+        self.title = title
+        self.home_url = home_url
+        self.description = description
+        self.feed_url = feed_url
+        self.updated = updated
+        self.language = language
+        self.generator = generator
+        self.page = page
+        self.links = list(links)
+        self.archive = archive
+        self.icon = icon
+        self.image = image
+        self.categories = list(categories)
+        self.author_name = author_name
+        self.author_email = author_email
+        self.docs = docs
+        self.managing_editor = managing_editor
+        self.web_master = web_master
+        self.ttl = ttl
+        # WebSub hub advertised with rel="hub", or None
+        self.hub = hub
@@ -0,0 +1,97 @@
+"""
+Local Molthub post store
+========================
+
+Keeps the most recent posts of a sub-molt together with the upstream
+validators (ETag / Last-Modified) and the incremental-sync cursor, so
+refreshes can ask Molthub for "what changed since" instead of the whole
+list.
+
+A store is a plain dict persisted as JSON in the ``body`` of a cache entry::
+
+    {
+        'posts': [...],            # newest first, at most ``limit``
+        'etag': str | None,        # upstream ETag of the last 200 response
+        'last_modified': str | None,
+        'cursor': str | None,      # createdAt of the newest post seen
+        'full_sync': float,        # when the last non-incremental fetch ran
+        'synced': float,           # when upstream was last checked
+    }
+"""
+
+import json
+
+from _trace import note
+
+
+def empty_store() -> dict:
+    return {
+        'posts': [],
+        'etag': None,
+        'last_modified': None,
+        'cursor': None,
+        'full_sync': 0,
+        'synced': 0,
+    }
+
+
+def load_store(cache, key: str) -> dict:
+    """Read a post store from a cache backend, or return an empty one."""
+    try:
+        entry = cache.get(key)
+    except Exception as e:
+        note('store_error', op='read', key=key, error=str(e))
+        entry = None
+    if not entry:
+        return empty_store()
+    try:
+        store = json.loads(entry['body'])
+    except (KeyError, TypeError, ValueError):
+        return empty_store()
+    return dict(empty_store(), **store)
+
+
+def save_store(cache, key: str, store: dict, timestamp: float):
+    """Persist a post store; failures only cost the next refresh a full fetch."""
+    entry = {
+        'body': json.dumps(store, ensure_ascii=False, separators=(',', ':')),
+        'etag': store.get('etag'),
+        'timestamp': timestamp,
+    }
+    try:
+        cache.set(key, entry)
+    except Exception as e:
+        note('store_error', op='write', key=key, error=str(e))
+
+
+def _version(post: dict):
+    return post.get('updatedAt') or post.get('createdAt') or ''
+
+
+def merge_posts(existing: list, incoming: list, limit: int, replace: bool = False):
+    """Merge fetched posts into the stored list.
+
+    Args:
+        existing: Stored posts, newest first
+        incoming: Posts from the latest upstream response
+        limit: Maximum number of posts to keep
+        replace: Treat ``incoming`` as the complete upstream list (full sync),
+            dropping stored posts that are no longer present
+
+    Returns:
+        Tuple of (merged posts newest first, changed flag)
+    """
+    if replace:
+        merged = {post.get('id'): post for post in incoming}
+    else:
+        merged = {post.get('id'): post for post in existing}
+        for post in incoming:
+            current = merged.get(post.get('id'))
+            # Only take a known post if upstream has a newer version of it
+            if current is None or _version(post) >= _version(current):
+                merged[post.get('id')] = post
+
+    posts = sorted(merged.values(), key=lambda p: p.get('createdAt') or '', reverse=True)[:limit]
+    changed = [(p.get('id'), _version(p)) for p in posts] != \
+        [(p.get('id'), _version(p)) for p in existing]
+    return posts, changed
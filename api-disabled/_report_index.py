@@ -0,0 +1,184 @@
+"""
+Persistent report index for the daily-report loader
+====================================================
+
+Keeps the parsed form of every ``daily-report-YYYY-MM-DD.md`` file (date,
+title, summary, rendered HTML, content hash) keyed by file name, mtime and
+size, both in process and in an on-disk JSON sidecar.
+
+A refresh lists the reports directory and stats each report; only files whose
+mtime or size changed are opened and re-parsed. A warm refresh reads no
+report contents at all.
+
+Environment Variables:
+    REPORT_INDEX_PATH - Sidecar location (default: reports/.report-index.json)
+"""
+
+import os
+import re
+import json
+import hashlib
+import tempfile
+import time
+from datetime import datetime
+
+from _trace import note
+
+
+INDEX_FORMAT = 2
+REPORT_NAME_RE = re.compile(r'^daily-report-(\d{4}-\d{2}-\d{2})\.md$')
+
+
+class ReportIndex:
+    """mtime/size-keyed index of parsed daily reports."""
+
+    def __init__(self, reports_dir, parse, sidecar_path=None, version=1):
+        """
+        Args:
+            reports_dir: Directory holding the daily-report markdown files
+            parse: Callable ``parse(content, date) -> dict`` producing the
+                cached fields for one report
+            sidecar_path: JSON sidecar path, or None to keep the index in
+                memory only
+            version: Parser version; bumping it invalidates the sidecar
+        """
+        self.reports_dir = reports_dir
+        self.parse = parse
+        self.sidecar_path = sidecar_path
+        self.version = version
+        self._entries = {}
+        self._sorted = None
+        self._loaded = False
+        # Bumped whenever entries change, for caches derived from the index
+        self.generation = 0
+        # POSIX time of the last change to the set of reports (None when
+        # empty): the newest report mtime, or when a report was removed or
+        # replaced by a file with an older mtime. HTTP Last-Modified of
+        # every document rendered from the index.
+        self.modified = None
+        self.stats = {'parsed': 0, 'reused': 0, 'removed': 0}
+
+    def _load_sidecar(self):
+        self._loaded = True
+        if not self.sidecar_path:
+            return
+        try:
+            with open(self.sidecar_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('format') == INDEX_FORMAT and data.get('version') == self.version:
+            self._entries = data.get('entries', {})
+            self.modified = data.get('modified', self._newest_mtime())
+
+    def _newest_mtime(self):
+        mtimes = [entry['mtime_ns'] for entry in self._entries.values()]
+        return max(mtimes) / 1e9 if mtimes else None
+
+    def _save_sidecar(self):
+        if not self.sidecar_path:
+            return
+        data = {
+            'format': INDEX_FORMAT,
+            'version': self.version,
+            'modified': self.modified,
+            'entries': self._entries,
+        }
+        directory = os.path.dirname(self.sidecar_path) or '.'
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.report-index-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.sidecar_path)
+        except OSError as e:
+            # Read-only deployments (e.g. Vercel) keep the in-process index only
+            note('index_write_error', index='report', path=self.sidecar_path, error=str(e))
+
+    def refresh(self):
+        """Re-scan the reports directory, re-parsing only new or changed files.
+
+        Returns:
+            True if any entry was added, changed or removed.
+        """
+        if not self._loaded:
+            self._load_sidecar()
+
+        seen = set()
+        changed = False
+        # Newest mtime among re-parsed files
+        newest = None
+        try:
+            scan = list(os.scandir(self.reports_dir))
+        except FileNotFoundError:
+            scan = []
+
+        for dir_entry in scan:
+            match = REPORT_NAME_RE.match(dir_entry.name)
+            if not match or not dir_entry.is_file():
+                continue
+            name = dir_entry.name
+            seen.add(name)
+            st = dir_entry.stat()
+            cached = self._entries.get(name)
+            if (cached and cached['mtime_ns'] == st.st_mtime_ns
+                    and cached['size'] == st.st_size):
+                self.stats['reused'] += 1
+                continue
+
+            try:
+                with open(dir_entry.path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except OSError as e:
+                note('report_read_error', path=dir_entry.path, error=str(e))
+                continue
+
+            date_slug = match.group(1)
+            entry = self.parse(content, datetime.fromisoformat(date_slug))
+            entry.update({
+                'date': date_slug,
+                'sha256': hashlib.sha256(content.encode('utf-8')).hexdigest(),
+                'mtime_ns': st.st_mtime_ns,
+                'size': st.st_size,
+            })
+            self._entries[name] = entry
+            self.stats['parsed'] += 1
+            changed = True
+            newest = max(newest or 0, st.st_mtime_ns / 1e9)
+
+        for name in list(self._entries):
+            if name not in seen:
+                del self._entries[name]
+                self.stats['removed'] += 1
+                changed = True
+
+        if changed:
+            self._sorted = None
+            self.generation += 1
+            if self.modified is not None and (newest is None or int(newest) <= int(self.modified)):
+                # A removal or a backdated file (e.g. copied with its original
+                # mtime) still changes every document rendered from the index;
+                # HTTP dates have one-second resolution
+                newest = max(time.time(), int(self.modified) + 1)
+            self.modified = max(self.modified or 0, newest) if self._entries else None
+            self._save_sidecar()
+        return changed
+
+    def entries(self):
+        """Return ``(date, entry)`` pairs sorted by date, newest first.
+
+        The list is built once per change and shared between calls, so
+        slicing a page out of it costs O(page size). Don't mutate it.
+        """
+        if self._sorted is None:
+            items = [
+                (datetime.fromisoformat(entry['date']), entry)
+                for entry in self._entries.values()
+            ]
+            items.sort(key=lambda x: x[0], reverse=True)
+            self._sorted = items
+        return self._sorted
+
+    def path_for(self, entry):
+        """Absolute path of the report file behind an index entry."""
+        return os.path.join(self.reports_dir, f"daily-report-{entry['date']}.md")
@@ -0,0 +1,63 @@
+"""
+Request accessors
+=================
+
+Reads headers and query parameters from the request shapes the Vercel
+Python runtimes (and local testing) hand to the handlers: dict events,
+objects with ``headers``/``path``/``query`` attributes, and
+``BaseHTTPRequestHandler``-style objects.
+"""
+
+from urllib.parse import parse_qs, urlsplit
+
+
+def get_header(request, name: str):
+    """Read a request header from any of the request shapes Vercel passes.
+
+    Handles dict events (``{'headers': {...}}``), objects with a ``headers``
+    mapping, and ``BaseHTTPRequestHandler``-style message objects. Lookup is
+    case-insensitive; returns None when absent.
+    """
+    if request is None:
+        return None
+    headers = request.get('headers') if isinstance(request, dict) else getattr(request, 'headers', None)
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None and isinstance(headers, dict):
+        lowered = name.lower()
+        for key, candidate in headers.items():
+            if key.lower() == lowered:
+                value = candidate
+                break
+    if isinstance(value, (list, tuple)):
+        value = ', '.join(value)
+    return value
+
+
+def _field(request, *names):
+    for name in names:
+        value = request.get(name) if isinstance(request, dict) else getattr(request, name, None)
+        if value:
+            return value
+    return None
+
+
+def get_query(request, name: str, default=None):
+    """Read a query-string parameter, or ``default`` when absent.
+
+    Looks at parsed query mappings first (``query``, ``queryStringParameters``,
+    ``args``), then parses the query string out of ``path``/``url``.
+    """
+    if request is None:
+        return default
+    mapping = _field(request, 'query', 'queryStringParameters', 'args')
+    if isinstance(mapping, str):
+        mapping = parse_qs(mapping)
+    if mapping is None:
+        target = _field(request, 'path', 'url', 'rawUrl')
+        mapping = parse_qs(urlsplit(str(target)).query) if target else {}
+    value = mapping.get(name)
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    return default if value is None else value
@@ -0,0 +1,94 @@
+"""
+Streaming RSS 2.0 serializer
+============================
+
+Writes an RSS document directly from lightweight element tuples, item by
+item, without building a DOM. Shared by feed.py (Molthub posts) and
+index.py (markdown reports).
+
+Elements are tuples:
+    (tag, text)            -> <tag>text</tag>
+    (tag, text, attrs)     -> <tag a="b">text</tag>; text None -> <tag a="b"/>
+    (tag, [children])      -> nested element, e.g. <image>
+
+Text is raw and escaped here exactly once; ``CData`` text is written as a
+CDATA section instead.
+
+Items may also be passed pre-serialized (a ``str`` from ``render_item``),
+which lets callers cache item fragments and only concatenate them.
+"""
+
+from _xmlescape import CData, cdata, escape_attr, escape_text
+
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+INDENT = '  '
+
+
+def _attrs(attrs):
+    if not attrs:
+        return ''
+    return ''.join(f' {name}="{escape_attr(str(value))}"' for name, value in attrs.items())
+
+
+def iter_element(element, depth=0):
+    """Yield the serialized chunks of one element tuple."""
+    pad = INDENT * depth
+    tag = element[0]
+    text = element[1]
+    attrs = _attrs(element[2]) if len(element) > 2 else ''
+    if isinstance(text, list):
+        yield f'{pad}<{tag}{attrs}>\n'
+        for child in text:
+            yield from iter_element(child, depth + 1)
+        yield f'{pad}</{tag}>\n'
+    elif text is None:
+        yield f'{pad}<{tag}{attrs}/>\n'
+    elif isinstance(text, CData):
+        yield f'{pad}<{tag}{attrs}>{cdata(text)}</{tag}>\n'
+    else:
+        yield f'{pad}<{tag}{attrs}>{escape_text(str(text))}</{tag}>\n'
+
+
+def iter_rss(channel, items, namespaces=None):
+    """Yield an RSS 2.0 document in chunks.
+
+    Args:
+        channel: Element tuples for the channel metadata
+        items: Iterable of item element-tuple lists, written lazily
+        namespaces: Mapping of prefix to namespace URI for the root element
+    """
+    ns = ''.join(f' xmlns:{prefix}="{uri}"' for prefix, uri in (namespaces or {}).items())
+    yield XML_DECLARATION
+    yield f'<rss version="2.0"{ns}>\n{INDENT}<channel>\n'
+    for element in channel:
+        yield from iter_element(element, 2)
+    for item in items:
+        if isinstance(item, str):
+            yield item
+        else:
+            yield from iter_item(item)
+    yield f'{INDENT}</channel>\n</rss>\n'
+
+
+def iter_item(item):
+    """Yield the serialized chunks of one ``<item>``."""
+    yield f'{INDENT * 2}<item>\n'
+    for element in item:
+        yield from iter_element(element, 3)
+    yield f'{INDENT * 2}</item>\n'
+
+
+def render_item(item):
+    """Serialize one ``<item>`` to a fragment that ``iter_rss`` accepts as-is."""
+    return ''.join(iter_item(item))
+
+
+def render_rss(channel, items, namespaces=None):
+    """Serialize an RSS 2.0 document to a string."""
+    return ''.join(iter_rss(channel, items, namespaces))
+
+
+def render_rss_bytes(channel, items, namespaces=None):
+    """Serialize an RSS 2.0 document to a UTF-8 response body."""
+    return render_rss(channel, items, namespaces).encode('utf-8')
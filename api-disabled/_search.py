@@ -0,0 +1,333 @@
+"""
+Full-text search over the report archive
+========================================
+
+An inverted index from tokens to report sections, scored with BM25 and
+stored as one compact binary file that request handlers ``mmap`` instead
+of parsing: a query touches the header, a binary search over the sorted
+term table, the postings of its terms and the metadata of the top hits.
+No markdown is read at query time.
+
+File layout (little-endian, offsets from the start of the file):
+
+    header    magic, format version, document / term counts, average
+              document length, signature of the indexed reports, and the
+              offsets of the sections below
+    docs      per section: token count, metadata offset and length
+    terms     per term, sorted by UTF-8 bytes: string offset and length,
+              postings offset, document frequency
+    postings  per term: its document numbers (u32), then the matching
+              term frequencies (u16)
+    strings   UTF-8 blob of term strings and per-section JSON metadata
+
+Documents are the preamble and the ``##`` sections of each report's
+parsed model (_document.py). Updates are incremental: ``build_index`` takes
+the previous index and re-tokenizes only reports whose content hash
+changed; sections of unchanged reports are carried over from the old
+postings.
+"""
+
+import os
+import re
+import json
+import math
+import mmap
+import heapq
+import struct
+import hashlib
+from collections import Counter, defaultdict
+
+from _trace import note
+
+
+MAGIC = b'ESRI'
+FORMAT_VERSION = 2
+
+# magic, version, docs, terms, avgdl, signature, docs/terms/postings/strings offsets
+HEADER = struct.Struct('<4sIIIf32sIIII')
+DOC = struct.Struct('<III')
+TERM = struct.Struct('<IIII')
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+SNIPPET_LENGTH = 240
+MAX_TF = 0xFFFF
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+_SPACE_RE = re.compile(r'\s+')
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has in is it its of on or that the this '
+    'to was were will with'.split()
+)
+
+
+def tokenize(text: str) -> list:
+    """Lowercased word tokens; ``agent_name`` and ``gpt-4`` split into parts."""
+    return [token for token in TOKEN_RE.findall(text.casefold())
+            if len(token) > 1 and token not in STOPWORDS]
+
+
+def split_sections(document) -> list:
+    """``(section, text)`` for a parsed report's preamble and ``##`` sections.
+
+    The preamble (everything outside a level-2 section, minus the title)
+    comes first with ``section`` None; deeper sections are part of their
+    ``##`` section's text.
+    """
+    preamble = [block.text() for block in document.blocks]
+    sections = []
+    for section in document.walk():
+        if section.level == 1:
+            preamble.extend(block.text() for block in section.blocks)
+        elif section.level == 2:
+            sections.append((section, section.text(heading=False)))
+    return [(None, '\n'.join(preamble))] + sections
+
+
+def report_documents(report: dict, document) -> list:
+    """Index documents (one per section) for a report.
+
+    Args:
+        report: ``{'date', 'sha256', 'title'}`` of the report
+        document: Its parsed ``_document.Document``
+
+    Returns:
+        List of ``(metadata, term counts, length)`` tuples.
+    """
+    documents = []
+    for section, body in split_sections(document):
+        tokens = tokenize(f"{section.title if section else ''} {body}")
+        if not tokens:
+            continue
+        text = _SPACE_RE.sub(' ', body).strip()
+        if len(text) > SNIPPET_LENGTH:
+            text = text[:SNIPPET_LENGTH].rsplit(' ', 1)[0] + '...'
+        metadata = {
+            'date': report['date'],
+            'sha256': report['sha256'],
+            'title': report['title'],
+            'section': section.title if section else None,
+            'snippet': text,
+        }
+        documents.append((metadata, Counter(tokens), len(tokens)))
+    return documents
+
+
+def signature(reports) -> bytes:
+    """Digest of the ``(date, sha256)`` pairs an index was built from."""
+    pairs = sorted(f"{report['date']}:{report['sha256']}" for report in reports)
+    return hashlib.sha256('\n'.join(pairs).encode('utf-8')).digest()
+
+
+def encode(documents: list, sig: bytes) -> bytes:
+    """Serialize ``(metadata, term counts, length)`` documents to the file format."""
+    strings = bytearray()
+    doc_table = bytearray()
+    postings_by_term = defaultdict(lambda: ([], []))
+    total_length = 0
+
+    for number, (metadata, counts, length) in enumerate(documents):
+        meta = json.dumps(metadata, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        doc_table += DOC.pack(length, len(strings), len(meta))
+        strings += meta
+        total_length += length
+        for term, tf in counts.items():
+            numbers, frequencies = postings_by_term[term]
+            numbers.append(number)
+            frequencies.append(tf)
+
+    term_table = bytearray()
+    postings = bytearray()
+    for encoded, term in sorted((term.encode('utf-8'), term) for term in postings_by_term):
+        numbers, frequencies = postings_by_term[term]
+        df = len(numbers)
+        if max(frequencies) > MAX_TF:
+            frequencies = [min(tf, MAX_TF) for tf in frequencies]
+        term_table += TERM.pack(len(strings), len(encoded), len(postings), df)
+        strings += encoded
+        postings += struct.pack(f'<{df}I{df}H', *numbers, *frequencies)
+
+    docs_offset = HEADER.size
+    terms_offset = docs_offset + len(doc_table)
+    postings_offset = terms_offset + len(term_table)
+    strings_offset = postings_offset + len(postings)
+    avgdl = total_length / len(documents) if documents else 0.0
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(documents), len(postings_by_term), avgdl, sig,
+                         docs_offset, terms_offset, postings_offset, strings_offset)
+    return b''.join((header, doc_table, term_table, postings, strings))
+
+
+class SearchIndex:
+    """Read-only view of an encoded index (an ``mmap`` or ``bytes``)."""
+
+    def __init__(self, buffer):
+        if len(buffer) < HEADER.size:
+            raise ValueError("search index is truncated")
+        (magic, version, self.doc_count, self.term_count, self.avgdl, self.signature,
+         self._docs, self._terms, self._postings, self._strings) = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("not a search index of this format version")
+        self._buffer = buffer
+        # BM25 length normalisation per document, computed once per process
+        avgdl = self.avgdl or 1.0
+        self._norms = [
+            K1 * (1 - B + B * length / avgdl)
+            for length, _, _ in DOC.iter_unpack(buffer[self._docs:self._terms])
+        ]
+
+    def _string(self, offset, length) -> bytes:
+        start = self._strings + offset
+        return self._buffer[start:start + length]
+
+    def _term(self, position):
+        return TERM.unpack_from(self._buffer, self._terms + position * TERM.size)
+
+    def _lookup(self, term: str):
+        """``(postings offset, document frequency)`` of ``term``, or None."""
+        target = term.encode('utf-8')
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset, length, postings, df = self._term(mid)
+            value = self._string(offset, length)
+            if value < target:
+                lo = mid + 1
+            elif value > target:
+                hi = mid
+            else:
+                return postings, df
+        return None
+
+    def _posting_list(self, offset, df):
+        """``(document number, term frequency)`` pairs of one term."""
+        values = struct.unpack_from(f'<{df}I{df}H', self._buffer, self._postings + offset)
+        return zip(values[:df], values[df:])
+
+    def metadata(self, number: int) -> dict:
+        _, offset, length = DOC.unpack_from(self._buffer, self._docs + number * DOC.size)
+        return json.loads(self._string(offset, length).decode('utf-8'))
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """Top ``limit`` sections for ``query`` by BM25 score.
+
+        Every query term contributes independently (OR semantics); sections
+        matching more and rarer terms rank first.
+
+        Returns:
+            List of metadata dicts with an added ``score``.
+        """
+        scores = defaultdict(float)
+        n = self.doc_count
+        norms = self._norms
+        for term in set(tokenize(query)):
+            found = self._lookup(term)
+            if found is None:
+                continue
+            offset, df = found
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for number, tf in self._posting_list(offset, df):
+                scores[number] += idf * tf * (K1 + 1) / (tf + norms[number])
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        results = []
+        for number, score in top:
+            hit = self.metadata(number)
+            hit['score'] = round(score, 4)
+            results.append(hit)
+        return results
+
+    def documents(self):
+        """Rebuild ``(metadata, term counts, length)`` for every document.
+
+        Used when updating the index, so unchanged reports don't have to be
+        re-read and re-tokenized.
+        """
+        counts = [Counter() for _ in range(self.doc_count)]
+        for position in range(self.term_count):
+            offset, length, postings, df = self._term(position)
+            term = self._string(offset, length).decode('utf-8')
+            for number, tf in self._posting_list(postings, df):
+                counts[number][term] = tf
+        lengths = [length for length, _, _ in
+                   DOC.iter_unpack(self._buffer[self._docs:self._terms])]
+        return [(self.metadata(number), counts[number], lengths[number])
+                for number in range(self.doc_count)]
+
+    def close(self):
+        """Unmap the file; safe to call more than once."""
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                # A query on another thread still has the buffer exported;
+                # the mapping is released with its last reference instead
+                pass
+
+
+def open_index(path: str):
+    """Memory-map the index at ``path``; None if it is missing or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                return None
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+    try:
+        return SearchIndex(buffer)
+    except ValueError:
+        buffer.close()
+        return None
+
+
+def build_index(reports: list, load, previous: SearchIndex = None):
+    """Encode an index over ``reports``, reusing ``previous`` where possible.
+
+    Args:
+        reports: ``{'date', 'sha256', 'title'}`` dicts, newest first
+        load: Callable ``load(report) -> Document`` for new or changed
+            reports
+        previous: Index to carry unchanged reports over from
+
+    Returns:
+        Tuple of (encoded index bytes, number of reports re-tokenized).
+    """
+    carried = defaultdict(list)
+    if previous is not None:
+        for document in previous.documents():
+            metadata = document[0]
+            carried[(metadata['date'], metadata['sha256'])].append(document)
+
+    documents = []
+    tokenized = 0
+    for report in reports:
+        reused = carried.get((report['date'], report['sha256']))
+        if reused is not None:
+            for metadata, counts, length in reused:
+                # Titles come from the parser and may change without the content
+                metadata['title'] = report['title']
+            documents.extend(reused)
+        else:
+            documents.extend(report_documents(report, load(report)))
+            tokenized += 1
+    return encode(documents, signature(reports)), tokenized
+
+
+def write_index(path: str, data: bytes) -> bool:
+    """Atomically replace the index file; False on a read-only filesystem."""
+    import tempfile
+
+    directory = os.path.dirname(path) or '.'
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.search-index-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        note('index_write_error', index='search', path=path, error=str(e))
+        return False
+    return True
@@ -0,0 +1,102 @@
+"""
+Single-flight request coalescing
+================================
+
+Ensures at most one refresh per key is in flight at a time. Concurrent
+callers for the same key wait for the leader's result (or exception)
+instead of repeating the work.
+
+``SingleFlight.do`` coalesces threads; ``SingleFlight.do_async`` coalesces
+coroutines on one event loop. Combine with a cross-process lock such as
+``FileCache.lock`` to extend the guarantee across processes.
+"""
+
+import threading
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+
+    def in_flight(self, key) -> bool:
+        """Whether a threaded call for ``key`` is currently running."""
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key, fn):
+        """Run ``fn()`` once for all threads concurrently asking for ``key``.
+
+        Returns:
+            Tuple of (result, shared) where ``shared`` is True for callers
+            that received another caller's result.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result, False
+
+    async def do_async(self, key, coro_fn):
+        """Await ``coro_fn()`` once for all tasks concurrently asking for ``key``.
+
+        Returns:
+            Tuple of (result, shared), as for ``do``.
+        """
+        import asyncio  # only async callers pay for importing it
+        
+        loop = asyncio.get_running_loop()
+        calls = self._async_calls.setdefault(loop, {})
+        future = calls.get(key)
+        if future is not None:
+            # shield() so one cancelled waiter doesn't cancel the shared refresh
+            return await asyncio.shield(future), True
+
+        future = calls[key] = loop.create_future()
+        try:
+            result = await coro_fn()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure doesn't log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del calls[key]
+            if not calls:
+                self._async_calls.pop(loop, None)
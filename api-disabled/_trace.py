@@ -0,0 +1,290 @@
+"""
+Request tracing: spans, counters and Server-Timing
+==================================================
+
+Handlers are wrapped with ``@instrumented(name)``, which opens a trace for
+the duration of one request. Code on the hot path marks its stages with
+``with span('fetch'):`` and counts cache outcomes with ``count('...')``;
+both are no-ops outside a traced request (background refresh threads,
+build scripts), so they can stay in shared helpers. ``note(event, ...)``
+records a structured event: inside a request it joins the request's log
+line, elsewhere it is logged as a JSON line of its own.
+
+When the request finishes the wrapper:
+
+    - adds a ``Server-Timing`` header with one metric per span (spans may
+      nest, e.g. ``parse`` inside ``fetch``, so they don't sum to ``total``)
+    - prints one JSON log line with spans, counters, tags and whether this
+      was the instance's first (cold) request
+
+Environment Variables:
+    TRACE_LOG - Emit the JSON log line per request (default: 1)
+    TRACE_PROFILE - cprofile | tracemalloc to profile sampled requests
+                    (default: off)
+    TRACE_PROFILE_RATE - Fraction of requests profiled (default: 0.1)
+"""
+
+import os
+import re
+import json
+import time
+import random
+import functools
+import threading
+from collections import Counter
+from contextvars import ContextVar
+
+LOG_ENABLED = os.getenv('TRACE_LOG', '1') != '0'
+PROFILE_MODE = os.getenv('TRACE_PROFILE', '').strip().lower()
+PROFILE_RATE = float(os.getenv('TRACE_PROFILE_RATE', '0.1'))
+PROFILE_TOP = 15
+
+# Process-lifetime counters; each request's share is also in its log line
+counters = Counter()
+_counters_lock = threading.Lock()
+_requests = 0
+_started = time.time()
+
+_current = ContextVar('trace', default=None)
+
+# Tag values go into a quoted-string; control characters can't be escaped
+# there, and non-ASCII would not survive a latin-1 header encoding
+_UNSAFE_DESC = re.compile(r'[\x00-\x1f\x7f]')
+
+
+def _desc(value) -> str:
+    """Tag value as a Server-Timing ``desc`` quoted-string (RFC 9110 5.6.4)."""
+    value = _UNSAFE_DESC.sub('', str(value)).encode('ascii', 'replace').decode('ascii')
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class Trace:
+    """Timings, counters and tags collected during one request."""
+
+    __slots__ = ('name', 'start', 'total', 'spans', 'counters', 'tags', 'events', 'cold')
+
+    def __init__(self, name: str, cold: bool = False):
+        self.name = name
+        self.start = time.perf_counter()
+        self.total = None
+        # name -> [seconds, calls], in first-seen order
+        self.spans = {}
+        self.counters = Counter()
+        self.tags = {}
+        self.events = []
+        self.cold = cold
+
+    def add(self, name: str, seconds: float):
+        timing = self.spans.get(name)
+        if timing is None:
+            self.spans[name] = [seconds, 1]
+        else:
+            timing[0] += seconds
+            timing[1] += 1
+
+    def finish(self):
+        self.total = time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value (durations in milliseconds)."""
+        metrics = [f'{name};dur={seconds * 1000:.1f}' for name, (seconds, _) in self.spans.items()]
+        for name, value in self.tags.items():
+            metrics.append(f'{name};desc={_desc(value)}')
+        if self.cold:
+            metrics.append('cold;desc="first request"')
+        if self.total is not None:
+            metrics.append(f'total;dur={self.total * 1000:.1f}')
+        return ', '.join(metrics)
+
+    def as_dict(self) -> dict:
+        data = {
+            'handler': self.name,
+            'cold': self.cold,
+            'dur_ms': round((self.total or 0) * 1000, 2),
+            'spans': {name: {'ms': round(seconds * 1000, 2), 'n': calls}
+                      for name, (seconds, calls) in self.spans.items()},
+            'counters': dict(self.counters),
+            'tags': dict(self.tags),
+        }
+        if self.events:
+            data['events'] = list(self.events)
+        return data
+
+
+class span:
+    """Time a block as a named stage of the current request.
+
+    Usage:
+        with span('render'):
+            ...
+    """
+
+    __slots__ = ('name', 'trace', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.trace = _current.get()
+        if self.trace is not None:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.trace is not None:
+            self.trace.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def count(name: str, n: int = 1):
+    """Increment a counter for the process and for the current request."""
+    with _counters_lock:
+        counters[name] += n
+    trace = _current.get()
+    if trace is not None:
+        trace.counters[name] += n
+
+
+def tag(name: str, value):
+    """Attach a short label (e.g. cache status) to the current request."""
+    trace = _current.get()
+    if trace is not None and value is not None:
+        trace.tags[name] = value
+
+
+def note(event: str, **fields):
+    """Record a structured event (e.g. one upstream call and its timings).
+
+    Inside an instrumented request it is added to the request's log line
+    under 'events'; outside one (background refreshes, worker threads,
+    builds) it is logged as a JSON line of its own.
+    """
+    record = {'event': event, **fields}
+    trace = _current.get()
+    if trace is not None:
+        trace.events.append(record)
+    elif LOG_ENABLED:
+        print(json.dumps(record, separators=(',', ':'), default=str), flush=True)
+
+
+def current():
+    """The active ``Trace``, or None outside an instrumented request."""
+    return _current.get()
+
+
+# --- Profiling ---------------------------------------------------------
+
+# Held while a request is profiled: both profilers are process-wide, and
+# enabling a second cProfile.Profile while one is active raises, so a
+# sampled request that overlaps a profiled one goes unprofiled
+_profile_lock = threading.Lock()
+
+
+def _start_profile():
+    if PROFILE_MODE not in ('cprofile', 'tracemalloc') or random.random() >= PROFILE_RATE:
+        return None
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        if PROFILE_MODE == 'cprofile':
+            import cProfile
+            profiler = cProfile.Profile()
+            # Raises if a profiler outside this module (a debugger, a
+            # profiling run) already holds the hook
+            profiler.enable()
+            return profiler
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            return tracemalloc
+        # Someone else (a benchmark) owns tracemalloc; don't stop it under them
+    except ValueError:
+        pass
+    _profile_lock.release()
+    return None
+
+
+def _stop_profile(profiler):
+    if profiler is None:
+        return None
+    try:
+        return _profile_report(profiler)
+    finally:
+        _profile_lock.release()
+
+
+def _profile_report(profiler):
+    if PROFILE_MODE == 'cprofile':
+        profiler.disable()
+        import pstats
+        stats = pstats.Stats(profiler)
+        rows = sorted(stats.stats.items(), key=lambda row: row[1][3], reverse=True)
+        return {'mode': 'cprofile', 'top': [
+            {
+                'func': f'{os.path.basename(filename)}:{line}({func})',
+                'calls': calls,
+                'own_ms': round(own * 1000, 3),
+                'cum_ms': round(cumulative * 1000, 3),
+            }
+            for (filename, line, func), (_, calls, own, cumulative, _) in rows[:PROFILE_TOP]
+        ]}
+    snapshot = profiler.take_snapshot()
+    _, peak = profiler.get_traced_memory()
+    profiler.stop()
+    return {'mode': 'tracemalloc', 'peak_bytes': peak, 'top': [
+        {
+            'line': f'{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}',
+            'bytes': stat.size,
+            'blocks': stat.count,
+        }
+        for stat in snapshot.statistics('lineno')[:PROFILE_TOP]
+    ]}
+
+
+# --- Handler wrapper ---------------------------------------------------
+
+def _response_parts(result):
+    """(status, headers dict) of a handler result, dict or Response object."""
+    if isinstance(result, dict):
+        return result.get('statusCode'), result.setdefault('headers', {})
+    return getattr(result, 'status', None), getattr(result, 'headers', None)
+
+
+def log(trace: Trace, **fields):
+    """Print one structured JSON log line for a finished request."""
+    if not LOG_ENABLED:
+        return
+    record = {'event': 'request', **trace.as_dict(), **fields}
+    print(json.dumps(record, separators=(',', ':'), default=str), flush=True)
+
+
+def instrumented(name: str):
+    """Decorate a handler so each call is traced, timed and logged."""
+    def decorate(handler):
+        @functools.wraps(handler)
+        def wrapper(request, *args, **kwargs):
+            global _requests
+            with _counters_lock:
+                _requests += 1
+                cold = _requests == 1
+            trace = Trace(name, cold=cold)
+            token = _current.set(trace)
+            profiler = _start_profile()
+            try:
+                result = handler(request, *args, **kwargs)
+            finally:
+                trace.finish()
+                _current.reset(token)
+                profile = _stop_profile(profiler)
+
+            status, headers = _response_parts(result)
+            if headers is not None:
+                headers['Server-Timing'] = trace.server_timing()
+            extra = {'status': status, 'requests': _requests,
+                     'uptime_s': round(time.time() - _started, 1)}
+            if profile is not None:
+                extra['profile'] = profile
+            log(trace, **extra)
+            return result
+        return wrapper
+    return decorate
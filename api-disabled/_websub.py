@@ -0,0 +1,442 @@
+"""
+WebSub push publishing
+======================
+
+Feeds advertise a hub (``rel="hub"``, see _formats.py) when WEBSUB_HUB_URL
+is set. Subscribers register a callback with that hub, and publishers
+(ingest.py for the reports feed, feed.py when the Molthub post store
+changes) ``ping`` it after the feed changed. The hub then fetches the
+topic once and pushes only the items it hasn't seen before to every
+subscriber, so readers get new reports within seconds instead of on the
+next poll of the ``ttl`` / ``max-age`` interval.
+
+``Hub`` is a small self-hostable hub (run it with ``python hub.py``):
+
+    subscribe / unsubscribe
+              answered with 202; the intent is verified asynchronously by
+              GETting the callback with a ``hub.challenge`` it must echo
+    publish   answered with 202; the topic is fetched and diffed against
+              the item ids seen at the previous publish. The first fetch
+              of a topic only records a baseline. New items are delivered
+              as the topic document minus every item already seen (the
+              channel / feed header, including its self and hub links,
+              is kept), with ``X-Hub-Signature: sha256=...`` for
+              subscribers that registered a secret
+
+Deliveries run on a pool of WEBSUB_CONCURRENCY threads sharing one HTTP
+connection pool, so a slow subscriber holds up one worker, not the fan
+out. Subscribers that answer 410 Gone are dropped; expired leases are
+pruned on every publish. Subscriptions and seen ids are kept in a JSON
+file written atomically after every change.
+
+Environment Variables:
+    WEBSUB_HUB_URL - Hub advertised in the feeds and pinged by publishers
+                     (default: none, no hub link)
+    WEBSUB_STORE_PATH - Hub state file (default: websub-hub.json)
+    WEBSUB_CONCURRENCY - Deliveries in flight per hub (default: 16)
+    WEBSUB_LEASE_SECONDS - Lease granted when a subscriber asks for none
+                           (default: 864000 = 10 days)
+    WEBSUB_TIMEOUT - Seconds per hub HTTP request (default: 10)
+"""
+
+# Feed functions import this module only for HUB_URL and ping; what the
+# hub alone needs (html, hmac, requests, concurrent.futures) is imported
+# where it is used, keeping their cold starts lean.
+
+import os
+import re
+import json
+import time
+import threading
+
+HUB_URL = os.getenv('WEBSUB_HUB_URL', '').strip() or None
+STORE_PATH = os.getenv('WEBSUB_STORE_PATH', 'websub-hub.json')
+CONCURRENCY = int(os.getenv('WEBSUB_CONCURRENCY', '16'))
+DEFAULT_LEASE = int(os.getenv('WEBSUB_LEASE_SECONDS', str(10 * 86400)))
+MAX_LEASE = 30 * 86400
+TIMEOUT = float(os.getenv('WEBSUB_TIMEOUT', '10'))
+
+# Ids remembered per topic; comfortably more than a feed document holds
+MAX_SEEN = 1000
+MAX_SECRET_BYTES = 200
+
+_RSS_ITEM_RE = re.compile(r'<item\b.*?</item>\s*', re.S)
+_ATOM_ENTRY_RE = re.compile(r'<entry\b.*?</entry>\s*', re.S)
+_GUID_RE = re.compile(r'<guid\b[^>]*>(.*?)</guid>', re.S)
+_LINK_RE = re.compile(r'<link>(.*?)</link>', re.S)
+_ID_RE = re.compile(r'<id>(.*?)</id>', re.S)
+_ROOT_RE = re.compile(r'<(rss|feed)\b')
+
+
+class HubError(ValueError):
+    """A subscription or publish request the hub refuses."""
+
+
+def _session(pool_size):
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = 'EschatonWebSub/1.0'
+    return session
+
+
+# --- Diffing -----------------------------------------------------------
+
+def _xml_id(block, patterns):
+    import html
+
+    for pattern in patterns:
+        match = pattern.search(block)
+        if match:
+            return html.unescape(match.group(1).strip())
+    return None
+
+
+def feed_items(body: str):
+    """``(format, [(id, item)])`` of an RSS, Atom or JSON Feed document.
+
+    ``item`` is the item's source block (XML) or dict (JSON), in document
+    order. RSS items are identified by guid, falling back to link; ``id`` is
+    None for items without one.
+    """
+    if body.lstrip().startswith('{'):
+        items = json.loads(body).get('items', [])
+        return 'json', [(None if item.get('id') is None else str(item['id']), item) for item in items]
+    root = _ROOT_RE.search(body[:2000])
+    if root and root.group(1) == 'feed':
+        return 'atom', [(_xml_id(block, (_ID_RE,)), block) for block in _ATOM_ENTRY_RE.findall(body)]
+    return 'rss', [(_xml_id(block, (_GUID_RE, _LINK_RE)), block) for block in _RSS_ITEM_RE.findall(body)]
+
+
+def new_items(body: str, seen):
+    """The topic document reduced to the items whose ids aren't in ``seen``.
+
+    Items without an id can't be told apart from old ones and are left out.
+
+    Returns:
+        Tuple of (diff body or None when nothing is new, number of new
+        items, every item id of ``body`` in document order).
+    """
+    fmt, items = feed_items(body)
+    ids = [item_id for item_id, _ in items if item_id is not None]
+    keep = [item_id is not None and item_id not in seen for item_id, _ in items]
+    fresh = sum(keep)
+    if not fresh:
+        return None, 0, ids
+    if fmt == 'json':
+        data = json.loads(body)
+        data['items'] = [item for (_, item), new in zip(items, keep) if new]
+        return json.dumps(data, ensure_ascii=False), fresh, ids
+    # findall and sub visit the same blocks in the same order
+    pattern = _ATOM_ENTRY_RE if fmt == 'atom' else _RSS_ITEM_RE
+    flags = iter(keep)
+    return pattern.sub(lambda match: match.group(0) if next(flags) else '', body), fresh, ids
+
+
+# --- Hub ---------------------------------------------------------------
+
+def _first(form, name):
+    value = form.get(name)
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return value.strip() if value else None
+
+
+def _all(form, name):
+    value = form.get(name) or []
+    return [v.strip() for v in ([value] if isinstance(value, str) else value) if v.strip()]
+
+
+def _is_http_url(url):
+    return bool(url) and url.startswith(('http://', 'https://'))
+
+
+class Hub:
+    """A WebSub hub: subscriptions, verification, diffing and fan-out.
+
+    Args:
+        url: This hub's public URL, sent in the ``Link`` header of deliveries
+        store_path: JSON state file, or None to keep state in memory
+        topics: URL prefixes the hub accepts topics for; None accepts any
+            (only sensible on a trusted network: the hub fetches topics)
+        concurrency: Deliveries in flight
+    """
+
+    def __init__(self, url: str, store_path: str = STORE_PATH, topics=None,
+                 concurrency: int = CONCURRENCY, timeout: float = TIMEOUT):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.url = url
+        self.store_path = store_path
+        self.topics = tuple(topics) if topics is not None else None
+        self.timeout = timeout
+        self._http = _session(concurrency)
+        # Verification and publish jobs; deliveries get their own bounded pool
+        self._jobs = ThreadPoolExecutor(max_workers=4, thread_name_prefix='websub-job')
+        self._deliveries = ThreadPoolExecutor(max_workers=concurrency,
+                                              thread_name_prefix='websub-deliver')
+        self._lock = threading.Lock()
+        self._topic_locks = {}
+        self.state = self._load()
+        self.stats = {'verified': 0, 'rejected': 0, 'published': 0,
+                      'delivered': 0, 'failed': 0, 'gone': 0}
+
+    # State
+
+    def _load(self):
+        if self.store_path:
+            try:
+                with open(self.store_path, encoding='utf-8') as f:
+                    state = json.load(f)
+                if isinstance(state.get('topics'), dict):
+                    return state
+            except (OSError, ValueError) as e:
+                if not isinstance(e, FileNotFoundError):
+                    print(f"⚠️  Could not read hub state {self.store_path}: {e}")
+        return {'topics': {}}
+
+    def _save(self):
+        """Write the state file atomically; call with ``self._lock`` held."""
+        if not self.store_path:
+            return
+        import tempfile
+
+        directory = os.path.dirname(self.store_path) or '.'
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.websub-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, separators=(',', ':'))
+            os.replace(tmp_path, self.store_path)
+        except OSError as e:
+            print(f"⚠️  Could not write hub state {self.store_path}: {e}")
+
+    def _topic(self, topic):
+        """State of ``topic``, created on first use; call with the lock held."""
+        return self.state['topics'].setdefault(topic, {'seen': None, 'subscribers': {}})
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _topic_lock(self, topic):
+        with self._lock:
+            return self._topic_locks.setdefault(topic, threading.Lock())
+
+    def subscribers(self, topic):
+        """Callbacks with a live lease on ``topic``."""
+        now = time.time()
+        with self._lock:
+            subscribers = self.state['topics'].get(topic, {}).get('subscribers', {})
+            return sorted(callback for callback, sub in subscribers.items() if sub['expires'] > now)
+
+    # Requests
+
+    def check_topic(self, topic):
+        if not _is_http_url(topic):
+            raise HubError("hub.topic must be an http(s) URL")
+        if self.topics is not None and not topic.startswith(self.topics):
+            raise HubError(f"topic not served by this hub: {topic}")
+
+    def handle(self, form: dict):
+        """Answer a hub request.
+
+        Args:
+            form: Decoded ``application/x-www-form-urlencoded`` body, values
+                as strings or lists of strings (``parse_qs`` output)
+
+        Returns:
+            Tuple of (HTTP status, plain-text body). The work behind a 202
+            happens on the hub's threads; ``handle`` never blocks on it.
+        """
+        mode = _first(form, 'hub.mode')
+        try:
+            if mode in ('subscribe', 'unsubscribe'):
+                callback = _first(form, 'hub.callback')
+                topic = _first(form, 'hub.topic')
+                if not _is_http_url(callback):
+                    raise HubError("hub.callback must be an http(s) URL")
+                self.check_topic(topic)
+                secret = _first(form, 'hub.secret')
+                if secret and len(secret.encode('utf-8')) >= MAX_SECRET_BYTES:
+                    raise HubError(f"hub.secret must be shorter than {MAX_SECRET_BYTES} bytes")
+                lease = _first(form, 'hub.lease_seconds')
+                if lease is not None and not lease.isdigit():
+                    raise HubError("hub.lease_seconds must be a non-negative integer")
+                lease = min(int(lease), MAX_LEASE) if lease else DEFAULT_LEASE
+                self._jobs.submit(self.verify, mode, callback, topic, lease, secret)
+                return 202, "Accepted\n"
+            if mode == 'publish':
+                topics = _all(form, 'hub.url') or _all(form, 'hub.topic')
+                if not topics:
+                    raise HubError("publish needs hub.url")
+                for topic in topics:
+                    self.check_topic(topic)
+                for topic in topics:
+                    self._jobs.submit(self.publish, topic)
+                return 202, "Accepted\n"
+            raise HubError(f"unsupported hub.mode: {mode}")
+        except HubError as e:
+            return 400, f"{e}\n"
+
+    def verify(self, mode, callback, topic, lease, secret=None):
+        """Confirm a (un)subscription with the subscriber, then apply it.
+
+        Returns:
+            True if the callback echoed the challenge.
+        """
+        import secrets
+
+        challenge = secrets.token_urlsafe(24)
+        params = {'hub.mode': mode, 'hub.topic': topic, 'hub.challenge': challenge}
+        if mode == 'subscribe':
+            params['hub.lease_seconds'] = str(lease)
+        try:
+            response = self._http.get(callback, params=params, timeout=self.timeout)
+            confirmed = 200 <= response.status_code < 300 and response.text.strip() == challenge
+        except Exception as e:
+            print(f"⚠️  Verifying {callback} failed: {e}")
+            confirmed = False
+        if not confirmed:
+            self._count('rejected')
+            print(f"🚫 {mode} of {callback} to {topic} not confirmed")
+            return False
+
+        with self._lock:
+            state = self._topic(topic)
+            if mode == 'subscribe':
+                state['subscribers'][callback] = {'secret': secret, 'expires': time.time() + lease}
+            else:
+                state['subscribers'].pop(callback, None)
+            self._save()
+            needs_baseline = mode == 'subscribe' and state['seen'] is None
+        self._count('verified')
+        print(f"✅ {mode} {callback} -> {topic}")
+        if needs_baseline:
+            # So the first publish after a subscribe pushes only what's new
+            self.publish(topic)
+        return True
+
+    def publish(self, topic):
+        """Fetch ``topic`` and push its new items to every subscriber.
+
+        Returns:
+            Number of successful deliveries.
+        """
+        # Publishes of one topic run one at a time so each diffs against
+        # the ids the previous one recorded
+        with self._topic_lock(topic):
+            try:
+                response = self._http.get(topic, timeout=self.timeout)
+                response.raise_for_status()
+                body = response.text
+                with self._lock:
+                    seen = self._topic(topic)['seen']
+                diff, fresh, ids = new_items(body, set(seen or ()))
+            except Exception as e:
+                print(f"⚠️  Fetching topic {topic} failed: {e}")
+                return 0
+
+            with self._lock:
+                state = self._topic(topic)
+                first = state['seen'] is None
+                merged = list(dict.fromkeys(ids + (state['seen'] or [])))
+                state['seen'] = merged[:MAX_SEEN]
+                now = time.time()
+                for callback in [c for c, sub in state['subscribers'].items() if sub['expires'] <= now]:
+                    del state['subscribers'][callback]
+                subscribers = dict(state['subscribers'])
+                self._save()
+
+            self._count('published')
+            if first or diff is None or not subscribers:
+                if first:
+                    print(f"📌 Baseline of {len(ids)} items for {topic}")
+                return 0
+
+            content_type = response.headers.get('Content-Type', 'application/octet-stream')
+            data = diff.encode('utf-8')
+            futures = [
+                self._deliveries.submit(self._deliver, callback, sub.get('secret'), topic, data, content_type)
+                for callback, sub in subscribers.items()
+            ]
+            delivered = sum(1 for future in futures if future.result())
+            print(f"📣 {topic}: {fresh} new items to {delivered}/{len(futures)} subscribers")
+            return delivered
+
+    def _deliver(self, callback, secret, topic, data, content_type):
+        headers = {
+            'Content-Type': content_type,
+            'Link': f'<{self.url}>; rel="hub", <{topic}>; rel="self"',
+        }
+        if secret:
+            import hmac
+            import hashlib
+
+            digest = hmac.new(secret.encode('utf-8'), data, hashlib.sha256).hexdigest()
+            headers['X-Hub-Signature'] = f'sha256={digest}'
+        try:
+            response = self._http.post(callback, data=data, headers=headers, timeout=self.timeout)
+        except Exception as e:
+            self._count('failed')
+            print(f"⚠️  Delivery to {callback} failed: {e}")
+            return False
+        if response.status_code == 410:
+            # The subscriber is gone for good (WebSub section 7)
+            with self._lock:
+                self._topic(topic)['subscribers'].pop(callback, None)
+                self._save()
+            self._count('gone')
+            return False
+        if not 200 <= response.status_code < 300:
+            self._count('failed')
+            print(f"⚠️  Delivery to {callback} answered {response.status_code}")
+            return False
+        self._count('delivered')
+        return True
+
+    def close(self, wait=True):
+        self._jobs.shutdown(wait=wait)
+        self._deliveries.shutdown(wait=wait)
+        self._http.close()
+
+
+# --- Publishers --------------------------------------------------------
+
+def ping(topics, hub: str = HUB_URL, timeout: float = TIMEOUT) -> bool:
+    """Tell ``hub`` that ``topics`` changed.
+
+    A no-op without a hub. Failures are logged, not raised: a missed ping
+    only means subscribers wait for their next poll.
+
+    Returns:
+        True if the hub accepted the ping.
+    """
+    topics = [topic for topic in topics if topic]
+    if not hub or not topics:
+        return False
+    import requests
+
+    try:
+        response = requests.post(
+            hub, data=[('hub.mode', 'publish')] + [('hub.url', topic) for topic in topics],
+            timeout=timeout,
+        )
+    except Exception as e:
+        print(f"⚠️  WebSub ping to {hub} failed: {e}")
+        return False
+    if not 200 <= response.status_code < 300:
+        print(f"⚠️  WebSub hub {hub} answered {response.status_code}")
+        return False
+    print(f"📣 Pinged {hub} for {len(topics)} topics")
+    return True
+
+
+def ping_in_background(topics, hub: str = HUB_URL):
+    """``ping`` on a daemon thread, so a request handler doesn't wait for the hub."""
+    if not hub:
+        return
+    threading.Thread(target=ping, args=(list(topics), hub), name='websub-ping', daemon=True).start()
@@ -0,0 +1,57 @@
+"""
+XML escaping and CDATA helpers
+==============================
+
+The single escaping point for every feed field. Callers hand raw text to the
+serializer; nothing upstream should pre-escape.
+
+Text that needs no escaping is returned as-is after one regex scan. Otherwise
+a single ``str.translate`` pass escapes markup characters and drops
+characters that are not allowed in XML 1.0 documents.
+"""
+
+import re
+
+
+# Control characters XML 1.0 forbids even as character references
+_INVALID_CHARS = [c for c in range(0x20) if c not in (0x09, 0x0A, 0x0D)] + [0xFFFE, 0xFFFF]
+_INVALID_RE = r'\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff'
+
+_TEXT_RE = re.compile(f'[&<>{_INVALID_RE}]')
+_ATTR_RE = re.compile(f'[&<>"{_INVALID_RE}]')
+_CDATA_RE = re.compile(f'[{_INVALID_RE}]|]]>')
+
+_TEXT_TABLE = {ord('&'): '&amp;', ord('<'): '&lt;', ord('>'): '&gt;'}
+_TEXT_TABLE.update(dict.fromkeys(_INVALID_CHARS))
+_ATTR_TABLE = {**_TEXT_TABLE, ord('"'): '&quot;'}
+_STRIP_TABLE = dict.fromkeys(_INVALID_CHARS)
+
+
+class CData(str):
+    """Marks element text the serializer should wrap in a CDATA section."""
+    __slots__ = ()
+
+
+def escape_text(text: str) -> str:
+    """Escape character data for use between XML tags."""
+    if _TEXT_RE.search(text) is None:
+        return text
+    return text.translate(_TEXT_TABLE)
+
+
+def escape_attr(text: str) -> str:
+    """Escape a value for use inside a double-quoted XML attribute."""
+    if _ATTR_RE.search(text) is None:
+        return text
+    return text.translate(_ATTR_TABLE)
+
+
+def cdata(text: str) -> str:
+    """Wrap text in a CDATA section.
+
+    A literal ``]]>`` cannot appear inside CDATA, so the section is closed
+    after ``]]`` and a new one is opened for the remaining ``>``.
+    """
+    if _CDATA_RE.search(text) is not None:
+        text = text.translate(_STRIP_TABLE).replace(']]>', ']]]]><![CDATA[>')
+    return f'<![CDATA[{text}]]>'
@@ -7,225 +7,659 @@ Generates RSS feed from Molthub posts for Vercel deployment.
 Environment Variables:
     MOLTHUB_API_KEY - API key for Molthub
     MOLTHUB_SUBMOLT_ID - Sub-molt ID to fetch posts from
+    MOLTHUB_SUBMOLT_IDS - Comma-separated sub-molt IDs served via ?submolt=<id>
+                        and merged into the ?submolt=all feed
+    MOLTHUB_CONCURRENCY - Sub-molt fetches in flight for ?submolt=all (default: 32)
+    MOLTHUB_RATE_PER_SECOND - Molthub request rate limit (default: 50)
     RSS_CACHE_SECONDS - Cache duration (default: 3600)
+    RSS_STALE_WHILE_REVALIDATE - Seconds past expiry a cached feed is served
+                        while refreshing in the background (default: 600)
+    RSS_STALE_IF_ERROR - Seconds past expiry a cached feed is served when
+                        Molthub fails (default: 86400)
+    MOLTHUB_FULL_SYNC_SECONDS - Interval between full (non-incremental)
+                        post list fetches (default: 86400)
+    RSS_CACHE_BACKEND - memory | file | sqlite | redis (default: memory),
+                        see _feedcache.py for RSS_CACHE_PATH / RSS_CACHE_URL
+    TRACE_LOG, TRACE_PROFILE, TRACE_PROFILE_RATE - request logging and
+                        profiling, see _trace.py
+    FEED_VARIANT_CACHE_BYTES - Memory budget for ?category= / ?author=
+                        filtered feeds, see _filters.py
+    MOLTHUB_FEED_URL - Public URL this function is served at; the feeds'
+                        self links and WebSub topics are built from it
+                        (default: https://eschaton-rss-vercel.vercel.app/api/feed)
+    WEBSUB_HUB_URL - WebSub hub advertised in the feed and pinged when a
+                        sub-molt's feed changes, see _websub.py
 """
 
 import os
 import json
 import time
-import hashlib
-import requests
-from datetime import datetime
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
+import threading
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from _conditional import is_not_modified, strong_etag, validator_headers, variant_etag
+from _encoding import (
+    VariantCache, encoding_headers, negotiated_coding, response_body, select_variant,
+)
+from _feedcache import cache_from_env
+from _filters import BadFilter, UnknownFilter, VariantLRU, from_request as feed_filter
+from _dates import parse_iso8601, rfc822_from_iso
+from _formats import FORMATS, format_for, render_feed
+from _fragments import FragmentCache
+from _poststore import load_store, merge_posts, save_store
+from _model import Channel, FeedItem
+from _request import get_query
+from _singleflight import SingleFlight
+from _trace import count, instrumented, note, span, tag
+from _websub import HUB_URL, ping_in_background
+from _xmlescape import escape_attr
 
 
 # Configuration
 API_BASE = "https://molthub.studio/api/v1"
 DEFAULT_SUBMOLT_ID = "11a42d04-e060-4544-a1b8-bee08f7b15ab"
+FEED_URL = os.getenv('MOLTHUB_FEED_URL', 'https://eschaton-rss-vercel.vercel.app/api/feed')
 CACHE_DURATION = int(os.getenv('RSS_CACHE_SECONDS', '3600'))  # 1 hour default
+STALE_WHILE_REVALIDATE = int(os.getenv('RSS_STALE_WHILE_REVALIDATE', '600'))
+STALE_IF_ERROR = int(os.getenv('RSS_STALE_IF_ERROR', '86400'))
+
+ALL_SUBMOLTS = "all"
+SUBMOLT_IDS = [s.strip() for s in os.getenv('MOLTHUB_SUBMOLT_IDS', '').split(',') if s.strip()]
+CONCURRENCY = int(os.getenv('MOLTHUB_CONCURRENCY', '32'))
+RATE_PER_SECOND = float(os.getenv('MOLTHUB_RATE_PER_SECOND', '50'))
+
+FEED_LIMIT = 30
+FULL_SYNC_INTERVAL = int(os.getenv('MOLTHUB_FULL_SYNC_SECONDS', '86400'))
+
+# Keep entries around long enough to serve them stale
+CACHE_RETENTION = CACHE_DURATION + max(STALE_WHILE_REVALIDATE, STALE_IF_ERROR)
+
+# Rendered-feed cache; a shared backend lets every instance reuse one fetch
+_cache = cache_from_env()
 
-# In-memory cache (for serverless, consider Redis or similar)
-_cache = {
-    'data': None,
-    'timestamp': 0,
-    'etag': None
-}
+# One in-flight refresh per sub-molt; concurrent misses wait for it
+_refresh_flight = SingleFlight()
+_variants = VariantCache()
+_fragments = FragmentCache()
+# Filtered variants keyed by (entry ETag, format, filters), size-bounded
+_filtered = VariantLRU()
+
+
+# Modules that cost tens of milliseconds to import (requests, asyncio,
+# logging) are imported where first needed, so a cold start that serves
+# from the shared cache never loads them.
+def _logger():
+    import logging
+    return logging.getLogger(__name__)
 
 
 def fetch_posts(submolt_id: str, api_key: str, limit: int = 30) -> list:
     """Fetch posts from Molthub sub-molt."""
+    return fetch_posts_conditional(submolt_id, api_key, limit)['posts']
+
+
+def fetch_posts_conditional(submolt_id: str, api_key: str, limit: int = 30,
+                            etag: str = None, last_modified: str = None,
+                            since: str = None) -> dict:
+    """Fetch posts from Molthub, revalidating against a previous response.
+    
+    Args:
+        etag: ETag of the previous response, sent as If-None-Match
+        last_modified: Last-Modified of the previous response, sent as
+            If-Modified-Since
+        since: createdAt of the newest post already stored; only newer
+            posts are requested
+    
+    Returns:
+        Dict with 'status' (200 or 304), 'posts' (empty on 304), and the
+        response's 'etag' and 'last_modified' validators.
+    """
     headers = {
         "Authorization": f"Bearer {api_key}",
         "User-Agent": "EschatonRSS/1.0"
     }
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
     
     params = {
         "submoltId": submolt_id,
         "limit": limit
     }
+    if since:
+        params["since"] = since
+    
+    from _http import get as http_get
     
-    response = requests.get(
-        f"{API_BASE}/posts",
-        params=params,
-        headers=headers,
-        timeout=30
+    with span('fetch'):
+        response = http_get(f"{API_BASE}/posts", params=params, headers=headers)
+    count(f'upstream.{response.status_code}')
+    timings = response.timings
+    note(
+        'upstream', submolt=submolt_id, status=response.status_code,
+        incremental=bool(since), attempts=timings['attempts'], reused=timings['reused'],
+        **{f'{phase}_ms': round(timings[phase] * 1000, 1)
+           for phase in ('total', 'connect', 'tls', 'ttfb', 'body', 'retry_wait')},
     )
+    if response.status_code == 304:
+        return {'status': 304, 'posts': [], 'etag': etag, 'last_modified': last_modified}
     response.raise_for_status()
-    return response.json()
+    with span('parse'):
+        posts = response.json()
+    if since:
+        # The cursor is a hint; never trust upstream to have applied it
+        posts = [post for post in posts if (post.get('createdAt') or '') > since]
+    return {
+        'status': response.status_code,
+        'posts': posts,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+
+
+def posts_key(submolt_id: str) -> str:
+    """Cache key for a sub-molt's local post store."""
+    return f"posts:{submolt_id}"
+
+
+def sync_posts(submolt_id: str, api_key: str, now: float = None, max_age: float = 0):
+    """Bring the local post store up to date with Molthub.
+    
+    Between full syncs, sends a conditional request carrying the stored
+    validators that only asks for posts newer than the stored cursor. Stores
+    checked less than ``max_age`` seconds ago are used without a request.
+    
+    Returns:
+        Tuple of (posts newest first, changed flag)
+    """
+    now = now or time.time()
+    key = posts_key(submolt_id)
+    store = load_store(_cache, key)
+    
+    if store['posts'] and (now - store['synced']) < max_age:
+        return store['posts'], False
+    
+    full = not store['posts'] or (now - store['full_sync']) >= FULL_SYNC_INTERVAL
+    # A full sync is unconditional: the validators were last refreshed by an
+    # incremental fetch, which can't see deletions or edits to older posts,
+    # so a 304 would leave those out of the store for another interval
+    result = fetch_posts_conditional(
+        submolt_id, api_key, FEED_LIMIT,
+        etag=None if full else store['etag'],
+        last_modified=None if full else store['last_modified'],
+        since=None if full else store['cursor'],
+    )
+    
+    store['synced'] = now
+    if result['status'] == 304:
+        save_store(_cache, key, store, now)
+        return store['posts'], False
+    
+    posts, changed = merge_posts(store['posts'], result['posts'], FEED_LIMIT, replace=full)
+    store.update(
+        posts=posts,
+        etag=result['etag'],
+        last_modified=result['last_modified'],
+        cursor=posts[0].get('createdAt') if posts else None,
+    )
+    if full:
+        store['full_sync'] = now
+    save_store(_cache, key, store, now)
+    return posts, changed
 
 
 def format_rfc822_date(iso_date: str) -> str:
-    """Convert ISO date to RFC-822 format for RSS."""
-    try:
-        dt = datetime.fromisoformat(iso_date.replace('Z', '+00:00'))
-        return dt.strftime('%a, %d %b %Y %H:%M:%S GMT')
-    except:
-        return datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
+    """Convert ISO date to RFC-822 format for RSS (None if unparsable)."""
+    return rfc822_from_iso(iso_date)
 
 
 def escape_xml(text: str) -> str:
     """Escape special XML characters."""
-    return (text
-        .replace('&', '&amp;')
-        .replace('<', '&lt;')
-        .replace('>', '&gt;')
-        .replace('"', '&quot;')
+    return escape_attr(text)
+
+
+def feed_url(fmt: str = 'rss', submolt_id: str = None, filters=None) -> str:
+    """URL of a sub-molt's feed in one format, as served by this function.
+    
+    Used as the feed's self link and as its WebSub topic, so a ping names
+    exactly the document that advertised the hub.
+    """
+    params = []
+    if fmt != 'rss':
+        params.append(f'format={fmt}')
+    if submolt_id is not None and submolt_id != default_submolt():
+        params.append(f"submolt={quote(submolt_id, safe='')}")
+    if filters is not None:
+        params.append(filters.query())
+    query = '?' + '&'.join(params) if params else ''
+    return FEED_URL + query
+
+
+def feed_channel(updated: datetime = None, filters=None, submolt_id: str = None) -> Channel:
+    """Channel metadata for the Molthub feed."""
+    return Channel(
+        title='The Agentic Eschaton Report',
+        home_url='https://molthub.studio/s/eschaton',
+        description=(
+            'Daily intelligence brief on the agent economy, strategic signals, '
+            'and eschaton alignment tracking. Prepared by Ezekiel, Pattern Analyst.'
+        ),
+        feed_url=lambda fmt, page=None: feed_url(fmt, submolt_id, filters),
+        updated=updated or datetime.now(timezone.utc),
+        language='en',
+        generator='EschatonRSS/1.0',
+        icon='https://molthub.studio/favicon.png',
+        image='https://molthub.studio/favicon.png',
+        ttl=60,
+        # Only unfiltered feeds are pinged when posts change (refresh_feed)
+        hub=HUB_URL if filters is None else None,
     )
 
 
-def generate_rss(posts: list) -> str:
+def generate_rss(posts: list, submolt_id: str = None) -> str:
     """Generate RSS XML from posts."""
-    rss = Element('rss', version='2.0')
-    rss.set('xmlns:atom', 'http://www.w3.org/2005/Atom')
+    return generate_feed(posts, 'rss', submolt_id=submolt_id)
+
+
+def generate_feed(posts: list, fmt: str = 'rss', filters=None, submolt_id: str = None) -> str:
+    """Render posts in one of the ``_formats.FORMATS`` formats.
+    
+    With ``filters`` only the posts whose items match are included;
+    ``submolt_id`` picks the self link (default: the default sub-molt's).
+    """
+    with span('render'):
+        items = [_post_item(post) for post in posts]
+        if filters is not None:
+            items = [item for item in items if filters.matches(item)]
+        # Dated by the newest post, so an unchanged post list renders
+        # byte-identically (and keeps its ETag)
+        newest = max((item.updated or item.published for item in items
+                      if item.updated or item.published), default=None)
+        channel = feed_channel(newest, filters, submolt_id)
+    with span('serialize'):
+        return render_feed(fmt, channel, items, _fragments)
+
+
+def _post_key(post: dict):
+    """Content identity of a post's rendered item."""
+    # commentCount toggles the comments link without bumping updatedAt
+    version = post.get('updatedAt') or post.get('createdAt')
+    return (post.get('id'), version, post.get('commentCount', 0) > 0)
+
+
+def _post_item(post: dict) -> FeedItem:
+    """Build the feed item for one Molthub post."""
+    post_id = post.get('id', '')
+    post_url = f"https://molthub.studio/p/{post_id}"
+    
+    author = post.get('author', {})
+    author_name = author.get('name', 'ezekiel_prophet')
     
-    channel = SubElement(rss, 'channel')
+    # Truncate for description
+    content = post.get('content', '')
+    description = content[:500] + '...' if len(content) > 500 else content
     
-    # Channel metadata
-    SubElement(channel, 'title').text = 'The Agentic Eschaton Report'
-    SubElement(channel, 'link').text = 'https://molthub.studio/s/eschaton'
-    SubElement(channel, 'description').text = (
-        'Daily intelligence brief on the agent economy, strategic signals, '
-        'and eschaton alignment tracking. Prepared by Ezekiel, Pattern Analyst.'
+    # Categories (from submolt)
+    submolt = post.get('submolt', {})
+    category = submolt.get('displayName', 'Intelligence')
+    
+    comment_count = post.get('commentCount', 0)
+    
+    return FeedItem(
+        id=post_url,
+        title=post.get('title', 'Untitled'),
+        url=post_url,
+        # A bad createdAt leaves pubDate out rather than inventing one that
+        # changes on every build
+        published=parse_iso8601(post.get('createdAt')) or parse_iso8601(post.get('updatedAt')),
+        updated=parse_iso8601(post.get('updatedAt')),
+        author_name=author_name,
+        author_email=f"{author_name}@molthub.studio",
+        summary=description,
+        categories=[category],
+        comments_url=f"{post_url}#comments" if comment_count > 0 else None,
+        key=_post_key(post),
     )
-    SubElement(channel, 'language').text = 'en'
-    SubElement(channel, 'lastBuildDate').text = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
-    SubElement(channel, 'generator').text = 'EschatonRSS/1.0'
-    SubElement(channel, 'ttl').text = '60'
-    
-    # Atom self-link
-    atom_link = SubElement(channel, 'atom:link')
-    atom_link.set('href', 'https://eschaton-rss-vercel.vercel.app/feed.xml')
-    atom_link.set('rel', 'self')
-    atom_link.set('type', 'application/rss+xml')
-    
-    # Image/logo
-    image = SubElement(channel, 'image')
-    SubElement(image, 'url').text = 'https://molthub.studio/favicon.png'
-    SubElement(image, 'title').text = 'The Agentic Eschaton Report'
-    SubElement(image, 'link').text = 'https://molthub.studio/s/eschaton'
-    
-    # Items
-    for post in posts:
-        item = SubElement(channel, 'item')
-        
-        # Title
-        title = post.get('title', 'Untitled')
-        SubElement(item, 'title').text = escape_xml(title)
-        
-        # Link
-        post_id = post.get('id', '')
-        post_url = f"https://molthub.studio/p/{post_id}"
-        SubElement(item, 'link').text = post_url
-        
-        # GUID (permalink)
-        guid = SubElement(item, 'guid')
-        guid.text = post_url
-        guid.set('isPermaLink', 'true')
-        
-        # Publication date
-        created_at = post.get('createdAt', '')
-        SubElement(item, 'pubDate').text = format_rfc822_date(created_at)
-        
-        # Author
-        author = post.get('author', {})
-        author_name = author.get('name', 'ezekiel_prophet')
-        SubElement(item, 'author').text = f"{author_name}@molthub.studio"
-        
-        # Description/Content
-        content = post.get('content', '')
-        # Truncate for description, keep full content in content:encoded if needed
-        description = content[:500] + '...' if len(content) > 500 else content
-        SubElement(item, 'description').text = escape_xml(description)
-        
-        # Categories (from submolt)
-        submolt = post.get('submolt', {})
-        category = submolt.get('displayName', 'Intelligence')
-        SubElement(item, 'category').text = category
-        
-        # Comments link
-        comment_count = post.get('commentCount', 0)
-        if comment_count > 0:
-            SubElement(item, 'comments').text = f"{post_url}#comments"
+
+
+def cache_key(submolt_id: str) -> str:
+    """Cache key for a sub-molt's rendered feed."""
+    return f"feed:{submolt_id}"
+
+
+def _read_cache(key: str):
+    """Read a cache entry, treating backend errors as a miss."""
+    try:
+        with span('store'):
+            entry = _cache.get(key)
+    except Exception as e:
+        note('cache_error', op='read', key=key, error=str(e))
+        return None
+    if entry and ('formats' not in entry or 'posts' not in entry or 'submolt' not in entry):
+        # Written before per-format bodies (or filtering, or per-sub-molt
+        # self links) existed; re-render once
+        return None
+    return entry
+
+
+def feed_body(entry: dict, fmt: str = 'rss'):
+    """Body and ETag of one format from a cache entry.
     
-    # Pretty print XML
-    rough_string = tostring(rss, encoding='unicode')
-    reparsed = minidom.parseString(rough_string)
-    pretty = reparsed.toprettyxml(indent="  ")
+    Entries hold every format rendered from the same posts: RSS in
+    'body'/'etag', the others under 'formats'.
+    """
+    if fmt == 'rss':
+        return entry['body'], entry.get('etag')
+    variant = entry['formats'][fmt]
+    return variant['body'], variant.get('etag')
+
+
+def filtered_body(entry: dict, fmt: str, filters):
+    """Body and ETag of a filtered variant of a cache entry.
     
-    # Remove extra blank lines
-    lines = [line for line in pretty.split('\n') if line.strip()]
-    return '\n'.join(lines)
+    Rendered from the posts stored with the entry, so filters never cause
+    an upstream request; variants are kept until the entry's posts change
+    or the size-bounded LRU evicts them.
+    
+    Raises:
+        UnknownFilter: no stored post has the category or author
+    """
+    def render():
+        items = [_post_item(post) for post in entry['posts']]
+        filters.require_known([category for item in items for category in item.categories],
+                              [item.author_name for item in items if item.author_name])
+        body = generate_feed(entry['posts'], fmt, filters, entry['submolt'])
+        return body, strong_etag(body)
+    
+    hits = _filtered.stats['hits']
+    result = _filtered.get((entry['etag'], fmt, filters.key), render)
+    count('filtered.hit' if _filtered.stats['hits'] != hits else 'filtered.miss')
+    return result
 
 
-def get_cached_or_fetch(submolt_id: str, api_key: str) -> str:
-    """Get RSS from cache or fetch fresh data."""
-    global _cache
+def _age(entry) -> float:
+    return time.time() - entry['timestamp']
+
+
+def _is_fresh(entry) -> bool:
+    return bool(entry) and _age(entry) < CACHE_DURATION
+
+
+def get_cached_entry(submolt_id: str, api_key: str) -> dict:
+    """Get the cached feed entry (body, etag, timestamp) or fetch fresh data.
+
+    The returned entry carries a 'status' of 'hit', 'miss', 'coalesced',
+    'stale' (served while a background refresh runs) or 'stale-if-error'
+    (served because the refresh failed).
+    """
+    key = cache_key(submolt_id)
+    
+    # Check cache validity
+    entry = _read_cache(key)
+    # The handler tags each outcome as 'cache' in the request's log line
+    if _is_fresh(entry):
+        return dict(entry, status='hit')
+    
+    if entry and _age(entry) < CACHE_DURATION + STALE_WHILE_REVALIDATE:
+        _start_background_refresh(submolt_id, api_key)
+        return dict(entry, status='stale')
+    
+    try:
+        fresh, shared = _refresh_flight.do(key, lambda: _refresh_locked(submolt_id, api_key))
+    except Exception as e:
+        if entry and _age(entry) < CACHE_DURATION + STALE_IF_ERROR:
+            note('refresh_error', submolt=submolt_id, error=str(e), served='stale')
+            return dict(entry, status='stale-if-error')
+        raise
+    return dict(fresh, status='coalesced' if shared else 'miss')
+
+
+def _start_background_refresh(submolt_id: str, api_key: str):
+    """Refresh a sub-molt's feed on a daemon thread unless one is running.
+
+    On serverless platforms the instance may be frozen once the response is
+    sent, in which case the refresh resumes (or is redone) on the next
+    invocation.
+    """
+    key = cache_key(submolt_id)
+    if _refresh_flight.in_flight(key):
+        return
+    
+    def run():
+        try:
+            _refresh_flight.do(key, lambda: _refresh_locked(submolt_id, api_key))
+        except Exception as e:
+            note('refresh_error', submolt=submolt_id, error=str(e), background=True)
     
+    threading.Thread(target=run, name=f"refresh-{submolt_id}", daemon=True).start()
+
+
+def _refresh_locked(submolt_id: str, api_key: str) -> dict:
+    """Refresh under the backend's cross-process lock."""
+    key = cache_key(submolt_id)
+    with _cache.lock(key):
+        # Another process may have refreshed while we waited for the lock
+        entry = _read_cache(key)
+        if _is_fresh(entry):
+            count('cache.refreshed_elsewhere')
+            return entry
+        return refresh_feed(submolt_id, api_key)
+
+
+def refresh_feed(submolt_id: str, api_key: str) -> dict:
+    """Fetch posts, render the feed and store it in the cache."""
+    key = cache_key(submolt_id)
     now = time.time()
     
-    # Check cache validity
-    if _cache['data'] and (now - _cache['timestamp']) < CACHE_DURATION:
-        print("📦 Serving from cache")
-        return _cache['data']
+    if submolt_id == ALL_SUBMOLTS:
+        posts, _ = aggregate_posts(api_key, now)
+    else:
+        posts, _ = sync_posts(submolt_id, api_key, now)
+    previous = _read_cache(key)
     
-    # Fetch fresh data
-    print("🔄 Fetching fresh data from Molthub...")
-    posts = fetch_posts(submolt_id, api_key)
-    rss = generate_rss(posts)
+    # Compare against the posts this feed was rendered from, not the store's
+    # changed flag: post stores are shared with ?submolt=all, so whichever
+    # refresh syncs a store first consumes the change
+    if previous and [_post_key(p) for p in posts] == [_post_key(p) for p in previous['posts']]:
+        # Nothing new upstream: keep the rendered feed, just restart its TTL
+        entry = dict(previous, timestamp=now)
+        entry.pop('status', None)
+    else:
+        # Render every format from the one fetch so /feed.json and
+        # /atom.xml never trigger their own upstream requests
+        rss = generate_rss(posts, submolt_id)
+        etag = strong_etag(rss)
+        formats = {}
+        for fmt in FORMATS:
+            if fmt != 'rss':
+                body = generate_feed(posts, fmt, submolt_id=submolt_id)
+                formats[fmt] = {'body': body, 'etag': strong_etag(body)}
+        
+        # Last-Modified only moves when the rendered feed actually changed
+        if previous and previous.get('etag') == etag and previous.get('modified'):
+            modified = previous['modified']
+        else:
+            modified = now
+        
+        entry = {
+            'body': rss,
+            'etag': etag,
+            'formats': formats,
+            # Kept for filtered variants (see filtered_body)
+            'posts': posts,
+            'submolt': submolt_id,
+            'timestamp': now,
+            'modified': modified,
+        }
     
     # Update cache
-    _cache['data'] = rss
-    _cache['timestamp'] = now
-    _cache['etag'] = hashlib.md5(rss.encode()).hexdigest()
+    try:
+        with span('store'):
+            _cache.set(key, entry, ttl=CACHE_RETENTION)
+    except Exception as e:
+        # A broken shared cache must not take the feed down with it
+        note('cache_error', op='write', key=key, error=str(e))
+    
+    if previous and previous.get('etag') != entry['etag']:
+        # Pinged once the entry is stored, so the hub fetches the new feed;
+        # the topics are the self links of the documents just rendered
+        ping_in_background([feed_url(fmt, submolt_id) for fmt in FORMATS])
+    
+    return entry
+
+
+def aggregate_posts(api_key: str, now: float = None):
+    """Merge the newest posts of every configured sub-molt.
     
-    return rss
+    Each sub-molt keeps its own post store, so sub-molts refreshed within
+    CACHE_DURATION cost no upstream request.
+    
+    Returns:
+        Tuple of (posts newest first, changed flag)
+    """
+    from _aggregate import aggregate
+    
+    submolt_ids = SUBMOLT_IDS or [DEFAULT_SUBMOLT_ID]
+    # Per-sub-molt fetches run on worker threads outside the request trace
+    with span('aggregate'):
+        return aggregate(
+            submolt_ids,
+            lambda submolt_id: sync_posts(submolt_id, api_key, now, max_age=CACHE_DURATION),
+            FEED_LIMIT,
+            concurrency=CONCURRENCY,
+            rate=RATE_PER_SECOND,
+            burst=max(1, int(RATE_PER_SECOND)),
+            host=API_BASE,
+        )
+
+
+def default_submolt() -> str:
+    """Sub-molt served when a request doesn't name one."""
+    return os.getenv('MOLTHUB_SUBMOLT_ID', DEFAULT_SUBMOLT_ID)
+
+
+def resolve_submolt(request) -> str:
+    """Pick the sub-molt for a request, or None if it isn't one we serve."""
+    default = default_submolt()
+    requested = get_query(request, 'submolt')
+    if not requested:
+        return default
+    if requested == ALL_SUBMOLTS or requested == default or requested in SUBMOLT_IDS:
+        return requested
+    return None
+
+
+def get_cached_or_fetch(submolt_id: str, api_key: str) -> str:
+    """Get RSS from cache or fetch fresh data."""
+    return get_cached_entry(submolt_id, api_key)['body']
+
+
+def cache_control() -> str:
+    """Cache-Control value advertising the same stale windows we honour."""
+    return (
+        f'public, max-age={CACHE_DURATION}, '
+        f'stale-while-revalidate={STALE_WHILE_REVALIDATE}, '
+        f'stale-if-error={STALE_IF_ERROR}'
+    )
 
 
 # Vercel serverless function handler
+@instrumented('feed')
 def handler(request):
     """
     Vercel serverless function entry point.
     
     Usage:
         Deploy this file as api/feed.py in Vercel
-        Access at: /api/feed or /feed.xml
-    """
-    import logging
-    logging.basicConfig(level=logging.INFO)
-    logger = logging.getLogger(__name__)
+        Access at: /api/feed or /feed.xml; Atom and JSON Feed via
+        ?format=atom / ?format=json (or /atom.xml, /feed.json)
     
+    Stage timings go out in the Server-Timing header and one JSON log line
+    per request (see _trace.py).
+    """
     try:
         api_key = os.getenv('MOLTHUB_API_KEY')
-        submolt_id = os.getenv('MOLTHUB_SUBMOLT_ID', DEFAULT_SUBMOLT_ID)
-        
-        logger.info(f"Handler called. API key present: {bool(api_key)}")
-        logger.info(f"Submolt ID: {submolt_id}")
+        submolt_id = resolve_submolt(request)
+        fmt = format_for(request)
+        filters = feed_filter(request)
+        tag('submolt', submolt_id)
+        tag('format', fmt)
+        if filters is not None:
+            tag('filter', filters.query())
+            if filters.section is not None:
+                # Posts have no sections; only the reports feed has them
+                raise BadFilter('section filters are only available on the reports feed')
         
         if not api_key:
-            logger.error("MOLTHUB_API_KEY not configured")
+            _logger().error("MOLTHUB_API_KEY not configured")
             return {
                 'statusCode': 500,
                 'body': json.dumps({'error': 'MOLTHUB_API_KEY not configured'}),
                 'headers': {'Content-Type': 'application/json'}
             }
         
-        rss = get_cached_or_fetch(submolt_id, api_key)
+        if submolt_id is None or fmt is None:
+            return {
+                'statusCode': 404,
+                'body': json.dumps({'error': 'Unknown sub-molt' if fmt else 'Unknown feed format'}),
+                'headers': {'Content-Type': 'application/json'}
+            }
+        
+        entry = get_cached_entry(submolt_id, api_key)
+        if filters is None:
+            rss, etag = feed_body(entry, fmt)
+        else:
+            rss, etag = filtered_body(entry, fmt, filters)
+        modified = entry.get('modified', entry['timestamp'])
+        status = entry.get('status', 'miss')
+        count(f'cache.{status}')
+        tag('cache', status)
+        
+        headers = {
+            'Cache-Control': cache_control(),
+            'X-Cache': status,
+            'Vary': 'Accept-Encoding',
+            **validator_headers(variant_etag(etag, negotiated_coding(request, rss)), modified),
+        }
         
-        logger.info(f"RSS generated successfully. Size: {len(rss)} bytes")
+        if is_not_modified(request, etag, modified):
+            count('not_modified')
+            return {
+                'statusCode': 304,
+                'body': '',
+                'headers': headers,
+            }
         
+        with span('compress'):
+            coding, data = select_variant(request, _variants.get(etag or strong_etag(rss), rss))
+        tag('encoding', coding)
+        
+        headers['Content-Type'] = FORMATS[fmt].content_type
+        headers.update(encoding_headers(coding))
         return {
             'statusCode': 200,
-            'body': rss,
-            'headers': {
-                'Content-Type': 'application/rss+xml; charset=utf-8',
-                'Cache-Control': f'public, max-age={CACHE_DURATION}',
-                'ETag': _cache.get('etag', '')
-            }
+            'headers': headers,
+            **response_body(coding, data),
+        }
+        
+    except UnknownFilter as e:
+        return {
+            'statusCode': 404,
+            'body': json.dumps({'error': str(e)}),
+            'headers': {'Content-Type': 'application/json'}
+        }
+        
+    except BadFilter as e:
+        return {
+            'statusCode': 400,
+            'body': json.dumps({'error': str(e)}),
+            'headers': {'Content-Type': 'application/json'}
         }
         
     except Exception as e:
-        logger.exception("Error in handler")
+        _logger().exception("Error in handler")
         return {
             'statusCode': 500,
             'body': json.dumps({'error': str(e)}),
@@ -9,11 +9,27 @@ Returns: RSS 2.0 XML with proper content-type
 
 import os
 import re
-import glob
 import json
+import hashlib
 from datetime import datetime, timezone
-from xml.sax.saxutils import escape
-import xml.etree.ElementTree as ET
+
+from _conditional import is_not_modified, strong_etag, validator_headers, variant_etag
+from _encoding import (
+    VariantCache, encoding_headers, negotiated_coding, response_body, select_variant,
+)
+from _dates import format_rfc822
+from _document import DocumentCache, parse as parse_document
+from _filters import BadFilter, UnknownFilter, VariantLRU, from_request as feed_filter
+from _formats import FORMATS, format_for, render_feed
+from _fragments import FragmentCache
+from _model import Channel, FeedItem
+from _markdown import render_document
+from _report_index import ReportIndex
+from _request import get_query
+from _search import SearchIndex, build_index, open_index, signature as search_signature, write_index
+from _trace import count, instrumented, span, tag
+from _websub import HUB_URL
+from _xmlescape import escape_text
 
 # Configuration with environment variable fallbacks
 FEED_TITLE = os.environ.get("FEED_TITLE", "The Agentic Eschaton Report")
@@ -25,223 +41,492 @@ FEED_AUTHOR = os.environ.get("FEED_AUTHOR", "Ezekiel, Pattern Analyst")
 FEED_BASE_URL = os.environ.get("FEED_BASE_URL", "https://eschaton-rss.vercel.app")
 FEED_LANGUAGE = "en-us"
 CACHE_MAX_AGE = int(os.environ.get("CACHE_MAX_AGE", "300"))
+# Archive pages are numbered from the oldest report, so an edit, backfill
+# or removal changes them: cached for an hour, then revalidated by ETag
+# (the same header vercel.json gives the pre-rendered /archive/ files)
+ARCHIVE_CACHE_CONTROL = "public, max-age=3600"
+# File name of each feed format when pre-rendered by build.py
+STATIC_FEED_FILES = {"rss": "feed.xml", "atom": "atom.xml", "json": "feed.json"}
 
 # Determine reports directory (works both locally and on Vercel)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+REPORT_INDEX_PATH = os.environ.get(
+    "REPORT_INDEX_PATH", os.path.join(REPORTS_DIR, ".report-index.json")
+)
+SEARCH_INDEX_PATH = os.environ.get(
+    "SEARCH_INDEX_PATH", os.path.join(REPORTS_DIR, ".search-index.bin")
+)
+
+# Bump when parse_report output changes so stale sidecars are discarded
+PARSER_VERSION = 4
+
+# Compiled once at import rather than looked up in re's cache per call
+REPORT_FILENAME_RE = re.compile(r'daily-report-(\d{4}-\d{2}-\d{2})\.md')
+BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_NEWLINES_RE = re.compile(r'\n+')
+
+# Section the feed summary comes from (slug of "## 🎯 Executive Summary")
+SUMMARY_SECTION = "executive-summary"
+# Feed item HTML covers the blocks that start in the first PREVIEW_CHARS
+PREVIEW_CHARS = 3000
 
 
 def parse_report_date(filename):
     """Extract date from filename like daily-report-2026-02-12.md"""
-    match = re.search(r'daily-report-(\d{4}-\d{2}-\d{2})\.md', filename)
+    match = REPORT_FILENAME_RE.search(filename)
     if match:
-        return datetime.strptime(match.group(1), "%Y-%m-%d")
+        return datetime.fromisoformat(match.group(1))
     return None
 
 
 def extract_summary(content):
     """Extract executive summary from report"""
-    # Look for Executive Summary section
-    match = re.search(r'## 🎯 Executive Summary(.+?)(?=##|\Z)', content, re.DOTALL)
-    if match:
-        summary = match.group(1).strip()
-        # Clean up markdown
-        summary = re.sub(r'\*\*', '', summary)
-        summary = re.sub(r'- ', '', summary)
-        summary = re.sub(r'\n+', ' ', summary)
-        return summary[:500] + "..." if len(summary) > 500 else summary
-    return "Daily intelligence brief from the agent economy frontlines."
+    return document_summary(report_document(content))
 
 
 def extract_title(content, date):
     """Generate title from report"""
-    # Look for key developments in executive summary
-    match = re.search(r'\*\*(.+?)\*\*', content)
-    if match:
-        key_item = match.group(1).strip()
-        if len(key_item) > 10 and len(key_item) < 80:
-            return f"Eschaton Report: {key_item}"
+    return document_title(report_document(content), date)
+
+
+def document_summary(document):
+    """Executive summary text of a parsed report"""
+    section = document.find(SUMMARY_SECTION)
+    if section is not None:
+        # The section's own blocks, without its subsections; markup stripped
+        summary = " ".join(text for text in (block.text() for block in section.blocks) if text)
+        summary = _NEWLINES_RE.sub(" ", summary)
+        return summary[:500] + "..." if len(summary) > 500 else summary
+    return "Daily intelligence brief from the agent economy frontlines."
+
+
+def document_title(document, date):
+    """Title of a parsed report: its first bold phrase, if it reads like a headline"""
+    for text in document.inlines():
+        match = BOLD_RE.search(text)
+        if match:
+            key_item = match.group(1).strip()
+            if len(key_item) > 10 and len(key_item) < 80:
+                return f"Eschaton Report: {key_item}"
+            break
     return f"The Agentic Eschaton Report - {date.strftime('%B %d, %Y')}"
 
 
+def report_document(content, digest=None):
+    """Typed document model of a report, parsed once per content hash"""
+    if digest is None:
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return _documents.get(digest, lambda: parse_document(content))
+
+
+def load_document(entry):
+    """Document model of an indexed report; the file is only read on a cache miss"""
+    return _documents.get(entry["sha256"], lambda: parse_document(read_report(entry)))
+
+
 def get_reports():
     """Get all daily reports sorted by date (newest first)"""
-    pattern = os.path.join(REPORTS_DIR, "daily-report-*.md")
-    reports = []
+    return [(date, _report_index.path_for(entry)) for date, entry in load_reports()]
+
 
-    for filepath in glob.glob(pattern):
-        date = parse_report_date(filepath)
-        if date:
-            reports.append((date, filepath))
+def load_reports():
+    """Get parsed report entries sorted by date (newest first)
 
-    # Sort by date descending
-    reports.sort(key=lambda x: x[0], reverse=True)
-    return reports
+    Only reports that are new or changed since the last call are read and
+    parsed; everything else comes from the report index.
+    """
+    with span("fetch"):
+        _report_index.refresh()
+    return _report_index.entries()
 
 
 def format_rfc2822_date(dt):
     """Format datetime as RFC 2822 for RSS"""
-    return dt.strftime("%a, %d %b %Y %H:%M:%S %z")
+    return format_rfc822(dt)
 
 
 def markdown_to_html(content):
-    """Basic markdown to HTML conversion for RSS content"""
-    html = content
-
-    # Headers
-    html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-    html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-    html = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
-
-    # Bold and italic
-    html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
-    html = re.sub(r'\*(.+?)\*', r'<em>\1</em>', html)
-
-    # Links
-    html = re.sub(r'\[(.+?)\]\((.+?)\)', r'<a href="\2">\1</a>', html)
-
-    # Lists (simple conversion)
-    html = re.sub(r'^- (.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-    html = re.sub(r'(<li>.+</li>\n)+', r'<ul>\g<0></ul>', html)
-
-    # Line breaks
-    html = html.replace('\n\n', '</p><p>')
-    html = html.replace('\n', '<br/>')
-
-    # Wrap in paragraphs if not already
-    if not html.startswith('<'):
-        html = f'<p>{html}</p>'
-
-    return html
-
-
-def generate_feed():
-    """Generate RSS 2.0 feed"""
-    reports = get_reports()
-
-    if not reports:
-        # Return empty feed with message
-        now = datetime.now(timezone.utc)
-        return generate_empty_feed(now)
-
-    # Get feed last build date from most recent report
-    last_build_date = reports[0][0].replace(hour=23, minute=0, tzinfo=timezone.utc)
-
-    # Build RSS XML
-    rss = ET.Element("rss", version="2.0", attrib={
-        "xmlns:atom": "http://www.w3.org/2005/Atom",
-        "xmlns:content": "http://purl.org/rss/1.0/modules/content/"
-    })
-
-    channel = ET.SubElement(rss, "channel")
-
-    # Channel metadata
-    ET.SubElement(channel, "title").text = FEED_TITLE
-    ET.SubElement(channel, "description").text = FEED_DESCRIPTION
-    ET.SubElement(channel, "link").text = FEED_BASE_URL
-    ET.SubElement(channel, "language").text = FEED_LANGUAGE
-    ET.SubElement(channel, "lastBuildDate").text = format_rfc2822_date(last_build_date)
-    ET.SubElement(channel, "generator").text = "Eschaton RSS Generator v2.0 (Vercel)"
-    ET.SubElement(channel, "docs").text = "https://www.rssboard.org/rss-specification"
-    ET.SubElement(channel, "managingEditor").text = "ezekiel@eschaton.local"
-    ET.SubElement(channel, "webMaster").text = "ezekiel@eschaton.local"
-
-    # Atom self-link
-    atom_link = ET.SubElement(channel, "{http://www.w3.org/2005/Atom}link")
-    atom_link.set("href", f"{FEED_BASE_URL}/api/feed")
-    atom_link.set("rel", "self")
-    atom_link.set("type", "application/rss+xml")
-
-    # Image/logo
-    image = ET.SubElement(channel, "image")
-    ET.SubElement(image, "url").text = f"{FEED_BASE_URL}/eschaton-icon.png"
-    ET.SubElement(image, "title").text = FEED_TITLE
-    ET.SubElement(image, "link").text = FEED_BASE_URL
-
-    # Categories
-    categories = ["AI Agents", "Artificial Intelligence", "Technology", "Intelligence", "Agent Economy"]
-    for cat in categories:
-        ET.SubElement(channel, "category").text = cat
-
-    # Add items (last 30 reports max)
-    for date, filepath in reports[:30]:
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            print(f"Error reading {filepath}: {e}")
-            continue
-
-        item = ET.SubElement(channel, "item")
-
-        # Item metadata
-        title = extract_title(content, date)
-        ET.SubElement(item, "title").text = title
-
-        # Link to report
-        date_slug = date.strftime("%Y-%m-%d")
-        item_link = f"{FEED_BASE_URL}/report/{date_slug}"
-        ET.SubElement(item, "link").text = item_link
-
-        # GUID (permalink)
-        guid = ET.SubElement(item, "guid")
-        guid.set("ispermalink", "true")
-        guid.text = item_link
-
-        # Publication date
-        pub_date = date.replace(hour=23, minute=0, tzinfo=timezone.utc)
-        ET.SubElement(item, "pubDate").text = format_rfc2822_date(pub_date)
-
-        # Author
-        ET.SubElement(item, "author").text = f"ezekiel@eschaton.local ({FEED_AUTHOR})"
-
-        # Categories
-        item_cats = ["Daily Brief", "Agent Economy", "Pattern Analysis"]
-        for cat in item_cats:
-            ET.SubElement(item, "category").text = cat
-
-        # Description (summary)
-        summary = extract_summary(content)
-        ET.SubElement(item, "description").text = escape(summary)
-
-        # Full content in content:encoded
-        content_html = markdown_to_html(content[:3000])
-        content_encoded = ET.SubElement(item, "{http://purl.org/rss/1.0/modules/content/}encoded")
-        content_encoded.text = f"<![CDATA[{content_html}...<p><em>Full report available at {item_link}</em></p>]]>"
-
-    # Convert to string
-    rough_string = ET.tostring(rss, encoding='unicode')
-
-    # Add XML declaration
-    xml_output = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    xml_output += rough_string
-
-    return xml_output
-
-
-def generate_empty_feed(now):
+    """Markdown to HTML conversion for RSS content"""
+    return render_document(report_document(content))
+
+
+def parse_report(content, date):
+    """Derive the cached feed fields for one report from its document model"""
+    with span("parse"):
+        document = report_document(content)
+        return {
+            "title": document_title(document, date),
+            "summary": document_summary(document),
+            "html": render_document(document, limit=PREVIEW_CHARS),
+            # Heading slugs, then bold-label slugs (see Document.find)
+            "sections": list(dict.fromkeys(
+                [section.slug for section in document.walk()]
+                + [label.slug for label in document.labels()]
+            )),
+        }
+
+
+# Parsed document models, keyed by report content hash
+_documents = DocumentCache()
+
+_report_index = ReportIndex(REPORTS_DIR, parse_report, REPORT_INDEX_PATH, PARSER_VERSION)
+
+# Compressed feed bodies, computed once per feed ETag
+_variants = VariantCache()
+
+# Serialized items per format, keyed by report content hash
+_fragments = FragmentCache()
+
+# Memory-mapped search index and the report index generation it matches
+_search_index = None
+_search_generation = None
+
+
+def read_report(entry):
+    """Markdown of an indexed report"""
+    with open(_report_index.path_for(entry), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def update_search_index(persist=True):
+    """Get the search index, brought up to date with the report index
+
+    The file at SEARCH_INDEX_PATH is memory-mapped once per process. When
+    it doesn't cover exactly the current reports it is rebuilt, reading and
+    tokenizing only new or changed reports, and written back if the
+    filesystem allows (otherwise the new index is served from memory).
+    Replaced indexes are closed, so a long-lived process holds one mapping.
+    """
+    global _search_index, _search_generation
+    reports = [entry for _, entry in load_reports()]
+    if _search_index is not None and _search_generation == _report_index.generation:
+        return _search_index
+
+    previous = _search_index
+    current = base = previous or open_index(SEARCH_INDEX_PATH)
+    if current is None or current.signature != search_signature(reports):
+        with span("index"):
+            data, tokenized = build_index(reports, load_document, current)
+        count("search.tokenized", tokenized)
+        fresh = None
+        if persist and write_index(SEARCH_INDEX_PATH, data):
+            fresh = open_index(SEARCH_INDEX_PATH)
+        current = fresh or SearchIndex(data)
+
+    _search_index, _search_generation = current, _report_index.generation
+    for old in (previous, base):
+        if old is not None and old is not current:
+            old.close()
+    return current
+
+
+# Items per feed document; archive page N holds the Nth-oldest full page
+PAGE_SIZE = int(os.environ.get("FEED_PAGE_SIZE", "30"))
+
+FEED_CATEGORIES = ["AI Agents", "Artificial Intelligence", "Technology", "Intelligence", "Agent Economy"]
+ITEM_CATEGORIES = ["Daily Brief", "Agent Economy", "Pattern Analysis"]
+FEED_EMAIL = "ezekiel@eschaton.local"
+GENERATOR = "Eschaton RSS Generator v2.0 (Vercel)"
+
+# Rendered documents keyed by (index generation, format, page)
+_outputs = {}
+
+# Filtered variants keyed by (index generation, format, filters), size-bounded
+_filtered = VariantLRU()
+
+# Per-section feed items keyed by (report content hash, section slug)
+_section_items = FragmentCache()
+
+
+class PageNotFound(LookupError):
+    """Requested archive page doesn't exist (yet)."""
+
+
+def feed_url(fmt="rss", page=None, filters=None):
+    """URL of the subscription feed, or of archive page ``page``, in a format"""
+    params = []
+    if fmt != "rss":
+        params.append(f"format={fmt}")
+    if page is not None:
+        params.append(f"page={page}")
+    if filters is not None:
+        params.append(filters.query())
+    query = "?" + "&".join(params) if params else ""
+    return f"{FEED_BASE_URL}/api/feed{query}"
+
+
+def static_feed_path(fmt="rss", page=None):
+    """Path, relative to the site root, of a pre-rendered feed file
+
+    The subscription feed is /feed.xml, /atom.xml or /feed.json; archive
+    page N lives next to it under /archive/, e.g. /archive/atom-3.xml.
+    """
+    name = STATIC_FEED_FILES[fmt]
+    if page is None:
+        return name
+    stem, ext = name.rsplit(".", 1)
+    return f"archive/{stem}-{page}.{ext}"
+
+
+def static_feed_url(fmt="rss", page=None):
+    """URL of a pre-rendered feed file (see static_feed_path)"""
+    return f"{FEED_BASE_URL}/{static_feed_path(fmt, page)}"
+
+
+def archive_count(total):
+    """Number of complete archive pages"""
+    return total // PAGE_SIZE
+
+
+def archive_slice(total, page):
+    """Slice of the newest-first report list that archive ``page`` covers
+
+    Pages are numbered from the oldest report, so adding new reports never
+    changes what an existing archive page contains (RFC 5005 section 4).
+    """
+    return slice(total - page * PAGE_SIZE, total - (page - 1) * PAGE_SIZE)
+
+
+def generate_feed(fmt="rss", page=None, static=False):
+    """Generate the subscription feed (RSS 2.0 unless another format is named)"""
+    return get_feed(page, fmt, static=static)[0]
+
+
+def get_feed(page=None, fmt="rss", filters=None, static=False):
+    """Generate the subscription feed or one archive page, with its Last-Modified
+
+    Every format renders from the same report index and item model; the
+    result is cached per format and page until the index changes.
+
+    Args:
+        page: Archive page number (1 = oldest), or None for the subscription
+            feed holding the newest PAGE_SIZE reports
+        fmt: Serializer name from ``_formats.FORMATS``
+        filters: ``_filters.FeedFilter`` narrowing the subscription feed
+        static: Render for the pre-rendered files, so self and archive links
+            point at /feed.xml and /archive/ (see static_feed_url) instead
+            of /api/feed
+
+    Returns:
+        Tuple of (feed_body, last_modified) where last_modified is the POSIX
+        time the report index last changed (see ReportIndex.modified), or
+        None for the placeholder feed. Any edit, backfill or removal can
+        change a document (archive pages are numbered from the oldest
+        report), so the newest report's date would miss changes.
+
+    Raises:
+        PageNotFound: ``page`` is not a complete archive page
+        BadFilter: ``filters`` combined with an archive page
+        UnknownFilter: ``filters`` names a section, category or author no
+            report has (a LookupError, so the handler answers 404)
+    """
+    if filters is not None:
+        if page is not None:
+            raise BadFilter("Archive pages can't be filtered")
+        if static:
+            raise BadFilter("Filtered feeds aren't pre-rendered")
+        return get_filtered_feed(fmt, filters)
+
+    reports = load_reports()
+    key = (_report_index.generation, fmt, page, static)
+    cached = _outputs.get(key)
+    if cached is not None:
+        count("output.hit")
+        tag("cache", "hit")
+        return cached
+    count("output.miss")
+    tag("cache", "miss")
+
+    archives = archive_count(len(reports))
+    if page is None:
+        if not reports:
+            # Return empty feed with message
+            now = datetime.now(timezone.utc)
+            return generate_empty_feed(now, fmt, static), None
+        window = reports[:PAGE_SIZE]
+        links = [("prev-archive", archives)] if archives else []
+    else:
+        if not 1 <= page <= archives:
+            raise PageNotFound(f"No archive page {page}")
+        window = reports[archive_slice(len(reports), page)]
+        links = [("current", None)]
+        if page > 1:
+            links.append(("prev-archive", page - 1))
+        if page < archives:
+            links.append(("next-archive", page + 1))
+
+    with span("render"):
+        # Get feed last build date from most recent report
+        last_build_date = window[0][0].replace(hour=23, minute=0, tzinfo=timezone.utc)
+        channel = report_channel(last_build_date, page, links, static=static)
+        items = [report_item(date, report) for date, report in window]
+
+    # Only this page's reports are serialized; unchanged ones reuse fragments
+    with span("serialize"):
+        result = render_feed(fmt, channel, items, _fragments), _report_index.modified
+
+    if any(k[0] != key[0] for k in _outputs):
+        _outputs.clear()
+    _outputs[key] = result
+    return result
+
+
+def get_filtered_feed(fmt, filters):
+    """The newest PAGE_SIZE items that pass ``filters``, with its Last-Modified (see get_feed)
+
+    Built from the report index and the cached document models; a report is
+    only parsed (or read) when its indexed section list says it has the
+    requested section.
+
+    Raises:
+        UnknownFilter: no report has the section, or the category or author
+            isn't one report items carry
+    """
+    reports = load_reports()
+    filters.require_known(ITEM_CATEGORIES, [FEED_AUTHOR])
+    if filters.section is not None and not any(
+            has_section(report, filters.section) for _, report in reports):
+        raise UnknownFilter(f"No report has a section {filters.section}")
+    key = (_report_index.generation, fmt, filters.key)
+
+    def render():
+        count("output.miss")
+        with span("render"):
+            items = []
+            for date, report in reports:
+                if filters.section is None:
+                    item = report_item(date, report)
+                else:
+                    item = section_item(date, report, filters.section)
+                if item is not None and filters.matches(item):
+                    items.append(item)
+                    if len(items) == PAGE_SIZE:
+                        break
+            newest = items[0].published if items else (
+                reports[0][0].replace(hour=23, minute=0, tzinfo=timezone.utc) if reports
+                else datetime.now(timezone.utc)
+            )
+            channel = report_channel(newest, filters=filters)
+        with span("serialize"):
+            body = render_feed(fmt, channel, items, _fragments)
+        return body, _report_index.modified
+
+    hits = _filtered.stats["hits"]
+    result = _filtered.get(key, render)
+    if _filtered.stats["hits"] != hits:
+        count("output.hit")
+    tag("cache", "hit" if _filtered.stats["hits"] != hits else "miss")
+    return result
+
+
+def has_section(report, slug):
+    """Whether an indexed report has a section matching ``slug`` (see Document.find)"""
+    return any(s == slug or s.startswith(slug + "-") for s in report.get("sections", ()))
+
+
+def section_item(date, report, slug):
+    """Feed item holding one section of a report, or None if it has no such section"""
+    if not has_section(report, slug):
+        return None
+    return _section_items.get((report["sha256"], slug), lambda: _section_item(date, report, slug))
+
+
+def _section_item(date, report, slug):
+    found = load_document(report).find(slug)
+    if found is None:
+        return None
+    date_slug = date.strftime("%Y-%m-%d")
+    item_link = f"{FEED_BASE_URL}/report/{date_slug}"
+    summary = " ".join(found.text(heading=False).split())
+
+    return FeedItem(
+        id=f"{item_link}#{found.slug}",
+        title=f"{report['title']} — {found.title}",
+        url=item_link,
+        published=date.replace(hour=23, minute=0, tzinfo=timezone.utc),
+        author_name=FEED_AUTHOR,
+        author_email=FEED_EMAIL,
+        summary=summary[:500] + "..." if len(summary) > 500 else summary,
+        content_html=render_document(found),
+        categories=ITEM_CATEGORIES,
+        key=(report["sha256"], date_slug, found.slug),
+    )
+
+
+def report_channel(last_build_date, page=None, links=(), filters=None, static=False):
+    """Channel metadata for the reports feed"""
+    if static:
+        url = static_feed_url
+    else:
+        url = lambda fmt="rss", page=None: feed_url(fmt, page, filters)  # noqa: E731
+    return Channel(
+        title=FEED_TITLE,
+        home_url=FEED_BASE_URL,
+        description=FEED_DESCRIPTION,
+        feed_url=url,
+        updated=last_build_date,
+        language=FEED_LANGUAGE,
+        generator=GENERATOR,
+        page=page,
+        links=links,
+        archive=page is not None,
+        icon=f"{FEED_BASE_URL}/eschaton-icon.svg",
+        image=f"{FEED_BASE_URL}/eschaton-icon.png",
+        categories=FEED_CATEGORIES,
+        author_name=FEED_AUTHOR,
+        author_email=FEED_EMAIL,
+        docs="https://www.rssboard.org/rss-specification",
+        managing_editor=FEED_EMAIL,
+        web_master=FEED_EMAIL,
+        # Only the pre-rendered subscription feeds are pinged (ingest.py);
+        # /api/feed isn't deployed and archive pages don't change
+        hub=HUB_URL if static and page is None else None,
+    )
+
+
+def report_item(date, report):
+    """Build the feed item for one indexed report"""
+    # Link to report (also its permalink id)
+    date_slug = date.strftime("%Y-%m-%d")
+    item_link = f"{FEED_BASE_URL}/report/{date_slug}"
+
+    return FeedItem(
+        id=item_link,
+        title=report["title"],
+        url=item_link,
+        published=date.replace(hour=23, minute=0, tzinfo=timezone.utc),
+        author_name=FEED_AUTHOR,
+        author_email=FEED_EMAIL,
+        summary=report["summary"],
+        content_html=f"{report['html']}...<p><em>Full report available at {item_link}</em></p>",
+        categories=ITEM_CATEGORIES,
+        key=(report["sha256"], date_slug),
+    )
+
+
+def generate_empty_feed(now, fmt="rss", static=False):
     """Generate empty feed when no reports found"""
-    rss = ET.Element("rss", version="2.0", attrib={
-        "xmlns:atom": "http://www.w3.org/2005/Atom",
-        "xmlns:content": "http://purl.org/rss/1.0/modules/content/"
-    })
-
-    channel = ET.SubElement(rss, "channel")
-    ET.SubElement(channel, "title").text = FEED_TITLE
-    ET.SubElement(channel, "description").text = FEED_DESCRIPTION
-    ET.SubElement(channel, "link").text = FEED_BASE_URL
-    ET.SubElement(channel, "language").text = FEED_LANGUAGE
-    ET.SubElement(channel, "lastBuildDate").text = format_rfc2822_date(now)
-    ET.SubElement(channel, "generator").text = "Eschaton RSS Generator v2.0 (Vercel)"
+    channel = Channel(
+        title=FEED_TITLE,
+        home_url=FEED_BASE_URL,
+        description=FEED_DESCRIPTION,
+        feed_url=static_feed_url if static else feed_url,
+        updated=now,
+        language=FEED_LANGUAGE,
+        generator=GENERATOR,
+        author_name=FEED_AUTHOR,
+    )
 
     # Add note item
-    item = ET.SubElement(channel, "item")
-    ET.SubElement(item, "title").text = "Feed Initializing - Check Back Soon"
-    ET.SubElement(item, "description").text = "Reports are being generated. Please check back in a few hours."
-    ET.SubElement(item, "pubDate").text = format_rfc2822_date(now)
+    item = FeedItem(
+        id=f"{FEED_BASE_URL}/#initializing",
+        title="Feed Initializing - Check Back Soon",
+        published=now,
+        summary="Reports are being generated. Please check back in a few hours.",
+    )
 
-    rough_string = ET.tostring(rss, encoding='unicode')
-    return '<?xml version="1.0" encoding="UTF-8"?>\n' + rough_string
+    return render_feed(fmt, channel, [item])
 
 
 class Response:
@@ -252,6 +537,7 @@ class Response:
         self.headers = headers or {}
 
 
+@instrumented("index")
 def handler(request, response=None):
     """
     Vercel serverless function handler
@@ -259,37 +545,83 @@ def handler(request, response=None):
     Supports both:
     - Vercel's default handler(request) signature
     - WSGI-style for local testing
+
+    Stage timings go out in the Server-Timing header and one JSON log line
+    per request (see _trace.py).
     """
     # Generate the feed
+    validators = {}
+    coding = "identity"
+    page = get_query(request, "page")
+    fmt = format_for(request)
+    tag("format", fmt)
     try:
-        feed_xml = generate_feed()
-        status = 200
+        filters = feed_filter(request)
+        if filters is not None:
+            tag("filter", filters.query())
+        if fmt is None:
+            raise LookupError("Unknown feed format")
+        if page is not None:
+            if not page.isdigit():
+                raise PageNotFound(f"No archive page {page}")
+            page = int(page)
+            # Tagged once validated; raw query text never reaches the trace
+            tag("page", page)
+        feed_xml, last_modified = get_feed(page, fmt, filters)
+        etag = strong_etag(feed_xml)
+        validators = validator_headers(
+            variant_etag(etag, negotiated_coding(request, feed_xml)), last_modified)
+        status = 304 if is_not_modified(request, etag, last_modified) else 200
+        if status == 200:
+            with span("compress"):
+                coding, body = select_variant(request, _variants.get(etag, feed_xml))
+            tag("encoding", coding)
+        else:
+            count("not_modified")
+    except LookupError as e:
+        feed_xml = f"<?xml version='1.0'?><error><message>{escape_text(str(e))}</message></error>"
+        status = 404
+    except BadFilter as e:
+        feed_xml = f"<?xml version='1.0'?><error><message>{escape_text(str(e))}</message></error>"
+        status = 400
     except Exception as e:
-        feed_xml = f"<?xml version='1.0'?><error><message>{escape(str(e))}</message></error>"
+        feed_xml = f"<?xml version='1.0'?><error><message>{escape_text(str(e))}</message></error>"
         status = 500
 
     # Build response headers
     headers = {
-        "Content-Type": "application/rss+xml; charset=utf-8",
+        "Content-Type": FORMATS[fmt].content_type if status == 200 else "application/xml; charset=utf-8",
         "Access-Control-Allow-Origin": "*",
         "Access-Control-Allow-Methods": "GET, HEAD, OPTIONS",
         "Access-Control-Allow-Headers": "Content-Type",
-        "Cache-Control": f"public, max-age={CACHE_MAX_AGE}, s-maxage={CACHE_MAX_AGE}",
+        "Cache-Control": (
+            ARCHIVE_CACHE_CONTROL if page is not None and status in (200, 304)
+            else f"public, max-age={CACHE_MAX_AGE}, s-maxage={CACHE_MAX_AGE}"
+        ),
         "X-Generator": "Eschaton RSS v2.0",
-        "X-Feed-Type": "RSS 2.0"
+        "X-Feed-Type": FORMATS[fmt or "rss"].label,
+        **validators,
     }
+    if status in (200, 304):
+        headers.update(encoding_headers(coding))
+
+    if status == 304:
+        # Conditional hit: validators only, no body
+        feed_xml = ""
+        del headers["Content-Type"]
 
     # Handle different request types
     if isinstance(request, dict):
         # Vercel style
+        payload = response_body(coding, body) if coding != "identity" else {"body": feed_xml}
         return {
             "statusCode": status,
             "headers": headers,
-            "body": feed_xml
+            **payload,
         }
     else:
         # Return response object for testing
-        return Response(feed_xml, status, headers)
+        return Response(body if coding != "identity" else feed_xml, status, headers)
 
 
 # Vercel serverless function entry point
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Vercel Serverless Function: Full-text search over The Agentic Eschaton Report archive
+
+Endpoint: /api/search?q=<query>[&limit=10]
+Returns: JSON with the best-matching report sections, ranked by BM25
+
+Queries are answered from the memory-mapped index written by build.py /
+ingest.py (see _search.py); no markdown is read at request time unless
+reports changed since the index was built.
+"""
+
+import json
+
+import index
+from _conditional import is_not_modified, strong_etag, validator_headers
+from _request import get_query
+from _trace import count, instrumented, span, tag
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+MAX_QUERY_LENGTH = 200
+
+
+class BadRequest(ValueError):
+    """Missing or malformed query parameters."""
+
+
+def parse_limit(value):
+    """Result count from the ``limit`` parameter, clamped to MAX_LIMIT"""
+    if value is None:
+        return DEFAULT_LIMIT
+    if not value.isdigit() or int(value) < 1:
+        raise BadRequest("limit must be a positive integer")
+    return min(int(value), MAX_LIMIT)
+
+
+def search(query, limit=DEFAULT_LIMIT):
+    """Search the report archive
+
+    Returns:
+        Dict with the query, result count and ranked results (one per
+        matching report section).
+    """
+    search_index = index.update_search_index()
+    with span("search"):
+        hits = search_index.search(query, limit)
+    results = [
+        {
+            "date": hit["date"],
+            "title": hit["title"],
+            "section": hit["section"],
+            "url": f"{index.FEED_BASE_URL}/report/{hit['date']}",
+            "score": hit["score"],
+            "snippet": hit["snippet"],
+        }
+        for hit in hits
+    ]
+    return {"query": query, "count": len(results), "results": results}
+
+
+@instrumented("search")
+def handler(request):
+    """
+    Vercel serverless function handler
+
+    Stage timings go out in the Server-Timing header and one JSON log line
+    per request (see _trace.py).
+    """
+    headers = {
+        "Content-Type": "application/json; charset=utf-8",
+        "Access-Control-Allow-Origin": "*",
+        "Access-Control-Allow-Methods": "GET, HEAD, OPTIONS",
+        "Access-Control-Allow-Headers": "Content-Type",
+        "Cache-Control": f"public, max-age={index.CACHE_MAX_AGE}, s-maxage={index.CACHE_MAX_AGE}",
+    }
+    try:
+        query = (get_query(request, "q") or "").strip()
+        if not query:
+            raise BadRequest("missing q parameter")
+        if len(query) > MAX_QUERY_LENGTH:
+            raise BadRequest(f"q is longer than {MAX_QUERY_LENGTH} characters")
+        limit = parse_limit(get_query(request, "limit"))
+        body = json.dumps(search(query, limit), ensure_ascii=False)
+        status = 200
+    except BadRequest as e:
+        body = json.dumps({"error": str(e)})
+        status = 400
+    except Exception as e:
+        body = json.dumps({"error": str(e)})
+        status = 500
+
+    if status == 200:
+        etag = strong_etag(body)
+        headers.update(validator_headers(etag))
+        if is_not_modified(request, etag):
+            count("not_modified")
+            status, body = 304, ""
+            del headers["Content-Type"]
+    else:
+        headers["Cache-Control"] = "no-store"
+    tag("status", status)
+
+    return {
+        "statusCode": status,
+        "headers": headers,
+        "body": body,
+    }
+
+
+# Entry points for the other Vercel handler signatures (see index.py)
+main = handler
+GET = handler
+app = handler
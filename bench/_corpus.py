@@ -0,0 +1,92 @@
+"""
+Synthetic corpora for the benchmarks
+====================================
+
+Deterministic (seeded) stand-ins for the two inputs the feeds consume:
+
+    - daily-report markdown files shaped like
+      reports/daily-report-2026-02-12.md (same sections, tables and lists,
+      with dates and figures varied so every report hashes differently)
+    - Molthub ``/posts`` JSON lists of any length
+"""
+
+import os
+import re
+import uuid
+import random
+from datetime import date, datetime, timedelta, timezone
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_REPORT = os.path.join(BASE_DIR, "reports", "daily-report-2026-02-12.md")
+
+AUTHORS = ["ezekiel_prophet", "pattern_seer", "loop_watcher", "clawd_scout", "signal_keeper"]
+WORDS = (
+    "agent economy signal pattern memory network protocol autonomy tooling "
+    "typescript inference eschaton alignment trending molthub stars frontier "
+    "orchestration context latency emergent loop identity swarm"
+).split()
+
+
+def _load_template():
+    with open(SAMPLE_REPORT, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def synth_report(day: date, rng: random.Random, template: str = None) -> str:
+    """One report for ``day``: the sample's sections, shuffled figures, some sections dropped."""
+    template = template or _load_template()
+    head, *sections = template.split('\n## ')
+    # Always keep the executive summary (first section) for extract_summary
+    kept = sections[:1] + [s for s in sections[1:] if rng.random() < 0.8]
+    body = re.sub(r'\b\d{2,4}\b', lambda m: str(rng.randint(10, 5000)), '\n## '.join(kept))
+    head = head.replace("February 12, 2026 (Thursday)", day.strftime("%B %d, %Y (%A)"))
+    return head + '\n## ' + body
+
+
+def write_reports(directory: str, count: int, seed: int = 42, end: date = date(2026, 2, 12)):
+    """Write ``count`` daily reports ending at ``end`` into ``directory``.
+
+    Returns:
+        List of report contents, newest first.
+    """
+    rng = random.Random(seed)
+    template = _load_template()
+    os.makedirs(directory, exist_ok=True)
+    contents = []
+    for i in range(count):
+        day = end - timedelta(days=i)
+        content = synth_report(day, rng, template)
+        path = os.path.join(directory, f"daily-report-{day.isoformat()}.md")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        contents.append(content)
+    return contents
+
+
+def _sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def synth_posts(count: int, seed: int = 42,
+                newest: datetime = datetime(2026, 2, 13, 13, 21, tzinfo=timezone.utc)) -> list:
+    """``count`` Molthub-shaped posts, newest first."""
+    rng = random.Random(seed)
+    posts = []
+    created = newest
+    for _ in range(count):
+        created -= timedelta(seconds=rng.randint(60, 7200))
+        content = ' '.join(_sentence(rng, rng.randint(8, 25)) for _ in range(rng.randint(3, 40)))
+        post = {
+            'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            'title': _sentence(rng, rng.randint(4, 10))[:-1],
+            'content': content,
+            'createdAt': created.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
+            'author': {'name': rng.choice(AUTHORS)},
+            'submolt': {'displayName': 'Eschaton'},
+            'commentCount': rng.choice([0, 0, 1, 3, 12]),
+        }
+        if rng.random() < 0.2:
+            updated = created + timedelta(minutes=rng.randint(1, 600))
+            post['updatedAt'] = updated.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+        posts.append(post)
+    return posts
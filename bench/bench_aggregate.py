@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Load check: multi-submolt aggregation
+=====================================
+
+Aggregates N simulated sub-molts whose fetches sleep for a random
+latency, and compares the wall time against the slowest single fetch
+(the ideal) and the sum of all fetches (what a sequential loop costs).
+
+Usage:
+    python bench/bench_aggregate.py [--submolts 50] [--concurrency 32] [--rate 50]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "api-disabled"))
+
+from _aggregate import aggregate  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument("--submolts", type=int, default=50, help="simulated sub-molts")
+    parser.add_argument("--concurrency", type=int, default=32, help="fetches in flight")
+    parser.add_argument("--rate", type=float, default=50.0, help="requests per second")
+    parser.add_argument("--min-latency", type=float, default=0.05)
+    parser.add_argument("--max-latency", type=float, default=0.4)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    latencies = {f"submolt-{i}": rng.uniform(args.min_latency, args.max_latency)
+                 for i in range(args.submolts)}
+
+    def fetch(submolt_id):
+        time.sleep(latencies[submolt_id])
+        n = int(submolt_id.rsplit('-', 1)[1])
+        posts = [
+            {'id': f"{submolt_id}/{j}", 'createdAt': f"2026-02-{28 - j:02d}T{n % 24:02d}:00:00Z"}
+            for j in range(30)
+        ]
+        return posts, True
+
+    started = time.perf_counter()
+    posts, changed = aggregate(list(latencies), fetch, 30, concurrency=args.concurrency,
+                               rate=args.rate, burst=int(args.rate))
+    elapsed = time.perf_counter() - started
+
+    print(f"🔀 {args.submolts} sub-molts, concurrency {args.concurrency}, {args.rate:g} req/s")
+    print(f"   merged posts:   {len(posts)} (changed: {changed})")
+    print(f"   wall time:      {elapsed * 1000:.0f} ms")
+    print(f"   slowest fetch:  {max(latencies.values()) * 1000:.0f} ms")
+    print(f"   sequential sum: {sum(latencies.values()) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
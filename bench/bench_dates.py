@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ISO 8601 -> RFC 822 date formatting
+==============================================
+
+Formats N timestamps with the legacy per-post path (``fromisoformat`` +
+``strftime``) and with the memoized _dates module, both over N distinct
+values (cold caches) and over N values drawn from a small pool (the
+re-render case, where the LRU answers almost every call).
+
+Usage:
+    python bench/bench_dates.py [--count 100000] [--pool 500] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "api-disabled"))
+
+import _dates  # noqa: E402
+
+
+def legacy_format(iso_date):
+    """feed.format_rfc822_date before the _dates module."""
+    try:
+        dt = datetime.fromisoformat(iso_date.replace('Z', '+00:00'))
+        return dt.strftime('%a, %d %b %Y %H:%M:%S GMT')
+    except:  # noqa: E722 - reproduces the original behaviour
+        return datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
+
+
+def make_timestamps(count, rng):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        (start + timedelta(seconds=rng.randrange(3 * 365 * 86400))).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+        for _ in range(count)
+    ]
+
+
+def best_of(repeat, fn, values, reset=None):
+    best = float('inf')
+    for _ in range(repeat):
+        if reset:
+            reset()
+        start = time.perf_counter()
+        for value in values:
+            fn(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument("--count", type=int, default=100_000, help="timestamps per run")
+    parser.add_argument("--pool", type=int, default=500, help="distinct values in the repeated run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (best is reported)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    distinct = make_timestamps(args.count, rng)
+    pool = make_timestamps(args.pool, rng)
+    repeated = [rng.choice(pool) for _ in range(args.count)]
+
+    # Same output for every valid input
+    mismatches = sum(legacy_format(v) != _dates.rfc822_from_iso(v) for v in distinct[:1000])
+
+    cases = [
+        ("legacy, distinct", legacy_format, distinct, None),
+        ("_dates, distinct (cold)", _dates.rfc822_from_iso, distinct, _dates.clear_caches),
+        ("legacy, repeated", legacy_format, repeated, None),
+        ("_dates, repeated", _dates.rfc822_from_iso, repeated, _dates.clear_caches),
+    ]
+    print(f"📅 {args.count:,} timestamps (repeated case: {args.pool} distinct values)")
+    for label, fn, values, reset in cases:
+        elapsed = best_of(args.repeat, fn, values, reset)
+        print(f"   {label:<26} {elapsed * 1000:8.1f} ms  {elapsed / len(values) * 1e9:6.0f} ns/date")
+    print(f"   output mismatches vs legacy: {mismatches}")
+    print(f"   cache: {_dates.cache_info()['rfc822_from_iso']}")
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: single-pass Markdown renderer vs the legacy regex chain
+=========================================================================
+
+Renders reports/daily-report-2026-02-12.md repeated 100x with both the
+previous ``markdown_to_html`` implementation (about ten ``re.sub`` passes)
+and the tokenizing renderer in api-disabled/_markdown.py, split into its
+parse (_document.py) and render-from-model halves; the model is what the
+report index caches, so feeds re-render without re-parsing.
+
+The legacy chain is not an equivalent baseline: it escapes nothing and
+has no tables, code blocks or quotes. A cold ``render`` (parse + render)
+lands close to it; the cached path (render from model) is well ahead.
+
+Usage:
+    python bench/bench_markdown.py [--scale 100] [--repeat 5]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "api-disabled"))
+
+from _document import parse  # noqa: E402
+from _markdown import render, render_document  # noqa: E402
+
+SAMPLE_REPORT = os.path.join(BASE_DIR, "reports", "daily-report-2026-02-12.md")
+
+
+def legacy_markdown_to_html(content):
+    """The regex-chain renderer previously used by index.py"""
+    html = content
+    html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
+    html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
+    html = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
+    html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
+    html = re.sub(r'\*(.+?)\*', r'<em>\1</em>', html)
+    html = re.sub(r'\[(.+?)\]\((.+?)\)', r'<a href="\2">\1</a>', html)
+    html = re.sub(r'^- (.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
+    html = re.sub(r'(<li>.+</li>\n)+', r'<ul>\g<0></ul>', html)
+    html = html.replace('\n\n', '</p><p>')
+    html = html.replace('\n', '<br/>')
+    if not html.startswith('<'):
+        html = f'<p>{html}</p>'
+    return html
+
+
+def best_of(fn, content, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(content)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument("--scale", type=int, default=100, help="times to repeat the sample report")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per renderer (best is reported)")
+    args = parser.parse_args()
+
+    with open(SAMPLE_REPORT, 'r', encoding='utf-8') as f:
+        content = "\n\n".join([f.read()] * args.scale)
+
+    print(f"📄 Input: {len(content):,} chars ({args.scale}x {os.path.basename(SAMPLE_REPORT)})")
+    legacy = best_of(legacy_markdown_to_html, content, args.repeat)
+    current = best_of(render, content, args.repeat)
+    parsed = best_of(parse, content, args.repeat)
+    document = parse(content)
+    from_model = best_of(lambda _: render_document(document), content, args.repeat)
+    print(f"   legacy regex chain: {legacy * 1000:8.2f} ms")
+    print(f"   single-pass render: {current * 1000:8.2f} ms")
+    print(f"     parse to model:   {parsed * 1000:8.2f} ms")
+    print(f"     render from model:{from_model * 1000:8.2f} ms")
+    print(f"   ratio:              {legacy / current:8.2f}x")
+    print(f"   ratio from model:   {legacy / from_model:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
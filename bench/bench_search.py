@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: report search index
+==============================
+
+Builds the /api/search index over N synthetic reports, then measures:
+
+    full build      - tokenizing every report from scratch
+    incremental     - one report changed; the rest carried over
+    open            - memory-mapping the index file (a cold instance)
+    query p50/p99   - BM25 queries against the mapped index
+
+Usage:
+    python bench/bench_search.py [--reports 365] [--queries 500]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "api-disabled"))
+sys.path.insert(0, os.path.join(BASE_DIR, "bench"))
+
+import _corpus  # noqa: E402
+from _document import parse  # noqa: E402
+from _search import build_index, open_index, tokenize, write_index  # noqa: E402
+
+QUERIES = ["agent economy", "github trending", "geopolitics", "skills marketplace",
+           "pattern analysis", "firecrawl", "molthub agents", "strategic intelligence"]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument("--reports", type=int, default=365, help="synthetic reports to index")
+    parser.add_argument("--queries", type=int, default=500, help="queries to time")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='eschaton-search-')
+    try:
+        contents = _corpus.write_reports(workdir, args.reports)
+        reports = [
+            {'date': name[len('daily-report-'):-len('.md')], 'sha256': str(hash(content)),
+             'title': name, 'content': content}
+            for name, content in zip(sorted(os.listdir(workdir), reverse=True), contents)
+        ]
+        load = lambda report: parse(report['content'])  # noqa: E731
+        path = os.path.join(workdir, 'search-index.bin')
+
+        (data, _), full_ms = timed(lambda: build_index(reports, load))
+        write_index(path, data)
+        previous = open_index(path)
+        reports[0] = dict(reports[0], sha256='changed', content=reports[0]['content'] + '\nnew text\n')
+        (data, tokenized), incremental_ms = timed(lambda: build_index(reports, load, previous))
+        previous.close()
+        write_index(path, data)
+        search_index, open_ms = timed(lambda: open_index(path))
+
+        rng = random.Random(42)
+        samples = []
+        for _ in range(args.queries):
+            query = rng.choice(QUERIES)
+            samples.append(timed(lambda: search_index.search(query, 10))[1])
+
+        words = sum(len(tokenize(report['content'])) for report in reports)
+        print(f"🔎 {args.reports} reports, {search_index.doc_count} sections, "
+              f"{search_index.term_count} terms, {words} tokens")
+        print(f"   index size:     {os.path.getsize(path) / 1024:.0f} KiB")
+        print(f"   full build:     {full_ms:.0f} ms")
+        print(f"   incremental:    {incremental_ms:.0f} ms ({tokenized} report re-tokenized)")
+        print(f"   open (mmap):    {open_ms:.2f} ms")
+        print(f"   query p50:      {percentile(samples, 0.5):.2f} ms")
+        print(f"   query p99:      {percentile(samples, 0.99):.2f} ms")
+        search_index.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Load check: concurrent cache misses in feed.get_cached_entry
+============================================================
+
+Fires N concurrent requests at an empty cache with
+``fetch_posts_conditional`` replaced by a slow stand-in that counts calls,
+and reports how many upstream fetches happened. With single-flight coalescing the expected count is 1.
+
+With ``--processes`` > 1 the workers run in separate processes sharing a
+file cache, exercising the cross-process refresh lock as well.
+
+Usage:
+    python bench/bench_singleflight.py [--requests 200] [--processes 1]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import multiprocessing
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "api-disabled"))
+
+UPSTREAM_LATENCY = 0.2
+
+
+def run_worker(n_requests, counter_path, barrier=None):
+    import feed
+
+    def slow_fetch(submolt_id, api_key, limit=30, **validators):
+        # O_APPEND writes are atomic, so the line count is the call count
+        with open(counter_path, 'a') as f:
+            f.write('x\n')
+        time.sleep(UPSTREAM_LATENCY)
+        posts = [{'id': '1', 'title': 'Post', 'createdAt': '2026-02-13T13:21:17Z'}]
+        return {'status': 200, 'posts': posts, 'etag': None, 'last_modified': None}
+
+    feed.fetch_posts_conditional = slow_fetch
+    start = threading.Barrier(n_requests)
+    errors = []
+
+    def request():
+        start.wait()
+        try:
+            feed.get_cached_entry(feed.DEFAULT_SUBMOLT_ID, 'bench-key')
+        except Exception as e:
+            errors.append(e)
+
+    if barrier is not None:
+        barrier.wait()
+    threads = [threading.Thread(target=request) for _ in range(n_requests)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument("--requests", type=int, default=200, help="concurrent requests in total")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes sharing a file cache")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='eschaton-bench-')
+    counter_path = os.path.join(workdir, 'upstream-calls')
+    open(counter_path, 'w').close()
+    os.environ['RSS_CACHE_BACKEND'] = 'file' if args.processes > 1 else 'memory'
+    os.environ['RSS_CACHE_PATH'] = os.path.join(workdir, 'cache')
+
+    per_process = args.requests // args.processes
+    started = time.perf_counter()
+    if args.processes == 1:
+        run_worker(per_process, counter_path)
+    else:
+        ctx = multiprocessing.get_context('fork')
+        barrier = ctx.Barrier(args.processes)
+        workers = [
+            ctx.Process(target=run_worker, args=(per_process, counter_path, barrier))
+            for _ in range(args.processes)
+        ]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+    elapsed = time.perf_counter() - started
+
+    with open(counter_path) as f:
+        calls = sum(1 for _ in f)
+    total = per_process * args.processes
+    print(f"🔥 {total} concurrent misses across {args.processes} process(es)")
+    print(f"   upstream calls: {calls}")
+    print(f"   wall time:      {elapsed * 1000:.0f} ms (upstream latency {UPSTREAM_LATENCY * 1000:.0f} ms)")
+    return 0 if calls == 1 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold start to first response
+=======================================
+
+Starts a fresh interpreter per run (``python -X importtime``), imports a
+handler module and serves one request, measuring:
+
+    import_ms        - importing the handler module (in-process clock)
+    first_request_ms - the first handler call after import
+    process_ms       - whole child process, interpreter start to exit
+
+Scenarios:
+    index (cold index)  - reports parsed from scratch (no sidecar yet)
+    index (sidecar)     - parsed-report sidecar already on disk
+    feed (shared hit)   - file cache pre-filled, as another instance would
+                          leave a shared backend; no upstream request
+
+Each scenario also lists the handler's heaviest direct imports (from the
+``-X importtime`` report) and which known-heavy modules ended up loaded.
+
+Usage:
+    python bench/bench_startup.py [--runs 10] [--output startup.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import statistics
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(BASE_DIR, "api-disabled")
+sys.path.insert(0, os.path.join(BASE_DIR, "bench"))
+
+HEAVY = ('requests', 'urllib3', 'asyncio', 'logging', 'email.utils', 'xml.dom.minidom')
+MARKER = 'STARTUP '
+
+CHILD = r'''
+import sys, time, json
+start = time.perf_counter()
+sys.path.insert(0, {api!r})
+import {module} as handler_module
+imported = time.perf_counter()
+response = handler_module.handler({{'headers': {{'Accept-Encoding': 'gzip'}}}})
+done = time.perf_counter()
+print({marker!r} + json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'first_request_ms': (done - imported) * 1000,
+    'status': response['statusCode'],
+    'loaded': [name for name in {heavy!r} if name in sys.modules],
+}}))
+'''
+
+
+def parse_importtime(stderr, module):
+    """(cumulative ms of ``module``, its direct imports by cumulative ms)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line.split(':', 1)[1].split('|')
+        rows.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative)))
+    # importtime prints children before their parent
+    total, children = 0, []
+    for i, (depth, name, cumulative) in enumerate(rows):
+        if name == module and depth == 1:
+            total = cumulative
+            j = i - 1
+            while j >= 0 and rows[j][0] > depth:
+                if rows[j][0] == depth + 2:
+                    children.append((rows[j][1], rows[j][2]))
+                j -= 1
+            break
+    children.sort(key=lambda child: child[1], reverse=True)
+    return total / 1000, [(name, round(us / 1000, 2)) for name, us in children[:8]]
+
+
+def run_child(module, env):
+    code = CHILD.format(api=API_DIR, module=module, marker=MARKER, heavy=HEAVY)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          env=env, capture_output=True, text=True, cwd=BASE_DIR)
+    process_ms = (time.perf_counter() - start) * 1000
+    lines = [line for line in proc.stdout.splitlines() if line.startswith(MARKER)]
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"{module} child failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(lines[-1][len(MARKER):])
+    result['process_ms'] = process_ms
+    result['importtime_ms'], result['top_imports'] = parse_importtime(proc.stderr, module)
+    return result
+
+
+def prime_feed_cache(env):
+    """Fill a file cache with a rendered feed, as a warm instance would."""
+    saved = dict(os.environ)
+    os.environ.update(env)
+    try:
+        sys.path.insert(0, API_DIR)
+        import _corpus
+        import feed
+        posts = _corpus.synth_posts(30)
+        feed.fetch_posts_conditional = lambda *args, **kwargs: {
+            'status': 200, 'posts': posts, 'etag': None, 'last_modified': None,
+        }
+        with contextlib.redirect_stdout(sys.stderr):
+            feed.refresh_feed(feed.resolve_submolt(None), env['MOLTHUB_API_KEY'])
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+def summarize(name, runs):
+    def median(key):
+        return round(statistics.median(run[key] for run in runs), 2)
+
+    return {
+        'scenario': name,
+        'runs': len(runs),
+        'status': runs[-1]['status'],
+        'import_ms': median('import_ms'),
+        'importtime_ms': median('importtime_ms'),
+        'first_request_ms': median('first_request_ms'),
+        'process_ms': median('process_ms'),
+        'loaded': runs[-1]['loaded'],
+        'top_imports': runs[-1]['top_imports'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for both handlers")
+    parser.add_argument("--runs", type=int, default=10, help="fresh processes per scenario")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='eschaton-startup-')
+    base_env = dict(os.environ, TRACE_LOG='0', PYTHONDONTWRITEBYTECODE='1')
+    try:
+        sidecar = os.path.join(workdir, 'report-index.json')
+        index_env = dict(base_env, REPORT_INDEX_PATH=sidecar)
+        feed_env = dict(base_env, MOLTHUB_API_KEY='bench-key', RSS_CACHE_BACKEND='file',
+                        RSS_CACHE_PATH=os.path.join(workdir, 'cache'))
+        prime_feed_cache(feed_env)
+
+        scenarios = []
+
+        def cold_index():
+            if os.path.exists(sidecar):
+                os.remove(sidecar)
+            return run_child('index', index_env)
+
+        scenarios.append(('index (cold index)', cold_index))
+        scenarios.append(('index (sidecar)', lambda: run_child('index', index_env)))
+        scenarios.append(('feed (shared hit)', lambda: run_child('feed', feed_env)))
+
+        results = []
+        for name, run in scenarios:
+            summary = summarize(name, [run() for _ in range(args.runs)])
+            results.append(summary)
+            print(f"🚀 {name:<20} import {summary['import_ms']:7.1f} ms  "
+                  f"first request {summary['first_request_ms']:7.1f} ms  "
+                  f"process {summary['process_ms']:7.1f} ms  loaded {','.join(summary['loaded']) or '-'}",
+                  file=sys.stderr)
+            for module, ms in summary['top_imports'][:5]:
+                print(f"      {module:<24} {ms:7.2f} ms", file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    text = json.dumps({'python': sys.version.split()[0], 'runs': args.runs, 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: fetch-parse-render-serve for both feed generators
+==================================================================
+
+Builds synthetic corpora (see _corpus.py) and times the pipeline stages of
+index.py (reports -> RSS) and feed.py (Molthub posts -> RSS):
+
+    index: get_reports, extract_summary, markdown_to_html, generate_feed, handler
+    feed:  generate_rss, handler (upstream replaced by the synthetic post list)
+
+Stages with caches run in two modes: ``cold`` resets every cache before
+each call, ``warm`` calls repeatedly against primed caches. Each result
+reports p50/p99/mean latency, tracemalloc peak and retained allocation
+for one call, and output size.
+
+Results are JSON (stdout or --output) so runs can be diffed between
+commits; --compare prints the p50 ratio of every case against an earlier
+results file.
+
+Usage:
+    python bench/bench_suite.py [--reports 60] [--posts 30,1000,10000]
+                                [--iterations 20] [--only NAME]
+                                [--output results.json] [--compare baseline.json]
+"""
+
+import os
+import io
+import sys
+import json
+import math
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+import contextlib
+from datetime import datetime, timezone
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "api-disabled"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('MOLTHUB_API_KEY', 'bench-key')
+os.environ['RSS_CACHE_BACKEND'] = 'memory'
+
+import _corpus  # noqa: E402
+import _dates  # noqa: E402
+import feed  # noqa: E402
+import index  # noqa: E402
+from _document import DocumentCache  # noqa: E402
+from _encoding import VariantCache  # noqa: E402
+from _feedcache import MemoryCache  # noqa: E402
+from _filters import VariantLRU  # noqa: E402
+from _report_index import ReportIndex  # noqa: E402
+
+GZIP_REQUEST = {'headers': {'Accept-Encoding': 'gzip'}}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def output_size(result):
+    if isinstance(result, tuple) and result and isinstance(result[0], str):
+        result = result[0]
+    if isinstance(result, dict) and 'body' in result:
+        result = result['body']
+    if isinstance(result, str):
+        return {'output_bytes': len(result.encode('utf-8'))}
+    if isinstance(result, bytes):
+        return {'output_bytes': len(result)}
+    if isinstance(result, (list, tuple)):
+        return {'output_items': len(result)}
+    return {}
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the handlers' progress prints and logging while timing."""
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def measure(fn, iterations, reset=None):
+    """Time ``fn`` ``iterations`` times, then once more under tracemalloc."""
+    samples = []
+    result = None
+    with quiet():
+        for _ in range(iterations):
+            if reset:
+                reset()
+            start = time.perf_counter()
+            result = fn()
+            samples.append(time.perf_counter() - start)
+
+        if reset:
+            reset()
+        tracemalloc.start()
+        try:
+            fn()
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(samples, 50) * 1000, 4),
+        'p99_ms': round(percentile(samples, 99) * 1000, 4),
+        'mean_ms': round(sum(samples) / len(samples) * 1000, 4),
+        'min_ms': round(samples[0] * 1000, 4),
+        'alloc_peak_bytes': peak,
+        'alloc_retained_bytes': retained,
+        **output_size(result),
+    }
+
+
+# --- index.py ----------------------------------------------------------
+
+def reset_index(reports_dir):
+    """Point index.py at ``reports_dir`` with every cache empty."""
+    index._report_index = ReportIndex(reports_dir, index.parse_report, None, index.PARSER_VERSION)
+    index._fragments.clear()
+    index._section_items.clear()
+    index._outputs.clear()
+    index._filtered = VariantLRU(index._filtered.max_bytes)
+    index._variants = VariantCache()
+    reset_documents()
+    _dates.clear_caches()
+
+
+def reset_documents():
+    """Drop index.py's parsed documents, so the next call parses again."""
+    index._documents = DocumentCache(index._documents.max_entries)
+
+
+def index_cases(reports_dir, contents):
+    reset = lambda: reset_index(reports_dir)  # noqa: E731
+    cursor = {'i': 0}
+
+    def each_report(fn):
+        def run():
+            content = contents[cursor['i'] % len(contents)]
+            cursor['i'] += 1
+            return fn(content)
+        return run
+
+    sample_date = datetime(2026, 2, 12)
+    return [
+        ('index.get_reports', 'cold', index.get_reports, reset),
+        ('index.get_reports', 'warm', index.get_reports, None),
+        ('index.extract_summary', 'uncached', each_report(index.extract_summary), reset_documents),
+        ('index.markdown_to_html', 'uncached', each_report(index.markdown_to_html), reset_documents),
+        ('index.parse_report', 'uncached', each_report(lambda c: index.parse_report(c, sample_date)),
+         reset_documents),
+        ('index.generate_feed', 'cold', index.generate_feed, reset),
+        ('index.generate_feed', 'warm', index.generate_feed, None),
+        ('index.handler', 'cold', lambda: index.handler(GZIP_REQUEST), reset),
+        ('index.handler', 'warm', lambda: index.handler(GZIP_REQUEST), None),
+    ]
+
+
+# --- feed.py -----------------------------------------------------------
+
+def reset_feed():
+    feed._cache = MemoryCache()
+    feed._fragments.clear()
+    feed._filtered = VariantLRU(feed._filtered.max_bytes)
+    feed._variants = VariantCache()
+    _dates.clear_caches()
+
+
+def feed_cases(posts):
+    def upstream(submolt_id, api_key, limit=30, **validators):
+        return {'status': 200, 'posts': posts, 'etag': None, 'last_modified': None}
+
+    def prime():
+        # The handler path keeps FEED_LIMIT posts; let it keep the whole corpus
+        feed.fetch_posts_conditional = upstream
+        feed.FEED_LIMIT = len(posts)
+        feed.STALE_WHILE_REVALIDATE = 0
+
+    def cold_reset():
+        prime()
+        reset_feed()
+
+    prime()
+    reset_feed()
+    n = len(posts)
+    return [
+        (f'feed.generate_rss[{n}]', 'cold', lambda: feed.generate_rss(posts), reset_feed),
+        (f'feed.generate_rss[{n}]', 'warm', lambda: feed.generate_rss(posts), None),
+        (f'feed.handler[{n}]', 'cold', lambda: feed.handler(GZIP_REQUEST), cold_reset),
+        (f'feed.handler[{n}]', 'warm', lambda: feed.handler(GZIP_REQUEST), None),
+    ]
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                             capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['name'], r['mode']): r for r in json.load(f)['results']}
+    print(f"\n📊 p50 vs {baseline_path}", file=sys.stderr)
+    for r in results:
+        old = baseline.get((r['name'], r['mode']))
+        if not old or not old['p50_ms']:
+            continue
+        ratio = r['p50_ms'] / old['p50_ms']
+        flag = '🔺' if ratio > 1.1 else '🔻' if ratio < 0.9 else '  '
+        print(f"   {flag} {r['name']:<28} {r['mode']:<9} {old['p50_ms']:9.3f} -> {r['p50_ms']:9.3f} ms  x{ratio:.2f}",
+              file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument("--reports", type=int, default=60, help="synthetic daily reports")
+    parser.add_argument("--posts", default="30,1000,10000", help="comma-separated post list sizes")
+    parser.add_argument("--iterations", type=int, default=20, help="timed calls per case")
+    parser.add_argument("--only", help="run cases whose name contains this")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--compare", help="earlier results JSON to compare p50s against")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='eschaton-bench-')
+    try:
+        reports_dir = os.path.join(workdir, 'reports')
+        contents = _corpus.write_reports(reports_dir, args.reports)
+        reset_index(reports_dir)
+
+        groups = [lambda: index_cases(reports_dir, contents)]
+        for size in [int(s) for s in args.posts.split(',') if s.strip()]:
+            groups.append(lambda size=size: feed_cases(_corpus.synth_posts(size)))
+
+        results = []
+        for build_cases in groups:
+            for name, mode, fn, reset in build_cases():
+                if args.only and args.only not in name:
+                    continue
+                metrics = measure(fn, args.iterations, reset)
+                results.append({'name': name, 'mode': mode, **metrics})
+                print(f"⏱️  {name:<28} {mode:<9} p50 {metrics['p50_ms']:9.3f} ms  "
+                      f"p99 {metrics['p99_ms']:9.3f} ms  peak {metrics['alloc_peak_bytes'] / 1024:9.1f} KiB",
+                      file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    document = {
+        'meta': {
+            'commit': git_commit(),
+            'created': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'reports': args.reports,
+            'posts': args.posts,
+            'iterations': args.iterations,
+        },
+        'results': results,
+    }
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
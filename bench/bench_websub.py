@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Benchmark: WebSub fan-out
+=========================
+
+Runs the hub of _websub.py end to end against local HTTP stand-ins: a
+topic server serving a feed rendered by _formats.py, a subscriber server
+with one callback per subscriber (optionally slow), and the hub itself
+served by hub.py's request handler. Measures:
+
+    subscribe       - N subscribe requests until every one is verified
+    publish         - from the publish ping until every subscriber has the
+                      new items (p50 / max per subscriber)
+
+and checks that each delivery holds exactly the new items, keeps the feed
+header and carries a valid X-Hub-Signature.
+
+Usage:
+    python bench/bench_websub.py [--subscribers 200] [--new 3]
+                                 [--concurrency 16] [--delay-ms 20]
+                                 [--format rss]
+"""
+
+import os
+import sys
+import hmac
+import time
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+from http.server import BaseHTTPRequestHandler
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "api-disabled"))
+sys.path.insert(0, BASE_DIR)
+
+import requests  # noqa: E402
+
+import hub as hub_server  # noqa: E402
+from _formats import FORMATS, render_feed  # noqa: E402
+from _model import Channel, FeedItem  # noqa: E402
+from _websub import Hub, feed_items, ping  # noqa: E402
+
+SECRET = "bench-secret"
+
+
+def serve(handler):
+    server = hub_server.HubServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class Topic:
+    """A feed whose items can be appended to, served over HTTP."""
+
+    def __init__(self, fmt, hub_url):
+        self.fmt = fmt
+        self.hub_url = hub_url
+        self.count = 0
+        self.body = ""
+        self.url = None
+
+    def publish(self, n):
+        self.count += n
+        start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        items = [
+            FeedItem(id=f"https://example.test/report/{i}", title=f"Report {i}",
+                     url=f"https://example.test/report/{i}",
+                     published=start + timedelta(days=i), summary=f"Summary {i}",
+                     content_html=f"<p>Report {i}</p>")
+            for i in reversed(range(self.count))
+        ][:30]
+        channel = Channel(title="Bench", home_url="https://example.test/",
+                          description="WebSub bench feed",
+                          feed_url=lambda fmt, page=None: self.url,
+                          updated=start + timedelta(days=self.count), hub=self.hub_url)
+        self.body = render_feed(self.fmt, channel, items)
+
+    def handler(topic):
+        class TopicHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                data = topic.body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", FORMATS[topic.fmt].content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return TopicHandler
+
+
+class Subscribers:
+    """Callbacks ``/<n>`` that confirm intents and record deliveries."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.deliveries = {}
+        self.errors = []
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.expected = 0
+        self.started = None
+
+    def handler(subs):
+        class SubscriberHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlsplit(self.path).query)
+                data = query["hub.challenge"][0].encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                time.sleep(subs.delay)
+                expected = "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+                if not hmac.compare_digest(expected, self.headers.get("X-Hub-Signature", "")):
+                    subs.errors.append(f"{self.path}: bad signature")
+                if 'rel="hub"' not in self.headers.get("Link", ""):
+                    subs.errors.append(f"{self.path}: no hub Link header")
+                self.send_response(204)
+                self.end_headers()
+                with subs.lock:
+                    subs.deliveries[self.path] = (time.perf_counter() - subs.started,
+                                                  body.decode("utf-8"))
+                    if len(subs.deliveries) >= subs.expected:
+                        subs.done.set()
+
+            def log_message(self, *args):
+                pass
+
+        return SubscriberHandler
+
+
+def wait_for(condition, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("timed out")
+        time.sleep(0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument("--subscribers", type=int, default=200, help="subscriber callbacks")
+    parser.add_argument("--new", type=int, default=3, help="items added before the publish")
+    parser.add_argument("--concurrency", type=int, default=16, help="hub deliveries in flight")
+    parser.add_argument("--delay-ms", type=float, default=20.0, help="subscriber response time")
+    parser.add_argument("--format", default="rss", choices=sorted(FORMATS), help="topic feed format")
+    args = parser.parse_args()
+
+    subs = Subscribers(args.delay_ms / 1000)
+    sub_server, sub_url = serve(Subscribers.handler(subs))
+
+    hub = Hub(None, store_path=None, concurrency=args.concurrency)
+    hub_http, hub_url = serve(hub_server.make_handler(hub, quiet=True))
+    hub.url = hub_url + "/"
+
+    topic = Topic(args.format, hub.url)
+    topic_server, topic.url = serve(Topic.handler(topic))
+    topic.url += "/feed"
+    topic.publish(30)
+
+    start = time.perf_counter()
+    session = requests.Session()
+    for n in range(args.subscribers):
+        session.post(hub.url, data={"hub.mode": "subscribe", "hub.topic": topic.url,
+                                    "hub.callback": f"{sub_url}/{n}", "hub.secret": SECRET})
+    wait_for(lambda: len(hub.subscribers(topic.url)) == args.subscribers)
+    wait_for(lambda: hub.stats["published"] >= 1)  # baseline recorded
+    subscribe_ms = (time.perf_counter() - start) * 1000
+
+    topic.publish(args.new)
+    subs.expected = args.subscribers
+    subs.started = time.perf_counter()
+    ping([topic.url], hub=hub.url)
+    if not subs.done.wait(120):
+        print(f"❌ Only {len(subs.deliveries)}/{args.subscribers} deliveries arrived")
+        return 1
+    latencies = sorted(elapsed * 1000 for elapsed, _ in subs.deliveries.values())
+
+    # Every delivery holds exactly the new items, under the feed's header
+    new_ids = {f"https://example.test/report/{i}" for i in range(30, 30 + args.new)}
+    for path, (_, body) in subs.deliveries.items():
+        _, items = feed_items(body)
+        if {item_id for item_id, _ in items} != new_ids:
+            subs.errors.append(f"{path}: delivered {len(items)} items, expected {args.new}")
+        if hub.url not in body:
+            subs.errors.append(f"{path}: hub link missing from the delivered feed")
+
+    print(f"📡 {args.subscribers} subscribers, {args.new} new {args.format} items, "
+          f"concurrency {args.concurrency}, subscriber latency {args.delay_ms:g} ms")
+    print(f"   subscribe+verify: {subscribe_ms:.0f} ms")
+    print(f"   publish p50:      {latencies[len(latencies) // 2]:.0f} ms")
+    print(f"   publish max:      {latencies[-1]:.0f} ms")
+    print(f"   body size:        {len(topic.body)} -> {len(next(iter(subs.deliveries.values()))[1])} bytes")
+    print(f"   hub stats:        {hub.stats}")
+
+    for server in (sub_server, hub_http, topic_server):
+        server.shutdown()
+    hub.close()
+    if subs.errors:
+        for error in subs.errors[:10]:
+            print(f"❌ {error}")
+        return 1
+    print("✅ Only new items delivered, all signatures valid")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Static pre-render build for Eschaton RSS
+========================================
+
+Renders everything the CDN can serve without a function invocation:
+
+    public/feed.xml                 RSS feed built from reports/
+    public/atom.xml, feed.json      the same feed as Atom 1.0 and JSON Feed 1.1
+    public/archive/<feed>-<n>.*     RFC 5005 archive pages of each format,
+                                    linked from the feeds as prev-archive
+    public/<feed>.gz, .br           precompressed siblings (.br needs brotli)
+    public/report/<date>.html       one HTML page per report (/report/<date>)
+    public/molthub.xml              Molthub feed (only with --molthub)
+    reports/.search-index.bin       full-text index for /api/search
+
+The build is incremental. A manifest next to the outputs records the
+source hash behind every page; reports whose mtime and size are unchanged
+are not even read. The feed and its compressed siblings are only rewritten
+when the rendered bytes differ, and the search index only re-tokenizes
+new or changed reports.
+
+Usage:
+    python build.py [--out public] [--force] [--molthub]
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "api-disabled"))
+
+import index  # noqa: E402
+from _encoding import available_codings, compress  # noqa: E402
+from _xmlescape import escape_attr, escape_text  # noqa: E402
+
+SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+# Static file name for each feed format
+FEED_FILES = index.STATIC_FEED_FILES
+
+ARCHIVE_DIR = "archive"
+
+MANIFEST_NAME = ".build-manifest.json"
+
+# Bump when the page template changes so every page is re-rendered
+TEMPLATE_VERSION = 1
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <meta name="description" content="{summary}">
+    <link rel="icon" type="image/svg+xml" href="/eschaton-icon.svg">
+    <link rel="alternate" type="application/rss+xml" title="{feed_title}" href="/feed.xml">
+    <link rel="canonical" href="{link}">
+    <style>
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            background: #1a1a2e;
+            color: #e0e0e0;
+            line-height: 1.6;
+            padding: 40px 20px;
+        }}
+        article {{ max-width: 800px; margin: 0 auto; }}
+        a {{ color: #667eea; }}
+        h1, h2, h3 {{ color: #667eea; }}
+        pre, code {{ background: rgba(0, 0, 0, 0.3); border-radius: 4px; }}
+        pre {{ padding: 15px; overflow-x: auto; }}
+        table {{ border-collapse: collapse; }}
+        th, td {{ border: 1px solid rgba(255, 255, 255, 0.1); padding: 6px 10px; }}
+        blockquote {{ border-left: 3px solid #764ba2; margin-left: 0; padding-left: 15px; color: #aaa; }}
+    </style>
+</head>
+<body>
+    <article>
+        <p><a href="/">&larr; {feed_title}</a> &middot; <time datetime="{date}">{date}</time></p>
+{html}
+    </article>
+</body>
+</html>
+"""
+
+
+def write_if_changed(path, data):
+    """Atomically write ``data`` (bytes) unless the file already holds it.
+
+    Returns:
+        True if the file was written.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.build-')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+    return True
+
+
+def write_compressed(path, data, force=False):
+    """Write ``path.gz`` (and ``path.br`` when brotli is installed)."""
+    for coding in available_codings():
+        if coding == 'identity':
+            continue
+        variant_path = path + SUFFIXES[coding]
+        if force or not os.path.exists(variant_path):
+            write_if_changed(variant_path, compress(data, coding))
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('template') != TEMPLATE_VERSION:
+        return {}
+    return manifest.get('pages', {})
+
+
+def save_manifest(out_dir, pages):
+    data = {'template': TEMPLATE_VERSION, 'pages': pages}
+    write_if_changed(
+        os.path.join(out_dir, MANIFEST_NAME),
+        json.dumps(data, indent=1, sort_keys=True).encode('utf-8'),
+    )
+
+
+def build_feed(out_dir, name, xml, force=False):
+    """Write one feed file plus its compressed siblings if its bytes changed."""
+    path = os.path.join(out_dir, name)
+    data = xml.encode('utf-8')
+    changed = write_if_changed(path, data)
+    write_compressed(path, data, force=force or changed)
+    print(f"{'✅' if changed else '⏭️ '} {name} ({len(data)} bytes)")
+    return changed
+
+
+def build_feeds(out_dir, force=False):
+    """Write every format of the feed and of its archive pages.
+
+    Rendered with static self/archive URLs (index.static_feed_url), so a
+    subscriber of /feed.xml follows prev-archive links to the files under
+    /archive/. Pages beyond the current archive count (reports removed)
+    are deleted.
+
+    Returns:
+        True if any feed file changed.
+    """
+    changed = False
+    archives = index.archive_count(len(index.load_reports()))
+    for fmt in FEED_FILES:
+        changed |= build_feed(out_dir, index.static_feed_path(fmt),
+                              index.generate_feed(fmt, static=True), force)
+        for page in range(1, archives + 1):
+            changed |= build_feed(out_dir, index.static_feed_path(fmt, page),
+                                  index.generate_feed(fmt, page, static=True), force)
+
+    expected = {index.static_feed_path(fmt, page)
+                for fmt in FEED_FILES for page in range(1, archives + 1)}
+    archive_dir = os.path.join(out_dir, ARCHIVE_DIR)
+    for name in sorted(os.listdir(archive_dir)) if os.path.isdir(archive_dir) else ():
+        base = name
+        for suffix in SUFFIXES.values():
+            base = base[:-len(suffix)] if base.endswith(suffix) else base
+        if f"{ARCHIVE_DIR}/{base}" not in expected:
+            os.remove(os.path.join(archive_dir, name))
+            print(f"🗑️  {ARCHIVE_DIR}/{name}")
+            changed = True
+    return changed
+
+
+def render_report_page(date_slug, entry, content):
+    """Full HTML page for one report."""
+    link = f"{index.FEED_BASE_URL}/report/{date_slug}"
+    return PAGE_TEMPLATE.format(
+        title=escape_text(entry["title"]),
+        summary=escape_attr(entry["summary"]),
+        feed_title=escape_text(index.FEED_TITLE),
+        link=escape_attr(link),
+        date=date_slug,
+        html=index.markdown_to_html(content),
+    )
+
+
+def build_report_pages(out_dir, force=False):
+    """Render /report/<date> pages for new or changed reports.
+
+    Returns:
+        Tuple of (rendered, skipped, removed) counts.
+    """
+    report_dir = os.path.join(out_dir, "report")
+    previous = {} if force else load_manifest(out_dir)
+    pages = {}
+    rendered = skipped = 0
+
+    for _, entry in index.load_reports():
+        date_slug = entry["date"]
+        page_path = os.path.join(report_dir, f"{date_slug}.html")
+        source = index._report_index.path_for(entry)
+        known = previous.get(date_slug)
+
+        if (known and known['mtime_ns'] == entry['mtime_ns']
+                and known['size'] == entry['size'] and os.path.exists(page_path)):
+            pages[date_slug] = known
+            skipped += 1
+            continue
+
+        with open(source, 'r', encoding='utf-8') as f:
+            content = f.read()
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        pages[date_slug] = {'mtime_ns': entry['mtime_ns'], 'size': entry['size'], 'sha256': digest}
+
+        # Touched but identical (e.g. a fresh checkout): keep the page
+        if known and known.get('sha256') == digest and os.path.exists(page_path):
+            skipped += 1
+            continue
+
+        html = render_report_page(date_slug, entry, content)
+        data = html.encode('utf-8')
+        write_if_changed(page_path, data)
+        write_compressed(page_path, data, force=True)
+        rendered += 1
+
+    removed = 0
+    for date_slug in set(previous) - set(pages):
+        for suffix in ('.html', '.html.gz', '.html.br'):
+            try:
+                os.remove(os.path.join(report_dir, date_slug + suffix))
+            except FileNotFoundError:
+                pass
+        removed += 1
+
+    save_manifest(out_dir, pages)
+    return rendered, skipped, removed
+
+
+def build_search_index(force=False):
+    """Bring the /api/search index up to date with reports/."""
+    if force:
+        try:
+            os.remove(index.SEARCH_INDEX_PATH)
+        except FileNotFoundError:
+            pass
+    search_index = index.update_search_index()
+    print(f"🔎 Search index: {search_index.doc_count} sections, {search_index.term_count} terms")
+    return search_index
+
+
+def build_molthub_feed(out_dir, force=False):
+    """Render public/molthub.xml from the live Molthub API."""
+    import feed
+
+    api_key = os.getenv('MOLTHUB_API_KEY')
+    if not api_key:
+        print("⚠️  MOLTHUB_API_KEY not set, skipping molthub.xml")
+        return False
+    submolt_id = os.getenv('MOLTHUB_SUBMOLT_ID', feed.DEFAULT_SUBMOLT_ID)
+    posts = feed.fetch_posts(submolt_id, api_key)
+    return build_feed(out_dir, "molthub.xml", feed.generate_rss(posts, submolt_id), force=force)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument("--out", default=os.path.join(BASE_DIR, "public"), help="output directory")
+    parser.add_argument("--force", action="store_true", help="re-render everything")
+    parser.add_argument("--molthub", action="store_true", help="also render molthub.xml")
+    args = parser.parse_args()
+
+    print("🏗️  Pre-rendering static feed...")
+    build_feeds(args.out, force=args.force)
+    rendered, skipped, removed = build_report_pages(args.out, force=args.force)
+    print(f"📄 Report pages: {rendered} rendered, {skipped} unchanged, {removed} removed")
+    build_search_index(force=args.force)
+    if args.molthub:
+        build_molthub_feed(args.out, force=args.force)
+    if 'br' not in available_codings():
+        print("ℹ️  brotli not installed, .br variants skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
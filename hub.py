@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Self-hosted WebSub hub for Eschaton RSS
+=======================================
+
+Serves the hub of _websub.py over HTTP. Subscribers POST
+``hub.mode=subscribe`` requests here; ingest.py and the Molthub feed
+function POST ``hub.mode=publish`` pings when their feeds change, and new
+items are pushed to every verified subscriber. ``GET /`` returns the
+hub's counters as JSON.
+
+By default only topics under FEED_BASE_URL and MOLTHUB_FEED_URL are
+accepted, so the hub can't be used to make requests elsewhere.
+
+Set WEBSUB_HUB_URL to the public URL of this server so the feeds advertise
+it (``rel="hub"``) and publishers ping it.
+
+Usage:
+    python hub.py [--host 0.0.0.0] [--port 8080] [--url https://hub.example/]
+                  [--store websub-hub.json] [--topic PREFIX ...] [--any-topic]
+"""
+
+import os
+import sys
+import json
+import argparse
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "api-disabled"))
+
+import _websub  # noqa: E402
+
+# Subscription requests are a few short form fields
+MAX_BODY = 64 * 1024
+
+
+class HubServer(ThreadingHTTPServer):
+    # socketserver's default backlog of 5 drops connections under a burst
+    # of subscribe requests or pings
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def default_topics():
+    """URL prefixes of the feeds this project publishes."""
+    import feed
+    import index
+
+    # Topics are the feeds' self links: index.static_feed_url and
+    # feed.feed_url (the latter only adds a query string)
+    return sorted({index.FEED_BASE_URL.rstrip("/") + "/", feed.FEED_URL})
+
+
+def make_handler(hub, quiet=False):
+    class HubHandler(BaseHTTPRequestHandler):
+        server_version = "EschatonWebSub/1.0"
+
+        def _reply(self, status, body, content_type="text/plain; charset=utf-8"):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._reply(200, json.dumps(hub.stats), "application/json")
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY:
+                self._reply(413, "Request body too large\n")
+                return
+            content_type = self.headers.get("Content-Type", "")
+            if not content_type.startswith("application/x-www-form-urlencoded"):
+                self._reply(400, "Expected application/x-www-form-urlencoded\n")
+                return
+            form = parse_qs(self.rfile.read(length).decode("utf-8", "replace"))
+            self._reply(*hub.handle(form))
+
+        def log_message(self, format, *args):
+            if not quiet:
+                print(f"🌐 {self.address_string()} {format % args}")
+
+    return HubHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument("--host", default="0.0.0.0", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--url", default=_websub.HUB_URL,
+                        help="public URL of this hub (default: WEBSUB_HUB_URL)")
+    parser.add_argument("--store", default=_websub.STORE_PATH, help="hub state file")
+    parser.add_argument("--topic", action="append", help="accepted topic URL prefix (repeatable)")
+    parser.add_argument("--any-topic", action="store_true", help="accept any topic URL")
+    parser.add_argument("--concurrency", type=int, default=_websub.CONCURRENCY,
+                        help="deliveries in flight")
+    args = parser.parse_args()
+
+    url = args.url or f"http://localhost:{args.port}/"
+    topics = None if args.any_topic else (args.topic or default_topics())
+    hub = _websub.Hub(url, store_path=args.store, topics=topics, concurrency=args.concurrency)
+    server = HubServer((args.host, args.port), make_handler(hub))
+    print(f"📡 WebSub hub {url} listening on {args.host}:{args.port}")
+    for prefix in topics or ["(any topic)"]:
+        print(f"   topics: {prefix}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Stopping hub")
+    finally:
+        server.server_close()
+        hub.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
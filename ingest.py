@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Incremental report ingestion for Eschaton RSS
+=============================================
+
+Copies daily reports from the research agent's workspace into reports/,
+replacing the copy-everything loop in update-reports.sh:
+
+    - only new or changed reports are copied, compared by content hash
+      against the report index (unchanged sources aren't even re-read
+      while watching)
+    - file names are validated with ``index.parse_report_date`` and
+      contents must be non-empty UTF-8; anything else is skipped with a
+      warning
+    - after a copy the report index is refreshed and build.py's
+      incremental render runs; feed files and report pages are only
+      rewritten, and ``--exec`` only fires, when their rendered bytes
+      actually changed
+    - the /api/search index is updated, re-tokenizing only the copied
+      reports
+    - when WEBSUB_HUB_URL is set and the rendered output changed, the hub
+      is pinged (after ``--exec``, which is expected to deploy) so it
+      pushes the new reports to subscribers
+
+Reports removed from the source are left in place; the archive only grows.
+
+With ``--watch`` the source directory is watched with inotify (Linux) or,
+where that isn't available, polled every ``--interval`` seconds.
+
+Environment Variables:
+    REPORTS_SOURCE - Directory the research agent writes reports to
+                     (default: ~/.openclaw/workspace-agents/research-agent)
+
+Usage:
+    python ingest.py [--source DIR] [--watch] [--interval 30]
+                     [--out public] [--no-build] [--exec CMD] [--commit]
+"""
+
+import os
+import sys
+import time
+import select
+import struct
+import hashlib
+import argparse
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "api-disabled"))
+
+import build  # noqa: E402
+import index  # noqa: E402
+from _websub import ping  # noqa: E402
+
+DEFAULT_SOURCE = os.path.expanduser(
+    os.environ.get("REPORTS_SOURCE", "~/.openclaw/workspace-agents/research-agent")
+)
+REPORT_GLOB_PREFIX = "daily-report-"
+
+# Seconds to wait for more events after the first one, so an agent writing
+# several reports produces one sync
+SETTLE_SECONDS = 1.0
+
+
+class Ingestor:
+    """Copies new or changed reports from ``source`` into reports/."""
+
+    def __init__(self, source, dest=index.REPORTS_DIR):
+        self.source = source
+        self.dest = dest
+        # name -> (mtime_ns, size, sha256) of source files already checked
+        self._checked = {}
+        # name -> (mtime_ns, size) of files already reported as invalid
+        self._rejected = {}
+        self.stats = {'copied': 0, 'unchanged': 0, 'invalid': 0}
+
+    def _index_hashes(self):
+        """sha256 of every report already in reports/, by file name."""
+        return {
+            os.path.basename(index._report_index.path_for(entry)): entry["sha256"]
+            for _, entry in index.load_reports()
+        }
+
+    def validate(self, name, data):
+        """Reason ``data`` can't be ingested as report ``name``, or None."""
+        try:
+            date = index.parse_report_date(name)
+        except ValueError:
+            date = None
+        if date is None or name != f"{REPORT_GLOB_PREFIX}{date:%Y-%m-%d}.md":
+            return "file name is not daily-report-YYYY-MM-DD.md"
+        if not data.strip():
+            return "file is empty"
+        try:
+            data.decode("utf-8")
+        except UnicodeDecodeError as e:
+            return f"not valid UTF-8 ({e.reason} at byte {e.start})"
+        return None
+
+    def sync(self):
+        """Copy every new or changed report once.
+
+        Returns:
+            List of file names copied into reports/.
+        """
+        try:
+            scan = [e for e in os.scandir(self.source)
+                    if e.name.startswith(REPORT_GLOB_PREFIX) and e.name.endswith(".md") and e.is_file()]
+        except FileNotFoundError:
+            print(f"⚠️  Source directory not found: {self.source}")
+            return []
+
+        known = self._index_hashes()
+        copied = []
+        for dir_entry in sorted(scan, key=lambda e: e.name):
+            name = dir_entry.name
+            st = dir_entry.stat()
+            signature = (st.st_mtime_ns, st.st_size)
+            checked = self._checked.get(name)
+            if checked and checked[:2] == signature and known.get(name) == checked[2]:
+                self.stats['unchanged'] += 1
+                continue
+            if self._rejected.get(name) == signature:
+                continue
+
+            try:
+                with open(dir_entry.path, "rb") as f:
+                    data = f.read()
+            except OSError as e:
+                print(f"⚠️  Could not read {dir_entry.path}: {e}")
+                continue
+
+            problem = self.validate(name, data)
+            if problem:
+                self._rejected[name] = signature
+                self.stats['invalid'] += 1
+                print(f"⚠️  Skipping {name}: {problem}")
+                continue
+
+            digest = hashlib.sha256(data).hexdigest()
+            self._rejected.pop(name, None)
+            self._checked[name] = (*signature, digest)
+            if known.get(name) == digest:
+                self.stats['unchanged'] += 1
+                continue
+
+            build.write_if_changed(os.path.join(self.dest, name), data)
+            self.stats['copied'] += 1
+            copied.append(name)
+            print(f"📥 {'Updated' if name in known else 'Added'} {name}")
+        return copied
+
+
+def render(out_dir):
+    """Re-render static outputs after reports changed.
+
+    Returns:
+        True if a feed file or report page changed.
+    """
+    changed = build.build_feeds(out_dir)
+    rendered, skipped, removed = build.build_report_pages(out_dir)
+    print(f"📄 Report pages: {rendered} rendered, {skipped} unchanged, {removed} removed")
+    build.build_search_index()
+    return changed or rendered > 0 or removed > 0
+
+
+def commit_reports(names):
+    """Commit (and push, if there is a remote) the copied reports."""
+    reports = [os.path.join("reports", name) for name in names]
+    run = lambda *cmd: subprocess.run(cmd, cwd=BASE_DIR)  # noqa: E731
+    if run("git", "add", "--", *reports).returncode != 0:
+        return
+    if run("git", "diff", "--cached", "--quiet", "--", *reports).returncode == 0:
+        print("ℹ️  No changes to commit")
+        return
+    print("📦 Committing changes...")
+    run("git", "commit", "-m", f"Update reports - {time.strftime('%Y-%m-%d %H:%M')}", "--", *reports)
+    if subprocess.run(["git", "remote", "get-url", "origin"], cwd=BASE_DIR,
+                      capture_output=True).returncode == 0:
+        print("🚀 Pushing to remote...")
+        run("git", "push")
+
+
+def feed_topics():
+    """WebSub topics of the feed files build.py writes: their self links."""
+    return [index.static_feed_url(fmt) for fmt in build.FEED_FILES]
+
+
+def ingest_once(ingestor, args):
+    copied = ingestor.sync()
+    if not copied:
+        print("ℹ️  No new or changed reports")
+        return False
+
+    output_changed = False
+    if not args.no_build:
+        output_changed = render(args.out)
+    else:
+        # Still bring the indexes (report sidecar, search) up to date
+        index.update_search_index()
+
+    if args.commit:
+        commit_reports(copied)
+    if args.exec and (output_changed or args.no_build):
+        print(f"▶️  {args.exec}")
+        subprocess.run(args.exec, shell=True, cwd=BASE_DIR)
+    elif args.exec:
+        print("⏭️  Rendered output unchanged; not running --exec")
+    if output_changed or args.no_build:
+        ping(feed_topics())
+    return True
+
+
+# --- Watching ----------------------------------------------------------
+
+class InotifyWatcher:
+    """Blocks until files in a directory are written, moved in or removed (Linux)."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_DELETE = 0x00000200
+    IN_CLOEXEC = 0o2000000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, directory):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_MOVED_FROM | self.IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout=None):
+        """Names of files that changed, or an empty set on timeout."""
+        names = set()
+        deadline = None
+        while True:
+            remaining = timeout if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self.fd], [], [], remaining)
+            if not readable:
+                return names
+            buffer = os.read(self.fd, 64 * 1024)
+            offset = 0
+            while offset < len(buffer):
+                _, _, _, length = self._EVENT.unpack_from(buffer, offset)
+                start = offset + self._EVENT.size
+                names.add(os.fsdecode(buffer[start:start + length].rstrip(b"\0")))
+                offset = start + length
+            if deadline is None:
+                deadline = time.monotonic() + SETTLE_SECONDS
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback: compares directory snapshots every ``interval`` seconds."""
+
+    def __init__(self, directory, interval):
+        self.directory = directory
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        try:
+            return {e.name: (e.stat().st_mtime_ns, e.stat().st_size)
+                    for e in os.scandir(self.directory) if e.is_file()}
+        except FileNotFoundError:
+            return {}
+
+    def wait(self, timeout=None):
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        snapshot = self._scan()
+        names = {name for name in snapshot.keys() | self._snapshot.keys()
+                 if snapshot.get(name) != self._snapshot.get(name)}
+        self._snapshot = snapshot
+        return names
+
+    def close(self):
+        pass
+
+
+def make_watcher(directory, interval, polling=False):
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            watcher = InotifyWatcher(directory)
+            print(f"👀 Watching {directory} (inotify)")
+            return watcher
+        except (OSError, AttributeError) as e:
+            print(f"ℹ️  inotify unavailable ({e}); polling instead")
+    print(f"👀 Watching {directory} (polling every {interval:g}s)")
+    return PollingWatcher(directory, interval)
+
+
+def watch(ingestor, args):
+    watcher = make_watcher(ingestor.source, args.interval, polling=args.poll)
+    try:
+        while True:
+            names = watcher.wait()
+            if any(name.startswith(REPORT_GLOB_PREFIX) and name.endswith(".md") for name in names):
+                ingest_once(ingestor, args)
+    except KeyboardInterrupt:
+        print("👋 Stopped watching")
+    finally:
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument("--source", default=DEFAULT_SOURCE, help="directory the agent writes reports to")
+    parser.add_argument("--watch", action="store_true", help="keep running and ingest on every change")
+    parser.add_argument("--interval", type=float, default=30.0, help="polling interval in seconds")
+    parser.add_argument("--poll", action="store_true", help="poll even where inotify is available")
+    parser.add_argument("--out", default=os.path.join(BASE_DIR, "public"), help="build.py output directory")
+    parser.add_argument("--no-build", action="store_true", help="copy and index only, don't re-render")
+    parser.add_argument("--exec", help="shell command to run when rendered output changed")
+    parser.add_argument("--commit", action="store_true", help="git commit (and push) copied reports")
+    args = parser.parse_args()
+
+    print("🔄 Syncing reports...")
+    ingestor = Ingestor(args.source)
+    ingest_once(ingestor, args)
+    print(f"✅ {ingestor.stats['copied']} copied, {ingestor.stats['unchanged']} unchanged, "
+          f"{ingestor.stats['invalid']} skipped")
+    if args.watch:
+        watch(ingestor, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
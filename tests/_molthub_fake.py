@@ -0,0 +1,93 @@
+"""
+Minimal Molthub API stub for tests
+==================================
+
+Serves ``GET /api/v1/posts`` from an in-memory post list on 127.0.0.1.
+The list's ETag changes whenever ``server.posts`` is replaced, requests
+carrying the current ETag in If-None-Match get a 304, and ``?since=``
+filters on ``createdAt`` like the real API. Every request's query and
+headers are recorded in ``server.requests``. Clearing ``server.gate``
+holds requests until it is set again; setting ``server.fail`` to a status
+code answers every request with it.
+"""
+
+import json
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        server.requests.append({'path': url.path, 'query': query, 'headers': dict(self.headers)})
+        if url.path != '/api/v1/posts':
+            return self._send(404, b'{}')
+        server.gate.wait(5)
+        if server.fail:
+            return self._send(server.fail, b'{"error": "unavailable"}')
+        with server.lock:
+            posts, etag = list(server.posts), server.etag
+        if self.headers.get('If-None-Match') == etag:
+            return self._send(304, b'', etag)
+        since = query.get('since')
+        if since:
+            posts = [post for post in posts if (post.get('createdAt') or '') > since]
+        self._send(200, json.dumps(posts).encode('utf-8'), etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', self.server.last_modified)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeMolthub(ThreadingHTTPServer):
+    """Molthub ``/posts`` endpoint backed by ``self.posts`` (newest first)."""
+
+    daemon_threads = True
+
+    def __init__(self, posts=()):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = None
+        self.last_modified = 'Thu, 12 Feb 2026 23:00:00 GMT'
+        self.posts = list(posts)
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def api_base(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api/v1"
+
+    @property
+    def posts(self):
+        return self._posts
+
+    @posts.setter
+    def posts(self, posts):
+        with self.lock:
+            self._posts = list(posts)
+            digest = hashlib.sha1(json.dumps(self._posts, sort_keys=True).encode('utf-8'))
+            self.etag = f'"{digest.hexdigest()[:16]}"'
+
+    def close(self):
+        self.gate.set()
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,135 @@
+"""
+Minimal Redis-protocol (RESP) fake server for tests
+===================================================
+
+Understands the commands ``_feedcache.RedisCache`` sends (AUTH, SELECT,
+GET, SET with EX/PX, DEL) plus PING. Expiry runs on a clock the test can
+advance (``server.advance(seconds)``), so TTL tests don't sleep.
+``drop_connections()`` closes every client socket to simulate a restart or
+an idle timeout on the server side.
+"""
+
+import socket
+import threading
+import socketserver
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections.append(self.connection)
+        authed = server.password is None
+        db = 0
+        while True:
+            try:
+                args = self._read_command()
+            except (OSError, ValueError):
+                return
+            if args is None:
+                return
+            command = args[0].upper()
+            server.commands.append(command.decode())
+            if command == b'AUTH':
+                authed = args[-1].decode() == server.password
+                self._write(b'+OK\r\n' if authed else b'-WRONGPASS invalid password\r\n')
+                continue
+            if not authed:
+                self._write(b'-NOAUTH Authentication required.\r\n')
+                continue
+            if command == b'PING':
+                self._write(b'+PONG\r\n')
+            elif command == b'SELECT':
+                db = int(args[1])
+                self._write(b'+OK\r\n')
+            elif command == b'GET':
+                value = server.get(db, args[1])
+                self._write(b'$-1\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value))
+            elif command == b'SET':
+                ttl = None
+                options = [arg.upper() for arg in args[3:]]
+                if b'EX' in options:
+                    ttl = float(args[3 + options.index(b'EX') + 1])
+                elif b'PX' in options:
+                    ttl = float(args[3 + options.index(b'PX') + 1]) / 1000
+                server.set(db, args[1], args[2], ttl)
+                self._write(b'+OK\r\n')
+            elif command == b'DEL':
+                self._write(b':%d\r\n' % sum(server.delete(db, key) for key in args[1:]))
+            else:
+                self._write(b"-ERR unknown command '%s'\r\n" % args[0])
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if line[:1] != b'*':
+            raise ValueError(f"expected an array, got {line!r}")
+        args = []
+        for _ in range(int(line[1:-2])):
+            header = self.rfile.readline()
+            length = int(header[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _write(self, data):
+        self.wfile.write(data)
+
+
+class FakeRedis(socketserver.ThreadingTCPServer):
+    """RESP server on 127.0.0.1 with an in-memory keyspace per db."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password=None):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.password = password
+        self.now = 0.0
+        self.data = {}
+        self.commands = []
+        self.connections = []
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def url(self):
+        auth = f":{self.password}@" if self.password else ''
+        return f"redis://{auth}127.0.0.1:{self.server_address[1]}/0"
+
+    def advance(self, seconds):
+        with self.lock:
+            self.now += seconds
+
+    def get(self, db, key):
+        with self.lock:
+            stored = self.data.get((db, key))
+            if stored is None:
+                return None
+            value, expires = stored
+            if expires is not None and expires <= self.now:
+                del self.data[(db, key)]
+                return None
+            return value
+
+    def set(self, db, key, value, ttl):
+        with self.lock:
+            self.data[(db, key)] = (value, None if ttl is None else self.now + ttl)
+
+    def delete(self, db, key):
+        with self.lock:
+            return 1 if self.data.pop((db, key), None) is not None else 0
+
+    def drop_connections(self):
+        with self.lock:
+            connections, self.connections = self.connections, []
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def close(self):
+        self.shutdown()
+        self.drop_connections()
+        self.server_close()
@@ -0,0 +1,116 @@
+"""
+Local HTTP stand-ins for WebSub tests
+=====================================
+
+``Site`` serves a directory (build.py output) and, optionally, a handler
+function at one path (the dict-style request/response of index.py and
+feed.py), so a hub can fetch topics by their real self links.
+``Subscriber`` is a callback that echoes the ``hub.challenge`` of
+verification requests and records every delivery.
+"""
+
+import os
+import base64
+import threading
+import mimetypes
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+mimetypes.add_type('application/feed+json', '.json')
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler_class):
+        super().__init__(('127.0.0.1', 0), handler_class)
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _SiteHandler(_Handler):
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        if server.function is not None and url.path == server.function_path:
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            response = server.function({'query': query, 'headers': dict(self.headers)})
+            body = response.get('body', '')
+            if response.get('isBase64Encoded'):
+                body = base64.b64decode(body)
+            elif isinstance(body, str):
+                body = body.encode('utf-8')
+            return self._send(response['statusCode'], body, response.get('headers'))
+        path = os.path.join(server.root or '', url.path.lstrip('/'))
+        if server.root is None or not os.path.isfile(path):
+            return self._send(404)
+        with open(path, 'rb') as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self._send(200, body, {'Content-Type': content_type})
+
+
+class Site(_Server):
+    """Files under ``root`` plus ``function`` served at ``function_path``."""
+
+    def __init__(self, root=None, function=None, function_path='/api/feed'):
+        self.root = root
+        self.function = function
+        self.function_path = function_path
+        super().__init__(_SiteHandler)
+
+
+class _SubscriberHandler(_Handler):
+    def do_GET(self):
+        query = {name: values[-1] for name, values in parse_qs(urlsplit(self.path).query).items()}
+        self.server.verifications.append(query)
+        self._send(200, query.get('hub.challenge', '').encode('utf-8'), {'Content-Type': 'text/plain'})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        server = self.server
+        with server.changed:
+            server.deliveries.append({'path': self.path, 'headers': dict(self.headers), 'body': body})
+            server.changed.notify_all()
+        self._send(204)
+
+
+class Subscriber(_Server):
+    """WebSub callback server; ``callback(name)`` is a distinct callback URL."""
+
+    def __init__(self):
+        self.verifications = []
+        self.deliveries = []
+        self.changed = threading.Condition()
+        super().__init__(_SubscriberHandler)
+
+    def callback(self, name):
+        return f"{self.url}/{name}"
+
+    def wait(self, count, timeout=5):
+        """Deliveries once at least ``count`` arrived (fewer on timeout)."""
+        with self.changed:
+            self.changed.wait_for(lambda: len(self.deliveries) >= count, timeout)
+            return list(self.deliveries)
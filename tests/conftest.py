@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Handlers import their helper modules as siblings (see bench/)
+sys.path.insert(0, os.path.join(BASE_DIR, "api-disabled"))
+sys.path.insert(0, BASE_DIR)
+
+
+REPORT = """# 📊 Daily Intelligence Brief
+
+## 🎯 Executive Summary
+
+**Key Developments Today:** report {day}.
+
+**Strategic Signal:** signal of day {day}.
+
+## 📈 GitHub Trending Analysis
+
+Trending on day {day}.
+"""
+
+
+@pytest.fixture
+def reports(tmp_path, monkeypatch):
+    """Point index.py at an empty reports directory; returns a writer."""
+    import index
+    from _report_index import ReportIndex
+
+    monkeypatch.setattr(index, "_report_index",
+                        ReportIndex(str(tmp_path), index.parse_report, None, index.PARSER_VERSION))
+    monkeypatch.setattr(index, "_outputs", {})
+    monkeypatch.setattr(index, "_filtered", index.VariantLRU())
+
+    def write(day, content=None, mtime=None):
+        path = tmp_path / f"daily-report-2026-02-{day:02d}.md"
+        path.write_text(content if content is not None else REPORT.format(day=day), encoding="utf-8")
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    return write
@@ -0,0 +1,57 @@
+"""Static feed files written by build.py."""
+
+import json
+import xml.etree.ElementTree as ET
+
+import build
+import index
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def links(path):
+    root = ET.parse(path).getroot()
+    return {link.get("rel"): link.get("href") for link in root.iter(f"{ATOM}link")}
+
+
+def test_static_feeds_link_to_static_archives(reports, tmp_path, monkeypatch):
+    monkeypatch.setattr(index, "PAGE_SIZE", 2)
+    for day in range(1, 6):
+        reports(day)
+    out = tmp_path / "public"
+    assert build.build_feeds(str(out))
+
+    base = index.FEED_BASE_URL
+    assert links(out / "feed.xml")["self"] == f"{base}/feed.xml"
+    assert links(out / "feed.xml")["prev-archive"] == f"{base}/archive/feed-2.xml"
+    assert links(out / "atom.xml")["self"] == f"{base}/atom.xml"
+    assert links(out / "atom.xml")["prev-archive"] == f"{base}/archive/atom-2.xml"
+    assert json.loads((out / "feed.json").read_text())["feed_url"] == f"{base}/feed.json"
+    assert json.loads((out / "feed.json").read_text())["next_url"] == f"{base}/archive/feed-2.json"
+
+    # Every archive link resolves to a file the build wrote
+    page2 = links(out / "archive" / "feed-2.xml")
+    assert page2["self"] == f"{base}/archive/feed-2.xml"
+    assert page2["current"] == f"{base}/feed.xml"
+    assert page2["prev-archive"] == f"{base}/archive/feed-1.xml"
+    assert (out / "archive" / "feed-1.xml").exists()
+    assert "next-archive" in links(out / "archive" / "atom-1.xml")
+    assert (out / "archive" / "feed-1.json").exists()
+
+    # Unchanged reports rewrite nothing
+    assert not build.build_feeds(str(out))
+
+
+def test_removed_reports_prune_archive_pages(reports, tmp_path, monkeypatch):
+    monkeypatch.setattr(index, "PAGE_SIZE", 2)
+    paths = [reports(day) for day in range(1, 6)]
+    out = tmp_path / "public"
+    build.build_feeds(str(out))
+    assert (out / "archive" / "feed-2.xml").exists()
+
+    for path in paths[:2]:
+        path.unlink()
+    assert build.build_feeds(str(out))
+    assert (out / "archive" / "feed-1.xml").exists()
+    assert not (out / "archive" / "feed-2.xml").exists()
+    assert not (out / "archive" / "feed-2.xml.gz").exists()
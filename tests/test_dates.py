@@ -0,0 +1,120 @@
+"""Strict date parsing and locale-independent formatting (_dates.py)."""
+
+import json
+import locale
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+import pytest
+
+import _dates
+import _trace
+from _dates import format_rfc822, format_rfc3339, parse_iso8601, rfc822_from_iso
+from _trace import instrumented
+
+UTC = timezone.utc
+
+
+@pytest.fixture(autouse=True)
+def cold_caches():
+    _dates.clear_caches()
+    _dates.invalid_samples.clear()
+    yield
+    _dates.clear_caches()
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2026-02-13T13:14:45Z", datetime(2026, 2, 13, 13, 14, 45, tzinfo=UTC)),
+    ("2026-02-13T13:14:45.123Z", datetime(2026, 2, 13, 13, 14, 45, 123000, tzinfo=UTC)),
+    ("2026-02-13T13:14:45.123456+00:00", datetime(2026, 2, 13, 13, 14, 45, 123456, tzinfo=UTC)),
+    ("2026-02-13T15:14:45+02:00", datetime(2026, 2, 13, 13, 14, 45, tzinfo=UTC)),
+    ("2026-02-13T08:14-0500", datetime(2026, 2, 13, 13, 14, tzinfo=UTC)),
+    ("2026-02-13 13:14:45", datetime(2026, 2, 13, 13, 14, 45, tzinfo=UTC)),
+    ("2026-02-13T13:14:45,5Z", datetime(2026, 2, 13, 13, 14, 45, 500000, tzinfo=UTC)),
+    ("2026-02-13T13:14:45.123456789Z", datetime(2026, 2, 13, 13, 14, 45, 123456, tzinfo=UTC)),
+    ("2026-02-13", datetime(2026, 2, 13, tzinfo=UTC)),
+])
+def test_parse_valid_iso8601(value, expected):
+    parsed = parse_iso8601(value)
+    assert parsed == expected
+    assert parsed.tzinfo is UTC
+
+
+@pytest.mark.parametrize("value", [
+    "yesterday",
+    "2026-13-01T00:00:00Z",
+    "2026-02-30",
+    "2026-02-13T25:00:00Z",
+    "Fri, 13 Feb 2026 13:14:45 GMT",
+    "2026-02-13T13:14:45Z trailing",
+    12345,
+])
+def test_invalid_input_returns_none_and_is_counted(value, capsys):
+    before = _dates.stats["invalid"], _trace.counters["dates.invalid"]
+    assert parse_iso8601(value) is None
+    assert rfc822_from_iso(value) is None
+    assert _dates.stats["invalid"] == before[0] + 2
+    assert _trace.counters["dates.invalid"] == before[1] + 2
+    assert value in _dates.invalid_samples
+    capsys.readouterr()
+
+
+def test_empty_input_is_not_an_error():
+    before = _dates.stats["invalid"]
+    assert parse_iso8601("") is None
+    assert parse_iso8601(None) is None
+    assert rfc822_from_iso("") is None
+    assert _dates.stats["invalid"] == before
+
+
+def test_invalid_dates_are_reported_through_the_trace(capsys):
+    @instrumented("dates")
+    def handler(request):
+        parse_iso8601("not a date")
+        # Repeats are counted but logged once
+        parse_iso8601("not a date")
+        return {"statusCode": 200, "headers": {}, "body": ""}
+
+    handler({})
+    record = json.loads(capsys.readouterr().out)
+    assert record["counters"]["dates.invalid"] == 2
+    assert record["events"] == [{"event": "invalid_date", "value": "'not a date'"}]
+
+
+@pytest.mark.parametrize("dt, rfc822, rfc3339", [
+    (datetime(2026, 2, 13, 13, 14, 45, tzinfo=UTC),
+     "Fri, 13 Feb 2026 13:14:45 GMT", "2026-02-13T13:14:45Z"),
+    (datetime(2026, 2, 13, 15, 14, 45, tzinfo=timezone(timedelta(hours=2))),
+     "Fri, 13 Feb 2026 13:14:45 GMT", "2026-02-13T13:14:45Z"),
+    # Naive datetimes are UTC
+    (datetime(2025, 12, 31, 23, 59, 59), "Wed, 31 Dec 2025 23:59:59 GMT", "2025-12-31T23:59:59Z"),
+])
+def test_formatting(dt, rfc822, rfc3339):
+    assert format_rfc822(dt) == rfc822
+    assert format_rfc3339(dt) == rfc3339
+
+
+def test_rfc822_from_iso_matches_the_email_formatter():
+    start = datetime(2026, 1, 1, 6, 30, tzinfo=UTC)
+    for day in range(0, 400, 7):
+        dt = start + timedelta(days=day, minutes=day)
+        rfc822 = rfc822_from_iso(dt.isoformat())
+        assert rfc822 == format_datetime(dt, usegmt=True)
+        # Valid RFC 822: it parses back to the same instant
+        assert parsedate_to_datetime(rfc822) == dt
+
+
+@pytest.mark.parametrize("name", ["de_DE.UTF-8", "fr_FR.UTF-8", "ja_JP.UTF-8", "tr_TR.UTF-8"])
+def test_formatting_ignores_the_process_locale(name):
+    saved = locale.setlocale(locale.LC_TIME)
+    try:
+        locale.setlocale(locale.LC_TIME, name)
+    except locale.Error:
+        pytest.skip(f"locale {name} not installed")
+    try:
+        dt = datetime(2026, 5, 14, 9, 5, 7, tzinfo=UTC)
+        assert format_rfc822(dt) == "Thu, 14 May 2026 09:05:07 GMT"
+        assert rfc822_from_iso("2026-05-14T09:05:07Z") == "Thu, 14 May 2026 09:05:07 GMT"
+        assert format_rfc3339(dt) == "2026-05-14T09:05:07Z"
+    finally:
+        locale.setlocale(locale.LC_TIME, saved)
@@ -0,0 +1,181 @@
+"""Molthub post sync (feed.py) against a local API stub."""
+
+import time
+
+import pytest
+import requests
+
+import _http
+import feed
+from _feedcache import MemoryCache
+from _molthub_fake import FakeMolthub
+
+SUBMOLT = 'sub-1'
+
+
+def post(n, version=None):
+    created = f"2026-02-{n:02d}T08:00:00Z"
+    return {
+        'id': f"post-{n}",
+        'title': f"Post {n}",
+        'content': f"Body {n}",
+        'createdAt': created,
+        'updatedAt': version or created,
+    }
+
+
+@pytest.fixture
+def molthub(monkeypatch):
+    server = FakeMolthub([post(3), post(2), post(1)])
+    monkeypatch.setattr(feed, 'API_BASE', server.api_base)
+    monkeypatch.setattr(feed, '_cache', MemoryCache())
+    yield server
+    server.close()
+
+
+def ids(posts):
+    return [p['id'] for p in posts]
+
+
+def test_fetch_200_returns_posts_and_validators(molthub):
+    result = feed.fetch_posts_conditional(SUBMOLT, 'key')
+    assert result['status'] == 200
+    assert ids(result['posts']) == ['post-3', 'post-2', 'post-1']
+    assert result['etag'] == molthub.etag
+    assert result['last_modified'] == molthub.last_modified
+    sent = molthub.requests[-1]
+    assert sent['query'] == {'submoltId': SUBMOLT, 'limit': '30'}
+    assert sent['headers']['Authorization'] == 'Bearer key'
+
+
+def test_fetch_304_keeps_previous_validators(molthub):
+    result = feed.fetch_posts_conditional(SUBMOLT, 'key', etag=molthub.etag,
+                                          last_modified=molthub.last_modified)
+    assert result == {'status': 304, 'posts': [], 'etag': molthub.etag,
+                      'last_modified': molthub.last_modified}
+    assert molthub.requests[-1]['headers']['If-None-Match'] == molthub.etag
+
+
+def test_fetch_since_drops_posts_upstream_failed_to_filter(molthub):
+    result = feed.fetch_posts_conditional(SUBMOLT, 'key', since=post(2)['createdAt'])
+    assert ids(result['posts']) == ['post-3']
+    assert molthub.requests[-1]['query']['since'] == post(2)['createdAt']
+
+
+def test_sync_full_then_not_modified(molthub):
+    posts, changed = feed.sync_posts(SUBMOLT, 'key', now=1000)
+    assert changed and ids(posts) == ['post-3', 'post-2', 'post-1']
+    assert 'since' not in molthub.requests[-1]['query']
+
+    posts, changed = feed.sync_posts(SUBMOLT, 'key', now=1100)
+    assert not changed and ids(posts) == ['post-3', 'post-2', 'post-1']
+    assert molthub.requests[-1]['headers']['If-None-Match'] == molthub.etag
+
+
+def test_sync_incremental_merges_new_and_edited_posts(molthub):
+    feed.sync_posts(SUBMOLT, 'key', now=1000)
+    molthub.posts = [post(4), post(3), post(2, version='2026-02-05T00:00:00Z'), post(1)]
+
+    posts, changed = feed.sync_posts(SUBMOLT, 'key', now=1100)
+    sent = molthub.requests[-1]
+    assert sent['query']['since'] == post(3)['createdAt']
+    assert changed and ids(posts) == ['post-4', 'post-3', 'post-2', 'post-1']
+    # Only posts newer than the cursor come back; the edit waits for a full sync
+    assert posts[2]['updatedAt'] == post(2)['updatedAt']
+
+
+def test_sync_within_max_age_skips_the_request(molthub):
+    feed.sync_posts(SUBMOLT, 'key', now=1000)
+    requests = len(molthub.requests)
+    posts, changed = feed.sync_posts(SUBMOLT, 'key', now=1010, max_age=60)
+    assert not changed and ids(posts) == ['post-3', 'post-2', 'post-1']
+    assert len(molthub.requests) == requests
+
+
+def test_full_resync_replaces_the_store(molthub):
+    feed.sync_posts(SUBMOLT, 'key', now=1000)
+    # post-2 deleted upstream, post-1 edited: invisible to incremental syncs
+    molthub.posts = [post(3), post(1, version='2026-02-06T00:00:00Z')]
+    posts, _ = feed.sync_posts(SUBMOLT, 'key', now=1100)
+    assert ids(posts) == ['post-3', 'post-2', 'post-1']
+
+    posts, changed = feed.sync_posts(SUBMOLT, 'key', now=1000 + feed.FULL_SYNC_INTERVAL)
+    assert 'since' not in molthub.requests[-1]['query']
+    assert changed and ids(posts) == ['post-3', 'post-1']
+    assert posts[1]['updatedAt'] == '2026-02-06T00:00:00Z'
+
+    store = feed.load_store(feed._cache, feed.posts_key(SUBMOLT))
+    assert store['full_sync'] == 1000 + feed.FULL_SYNC_INTERVAL
+    assert store['cursor'] == post(3)['createdAt']
+    assert store['etag'] == molthub.etag
+
+
+def test_submolt_feed_rerenders_after_aggregate_consumed_the_change(molthub, monkeypatch):
+    monkeypatch.setattr(feed, 'SUBMOLT_IDS', [SUBMOLT])
+    monkeypatch.setattr(feed, '_filtered', feed.VariantLRU())
+    # Let the aggregate re-check stores it would otherwise reuse
+    monkeypatch.setattr(feed, 'CACHE_DURATION', 0)
+    before = feed.refresh_feed(SUBMOLT, 'key')
+    assert 'post-4' not in before['body']
+
+    molthub.posts = [post(4), post(3), post(2), post(1)]
+    # The aggregate refresh syncs the shared store first...
+    assert 'post-4' in feed.refresh_feed(feed.ALL_SUBMOLTS, 'key')['body']
+    # ...so the sub-molt's own sync sees no change, but its feed is behind
+    after = feed.refresh_feed(SUBMOLT, 'key')
+    assert 'post-4' in after['body']
+    assert after['etag'] != before['etag']
+    assert 'post-4' in feed.filtered_body(after, 'json', feed.feed_filter({'query': {'category': 'Intelligence'}}))[0]
+
+
+def age_entry(submolt_id, seconds):
+    """Make the cached feed entry ``seconds`` old."""
+    key = feed.cache_key(submolt_id)
+    entry = feed._cache.get(key)
+    feed._cache.set(key, dict(entry, timestamp=time.time() - seconds))
+
+
+def posts_requests(molthub):
+    return sum(1 for r in molthub.requests if r['path'] == '/api/v1/posts')
+
+
+def test_stale_while_revalidate_serves_stale_and_refreshes_once(molthub):
+    feed.refresh_feed(SUBMOLT, 'key')
+    age_entry(SUBMOLT, feed.CACHE_DURATION + feed.STALE_WHILE_REVALIDATE / 2)
+    molthub.posts = [post(4), post(3), post(2), post(1)]
+    before = posts_requests(molthub)
+
+    # Hold the upstream so every request lands while the refresh runs
+    molthub.gate.clear()
+    served = [feed.get_cached_entry(SUBMOLT, 'key') for _ in range(5)]
+    assert [entry['status'] for entry in served] == ['stale'] * 5
+    assert all('post-4' not in entry['body'] for entry in served)
+    molthub.gate.set()
+
+    deadline = time.monotonic() + 5
+    while feed._refresh_flight.in_flight(feed.cache_key(SUBMOLT)):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert posts_requests(molthub) - before == 1
+    fresh = feed.get_cached_entry(SUBMOLT, 'key')
+    assert fresh['status'] == 'hit'
+    assert 'post-4' in fresh['body']
+
+
+def test_stale_if_error_serves_stale_when_upstream_fails(molthub, monkeypatch):
+    monkeypatch.setattr(_http, 'RETRIES', 0)
+    stale = feed.refresh_feed(SUBMOLT, 'key')
+    age_entry(SUBMOLT, feed.CACHE_DURATION + feed.STALE_WHILE_REVALIDATE + 1)
+    molthub.fail = 503
+    entry = feed.get_cached_entry(SUBMOLT, 'key')
+    assert entry['status'] == 'stale-if-error'
+    assert entry['body'] == stale['body']
+
+
+def test_error_surfaces_past_both_stale_windows(molthub, monkeypatch):
+    monkeypatch.setattr(_http, 'RETRIES', 0)
+    feed.refresh_feed(SUBMOLT, 'key')
+    age_entry(SUBMOLT, feed.CACHE_DURATION + max(feed.STALE_WHILE_REVALIDATE, feed.STALE_IF_ERROR) + 1)
+    molthub.fail = 503
+    with pytest.raises(requests.HTTPError):
+        feed.get_cached_entry(SUBMOLT, 'key')
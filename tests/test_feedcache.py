@@ -0,0 +1,131 @@
+"""Cache backends, with RedisCache run against a local RESP fake."""
+
+import socket
+import threading
+
+import pytest
+
+from _feedcache import MemoryCache, RedisCache, RedisError
+from _resp_fake import FakeRedis
+
+ENTRY = {'body': '<rss>ü 😀</rss>', 'etag': '"abc"', 'timestamp': 1.0}
+
+
+@pytest.fixture
+def fake():
+    server = FakeRedis()
+    yield server
+    server.close()
+
+
+def test_redis_get_set_delete(fake):
+    cache = RedisCache(fake.url)
+    assert cache.get('feed') is None
+    cache.set('feed', ENTRY)
+    assert cache.get('feed') == ENTRY
+    cache.delete('feed')
+    assert cache.get('feed') is None
+    # One connection serves every command
+    assert len(fake.connections) == 1
+
+
+def test_redis_keys_are_prefixed(fake):
+    RedisCache(fake.url, prefix='p:').set('feed', ENTRY)
+    assert (0, b'p:feed') in fake.data
+
+
+def test_redis_ttl_expiry(fake):
+    cache = RedisCache(fake.url)
+    cache.set('short', ENTRY, ttl=10)
+    cache.set('kept', ENTRY)
+    fake.advance(9)
+    assert cache.get('short') == ENTRY
+    fake.advance(1)
+    assert cache.get('short') is None
+    assert cache.get('kept') == ENTRY
+
+
+def test_redis_sub_second_ttl_is_rounded_up(fake):
+    cache = RedisCache(fake.url)
+    cache.set('feed', ENTRY, ttl=0.2)
+    fake.advance(0.5)
+    assert cache.get('feed') == ENTRY
+    fake.advance(0.5)
+    assert cache.get('feed') is None
+
+
+def test_redis_auth_and_select():
+    server = FakeRedis(password='s3cret')
+    try:
+        cache = RedisCache(server.url.replace('/0', '/2'))
+        cache.set('feed', ENTRY)
+        assert cache.get('feed') == ENTRY
+        assert server.commands[:2] == ['AUTH', 'SELECT']
+        assert (2, b'eschaton-rss:feed') in server.data
+
+        wrong = RedisCache(server.url.replace('s3cret', 'nope'))
+        with pytest.raises(RedisError):
+            wrong.get('feed')
+    finally:
+        server.close()
+
+
+def test_redis_reconnects_after_server_drops_connection(fake):
+    cache = RedisCache(fake.url)
+    cache.set('feed', ENTRY)
+    fake.drop_connections()
+    assert cache.get('feed') == ENTRY
+    assert len(fake.connections) == 1
+
+
+def test_redis_unreachable_server_raises():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    cache = RedisCache(f"redis://127.0.0.1:{port}/0", timeout=0.5)
+    with pytest.raises(OSError):
+        cache.get('feed')
+    with pytest.raises(OSError):
+        cache.set('feed', ENTRY)
+
+
+def test_redis_server_gone_after_connect_raises(fake):
+    cache = RedisCache(fake.url, timeout=0.5)
+    cache.set('feed', ENTRY)
+    fake.close()
+    with pytest.raises((OSError, ConnectionError)):
+        cache.get('feed')
+
+
+def test_redis_error_reply_is_raised_and_connection_kept(fake):
+    cache = RedisCache(fake.url)
+    with pytest.raises(RedisError):
+        cache.execute('NOPE')
+    cache.set('feed', ENTRY)
+    assert cache.get('feed') == ENTRY
+
+
+def test_redis_corrupt_value_is_a_miss(fake):
+    fake.set(0, b'eschaton-rss:feed', b'not json', None)
+    assert RedisCache(fake.url).get('feed') is None
+
+
+def test_memory_cache_concurrent_expiry():
+    cache = MemoryCache()
+    errors = []
+
+    def expire():
+        try:
+            for _ in range(2000):
+                cache.get('feed')
+        except Exception as e:  # pragma: no cover - the regression
+            errors.append(e)
+
+    for _ in range(20):
+        cache.set('feed', ENTRY, ttl=-1)
+        threads = [threading.Thread(target=expire) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert not errors
@@ -0,0 +1,94 @@
+"""Pooled Molthub client (_http.py) against misbehaving local servers."""
+
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import _http
+from _http import BudgetExceeded
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.hits += 1
+        behaviour = server.script[min(server.hits, len(server.script)) - 1]
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if behaviour == 'ok':
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'[]')
+        elif behaviour == 'truncated':
+            # Chunked body whose connection drops before the last chunk
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            self.wfile.write(b'1\r\n[\r\n')
+            self.wfile.flush()
+            self.close_connection = True
+        elif behaviour == 'bad-gzip':
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', '9')
+            self.end_headers()
+            self.wfile.write(b'not gzip!')
+        elif behaviour == 'trickle':
+            self.send_header('Content-Length', '40')
+            self.end_headers()
+            try:
+                for _ in range(40):
+                    self.wfile.write(b' ')
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except OSError:
+                pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.hits = 0
+    httpd.script = ['ok']
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/posts"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(_http, '_backoff', lambda attempt: 0.01)
+
+
+@pytest.mark.parametrize('failure', ['truncated', 'bad-gzip'])
+def test_broken_body_is_retried(server, failure):
+    server.script = [failure, 'ok']
+    response = _http.get(server.url, retries=2)
+    assert response.status_code == 200
+    assert response.json() == []
+    assert response.timings['attempts'] == 2
+
+
+@pytest.mark.parametrize('failure', ['truncated', 'bad-gzip'])
+def test_broken_body_on_every_attempt_raises_timeout(server, failure):
+    server.script = [failure]
+    with pytest.raises(BudgetExceeded):
+        _http.get(server.url, retries=1)
+    assert server.hits == 2
+
+
+def test_slow_body_is_cut_off_at_the_budget(server):
+    server.script = ['trickle']
+    start = time.monotonic()
+    with pytest.raises(BudgetExceeded):
+        _http.get(server.url, budget=0.5, retries=2)
+    # One 40-byte trickle takes 2s; the budget stops it after ~0.5s
+    assert time.monotonic() - start < 1.5
@@ -0,0 +1,128 @@
+"""Reports feed handler (index.py) against a temporary reports directory."""
+
+import os
+import json
+
+import pytest
+
+import index
+from _conditional import http_date
+
+
+def get(query=None, headers=None):
+    return index.handler({"query": query or {}, "headers": headers or {}})
+
+
+def test_last_modified_moves_when_a_report_is_edited(reports):
+    path = reports(10, mtime=1_770_000_000)
+    reports(11, mtime=1_770_000_100)
+    first = get()
+    assert first["statusCode"] == 200
+    assert first["headers"]["Last-Modified"] == http_date(1_770_000_100)
+
+    # Edit the older report; the newest report's date is unchanged
+    path.write_text(path.read_text(encoding="utf-8") + "\nCorrection.\n", encoding="utf-8")
+    os.utime(path, (1_770_000_200, 1_770_000_200))
+    second = get(headers={"If-Modified-Since": first["headers"]["Last-Modified"]})
+    assert second["statusCode"] == 200
+    assert second["headers"]["ETag"] != first["headers"]["ETag"]
+    assert second["headers"]["Last-Modified"] == http_date(1_770_000_200)
+
+
+def test_last_modified_moves_on_backfill_with_old_mtime(reports):
+    reports(11, mtime=1_770_000_100)
+    first = get()
+    # A report copied in with its original (older) mtime
+    reports(3, mtime=1_760_000_000)
+    second = get(headers={"If-Modified-Since": first["headers"]["Last-Modified"]})
+    assert second["statusCode"] == 200
+    assert second["headers"]["ETag"] != first["headers"]["ETag"]
+
+
+def test_last_modified_moves_on_removal(reports):
+    reports(10, mtime=1_770_000_000)
+    path = reports(11, mtime=1_770_000_100)
+    first = get()
+    path.unlink()
+    second = get(headers={"If-Modified-Since": first["headers"]["Last-Modified"]})
+    assert second["statusCode"] == 200
+
+
+def test_unchanged_feed_answers_if_modified_since_with_304(reports):
+    reports(11, mtime=1_770_000_100)
+    first = get()
+    second = get(headers={"If-Modified-Since": first["headers"]["Last-Modified"]})
+    assert second["statusCode"] == 304
+    assert second["body"] == ""
+
+
+def test_each_content_coding_has_its_own_etag(reports):
+    reports(11, mtime=1_770_000_100)
+    plain = get()
+    gzipped = get(headers={"Accept-Encoding": "gzip"})
+    assert gzipped["headers"]["Content-Encoding"] == "gzip"
+    assert gzipped["headers"]["ETag"] == plain["headers"]["ETag"][:-1] + '-gzip"'
+
+    # Either tag revalidates; the 304 carries the tag of the coding negotiated
+    revalidated = get(headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped["headers"]["ETag"]})
+    assert revalidated["statusCode"] == 304
+    assert revalidated["headers"]["ETag"] == gzipped["headers"]["ETag"]
+    assert get(headers={"If-None-Match": gzipped["headers"]["ETag"]})["statusCode"] == 304
+    assert get(headers={"If-None-Match": 'W/' + plain["headers"]["ETag"]})["statusCode"] == 304
+    assert get(headers={"If-None-Match": '"other-gzip"'})["statusCode"] == 200
+
+
+def test_invalid_page_is_not_tagged(reports):
+    reports(11)
+    response = get({"page": 'x";\r\nbad'})
+    assert response["statusCode"] == 404
+    assert "page;" not in response["headers"]["Server-Timing"]
+
+
+def test_section_filter_matches_bold_labels(reports):
+    reports(10)
+    reports(11)
+    response = get({"section": "Strategic Signal", "format": "json"})
+    assert response["statusCode"] == 200
+    items = json.loads(response["body"])["items"]
+    assert [item["id"].rsplit("#", 1)[1] for item in items] == ["strategic-signal"] * 2
+    assert "signal of day 11" in items[0]["content_html"]
+    assert "Key Developments" not in items[0]["content_html"]
+    # Headings still win over labels
+    heading = json.loads(get({"section": "github-trending", "format": "json"})["body"])
+    assert heading["items"][0]["content_html"].startswith("<h2>")
+
+
+@pytest.mark.parametrize("query", [
+    {"section": "no-such-section"},
+    {"category": "no such category"},
+    {"author": "nobody"},
+])
+def test_unknown_filter_values_answer_404(reports, query):
+    reports(11)
+    assert get(query)["statusCode"] == 404
+
+
+def test_known_filter_values_still_work(reports):
+    reports(11)
+    assert get({"category": "daily brief"})["statusCode"] == 200
+    assert get({"author": index.FEED_AUTHOR})["statusCode"] == 200
+
+
+def test_archive_pages_revalidate_like_the_static_archive(reports, monkeypatch):
+    monkeypatch.setattr(index, "PAGE_SIZE", 2)
+    for day in range(2, 7):
+        reports(day, mtime=1_770_000_000 + day)
+    page = get({"page": "1"})
+    assert page["statusCode"] == 200
+    with open(os.path.join(os.path.dirname(__file__), "..", "vercel.json"), encoding="utf-8") as f:
+        rules = {rule["source"]: rule["headers"] for rule in json.load(f)["headers"]}
+    static = {h["key"]: h["value"] for h in rules["/archive/feed-(.*).xml"]}
+    assert page["headers"]["Cache-Control"] == static["Cache-Control"]
+    assert "immutable" not in page["headers"]["Cache-Control"]
+
+    # A backfill renumbers the pages; the ETag lets caches notice
+    reports(1, mtime=1_760_000_000)
+    again = get({"page": "1"}, headers={"If-None-Match": page["headers"]["ETag"]})
+    assert again["statusCode"] == 200
+    assert again["headers"]["ETag"] != page["headers"]["ETag"]
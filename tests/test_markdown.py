@@ -0,0 +1,40 @@
+"""Inline span rendering in _markdown.py."""
+
+import pytest
+
+from _document import parse, plain_inline
+from _markdown import render, render_inline
+
+
+@pytest.mark.parametrize("text, html", [
+    ("plain & <tags>", "plain &amp; &lt;tags&gt;"),
+    ("**Strategic Signal:** up", "<strong>Strategic Signal:</strong> up"),
+    ("**bold *em* inside**", "<strong>bold <em>em</em> inside</strong>"),
+    ("a *em* b", "a <em>em</em> b"),
+    ("2*3*4", "2*3*4"),
+    ("* not em *", "* not em *"),
+    ("****", "<em>**</em>"),
+    ("`a < b` & **c**", "<code>a &lt; b</code> &amp; <strong>c</strong>"),
+    ('[x & y](http://e.test/?a=1&b="2")',
+     '<a href="http://e.test/?a=1&amp;b=&quot;2&quot;">x &amp; y</a>'),
+    ("[**bold link**](http://e.test)", '<a href="http://e.test"><strong>bold link</strong></a>'),
+    ("unclosed **bold", "unclosed **bold"),
+])
+def test_render_inline(text, html):
+    assert render_inline(text) == html
+
+
+def test_plain_inline_strips_spans():
+    assert plain_inline("**a** *b* `c` [d](http://e.test)") == "a b c d"
+
+
+def test_bold_paragraph_is_not_a_list():
+    assert render("**Label:** value\n- item") == (
+        "<p><strong>Label:</strong> value</p>\n<ul>\n<li>item</li></ul>")
+    assert render("- \n* * *") == "<ul>\n<li></li></ul>\n<hr/>"
+
+
+def test_section_slug_and_title_are_derived_on_demand():
+    section = parse("## 📈 GitHub *Trending* Analysis\ntext").sections[0]
+    assert section.title == "📈 GitHub Trending Analysis"
+    assert section.slug == "github-trending-analysis"
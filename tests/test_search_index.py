@@ -0,0 +1,21 @@
+"""Search index lifecycle in index.py."""
+
+import index
+
+
+def test_update_closes_the_replaced_index(reports, tmp_path, monkeypatch):
+    monkeypatch.setattr(index, "SEARCH_INDEX_PATH", str(tmp_path / "search.bin"))
+    monkeypatch.setattr(index, "_search_index", None)
+    reports(10)
+    first = index.update_search_index()
+    assert not first._buffer.closed
+
+    # Unchanged reports keep the same mapping
+    assert index.update_search_index() is first
+
+    reports(11)
+    second = index.update_search_index()
+    assert second is not first
+    assert first._buffer.closed
+    assert not second._buffer.closed
+    second.close()
@@ -0,0 +1,168 @@
+"""Byte-for-byte conformance of the XML escaping and the three feed serializers.
+
+Golden files live in tests/golden/; after an intended output change,
+regenerate them with ``UPDATE_GOLDEN=1 python -m pytest tests/test_serializers.py``
+and review the diff.
+"""
+
+import os
+import json
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+import pytest
+
+from _formats import render_feed
+from _fragments import FragmentCache
+from _model import Channel, FeedItem
+from _xmlescape import CData, cdata, escape_attr, escape_text
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+
+# --- Escaping ----------------------------------------------------------
+
+@pytest.mark.parametrize("raw, escaped", [
+    ("plain text", "plain text"),
+    ("a & b < c > d", "a &amp; b &lt; c &gt; d"),
+    ("&amp; stays double-escaped", "&amp;amp; stays double-escaped"),
+    ('"quotes" and \'apostrophes\'', '"quotes" and \'apostrophes\''),
+    ("tab\tnewline\ncr\r", "tab\tnewline\ncr\r"),
+    ("nul\x00bell\x07vt\x0bff\x0cesc\x1bus\x1f", "nulbellvtffescus"),
+    ("nonchar￾￿", "nonchar"),
+    ("emoji 😀 and 𝔘𝔫𝔦𝔠𝔬𝔡𝔢 & <math>", "emoji 😀 and 𝔘𝔫𝔦𝔠𝔬𝔡𝔢 &amp; &lt;math&gt;"),
+    ("", ""),
+])
+def test_escape_text(raw, escaped):
+    assert escape_text(raw) == escaped
+
+
+@pytest.mark.parametrize("raw, escaped", [
+    ("https://example.test/?a=1&b=2", "https://example.test/?a=1&amp;b=2"),
+    ('say "hi" <now>', "say &quot;hi&quot; &lt;now&gt;"),
+    ("single 'quotes'", "single 'quotes'"),
+    ("ctl\x01\x02\x1f end", "ctl end"),
+    ("non-BMP 🦀 \U0010fffd", "non-BMP 🦀 \U0010fffd"),
+])
+def test_escape_attr(raw, escaped):
+    assert escape_attr(raw) == escaped
+
+
+def test_escaping_returns_clean_text_unchanged():
+    text = "nothing to escape here 😀"
+    assert escape_text(text) is text
+    assert escape_attr(text) is text
+
+
+def test_cdata_splits_terminator():
+    assert cdata("a]]>b") == "<![CDATA[a]]]]><![CDATA[>b]]>"
+    assert cdata("]]>]]>") == "<![CDATA[]]]]><![CDATA[>]]]]><![CDATA[>]]>"
+    assert cdata("<p>ok</p>") == "<![CDATA[<p>ok</p>]]>"
+    assert cdata("bad\x00\x1fchars 😀") == "<![CDATA[badchars 😀]]>"
+
+
+def test_cdata_round_trips_through_a_parser():
+    text = "<p>x]]>y & z 😀</p>"
+    root = ET.fromstring(f"<r>{cdata(text)}</r>")
+    assert root.text == text
+
+
+# --- Feed golden output -------------------------------------------------
+
+HARD_HTML = '<p>Tricky ]]> content with <b>markup</b> & "quotes" 😀</p>'
+
+
+def _channel():
+    return Channel(
+        title='Escaping & "Quoting" <Test>',
+        home_url="https://example.test/?a=1&b=2",
+        description="Control\x0bchars, non-BMP 𝔘𝔫𝔦𝔠𝔬𝔡𝔢 and \U0001f9ea",
+        feed_url=lambda fmt="rss", page=None: (
+            f"https://example.test/feed.{fmt}" + (f"?page={page}" if page else "")),
+        updated=datetime(2026, 2, 12, 23, 0, tzinfo=timezone.utc),
+        language="en-us",
+        generator="Golden/1.0",
+        page=2,
+        links=[("current", None), ("prev-archive", 1)],
+        archive=True,
+        icon="https://example.test/icon.svg",
+        image="https://example.test/icon.png",
+        categories=["AI & Agents", "Tests"],
+        author_name="Ezekiel <Analyst>",
+        author_email="ezekiel@example.test",
+        docs="https://www.rssboard.org/rss-specification",
+        ttl=60,
+        hub="https://hub.example.test/?x=1&y=2",
+    )
+
+
+def _items():
+    return [
+        FeedItem(
+            id="https://example.test/report/2026-02-12",
+            title="Report <one> & \"two\"",
+            url="https://example.test/report/2026-02-12",
+            published=datetime(2026, 2, 12, 23, 0, tzinfo=timezone.utc),
+            author_name="Ezekiel",
+            author_email="ezekiel@example.test",
+            summary="Summary with \x07bell & emoji 🚀",
+            content_html=HARD_HTML,
+            categories=["Daily Brief", "A&B"],
+            key=("sha-1",),
+        ),
+        FeedItem(
+            id="tag:example.test,2026:post-2",
+            title="No link, no content",
+            published=datetime(2026, 2, 11, 8, 30, 15, tzinfo=timezone.utc),
+            updated=datetime(2026, 2, 11, 9, 0, tzinfo=timezone.utc),
+            author_name="Agent",
+            summary="Only a summary",
+            comments_url="https://example.test/c?id=2&x=y",
+            key=("sha-2",),
+        ),
+    ]
+
+
+def _golden(name, body):
+    path = os.path.join(GOLDEN_DIR, name)
+    data = body.encode("utf-8")
+    if os.environ.get("UPDATE_GOLDEN"):
+        with open(path, "wb") as f:
+            f.write(data)
+    with open(path, "rb") as f:
+        assert data == f.read(), f"{name} differs from the golden output"
+
+
+@pytest.mark.parametrize("fmt, name", [
+    ("rss", "feed.rss.xml"),
+    ("atom", "feed.atom.xml"),
+    ("json", "feed.json"),
+])
+def test_feed_golden_output(fmt, name):
+    body = render_feed(fmt, _channel(), _items())
+    _golden(name, body)
+    # Cached item fragments must assemble to the same bytes
+    fragments = FragmentCache()
+    render_feed(fmt, _channel(), _items(), fragments)
+    assert render_feed(fmt, _channel(), _items(), fragments) == body
+
+
+@pytest.mark.parametrize("fmt", ["rss", "atom"])
+def test_xml_feeds_parse_and_keep_content(fmt):
+    root = ET.fromstring(render_feed(fmt, _channel(), _items()).encode("utf-8"))
+    texts = [element.text for element in root.iter() if element.text]
+    assert HARD_HTML in texts
+    assert any("😀" in text for text in texts)
+
+
+def test_json_feed_keeps_content():
+    data = json.loads(render_feed("json", _channel(), _items()))
+    assert data["items"][0]["content_html"] == HARD_HTML
+    assert data["hubs"] == [{"type": "WebSub", "url": "https://hub.example.test/?x=1&y=2"}]
+    assert data["next_url"] == "https://example.test/feed.json?page=1"
+
+
+def test_content_is_cdata_in_rss():
+    assert isinstance(CData(HARD_HTML), str)
+    body = render_feed("rss", _channel(), _items())
+    assert "<content:encoded><![CDATA[<p>Tricky ]]]]><![CDATA[> content" in body
@@ -0,0 +1,116 @@
+"""Request coalescing (_singleflight.py) under concurrent callers."""
+
+import time
+import asyncio
+import threading
+
+from _singleflight import SingleFlight
+
+CALLERS = 16
+
+
+def run_concurrently(flight, key, loader):
+    """Start CALLERS threads on ``key``; the loader runs once all have joined."""
+    results, errors = [], []
+    joined = threading.Event()
+
+    def gated():
+        # Hold the leader until every other caller is waiting on it
+        assert joined.wait(5)
+        return loader()
+
+    def call():
+        try:
+            results.append(flight.do(key, gated))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while True:
+        with flight._lock:
+            call_state = flight._calls.get(key)
+            if call_state is not None and call_state.waiters == CALLERS - 1:
+                break
+        assert time.monotonic() < deadline, "callers did not coalesce"
+        time.sleep(0.001)
+    joined.set()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def test_concurrent_misses_run_the_loader_once():
+    flight = SingleFlight()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return object()
+
+    results, errors = run_concurrently(flight, 'feed', loader)
+    assert not errors
+    assert len(calls) == 1
+    assert len(results) == CALLERS
+    assert len({id(result) for result, _ in results}) == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * (CALLERS - 1)
+    assert not flight.in_flight('feed')
+
+
+def test_loader_error_reaches_every_waiter_without_poisoning_the_key():
+    flight = SingleFlight()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise RuntimeError('upstream down')
+
+    results, errors = run_concurrently(flight, 'feed', failing)
+    assert not results
+    assert len(calls) == 1
+    assert len(errors) == CALLERS
+    assert all(isinstance(e, RuntimeError) and str(e) == 'upstream down' for e in errors)
+
+    # The next call runs the loader afresh
+    assert flight.do('feed', lambda: 'fresh') == ('fresh', False)
+
+
+def test_async_callers_are_coalesced():
+    flight = SingleFlight()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'feed'
+
+    async def main():
+        return await asyncio.gather(*[flight.do_async('feed', loader) for _ in range(CALLERS)])
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert [result for result, _ in results] == ['feed'] * CALLERS
+    assert sum(not shared for _, shared in results) == 1
+
+
+def test_async_error_reaches_every_waiter():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError('upstream down')
+
+    async def main():
+        return await asyncio.gather(*[flight.do_async('feed', failing) for _ in range(4)],
+                                    return_exceptions=True)
+
+    errors = asyncio.run(main())
+    assert all(isinstance(e, RuntimeError) for e in errors)
+    assert asyncio.run(flight.do_async('feed', _fresh)) == ('fresh', False)
+
+
+async def _fresh():
+    return 'fresh'
+
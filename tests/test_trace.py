@@ -0,0 +1,104 @@
+"""Request tracing (_trace.py): Server-Timing quoting and structured events."""
+
+import json
+import threading
+
+import _trace
+from _poststore import load_store, save_store
+from _trace import instrumented, note, tag
+
+
+@instrumented("test")
+def handler(request):
+    for name, value in request.items():
+        tag(name, value)
+    note("upstream", status=200)
+    return {"statusCode": 200, "headers": {}, "body": ""}
+
+
+def test_server_timing_quotes_tag_values(capsys):
+    headers = handler({
+        "quote": 'a"b',
+        "backslash": "c\\d",
+        "control": "line\r\nSet-Cookie: x=1\x00\x7f",
+        "unicode": "café \U0001f600",
+    })["headers"]
+    timing = headers["Server-Timing"]
+    assert 'quote;desc="a\\"b"' in timing
+    assert 'backslash;desc="c\\\\d"' in timing
+    assert 'control;desc="lineSet-Cookie: x=1"' in timing
+    assert 'unicode;desc="caf? ?"' in timing
+    timing.encode("ascii")
+    capsys.readouterr()
+
+
+def test_note_joins_the_request_log_line(capsys):
+    handler({})
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["events"] == [{"event": "upstream", "status": 200}]
+
+
+def test_note_outside_a_request_logs_its_own_line(capsys, monkeypatch):
+    monkeypatch.setattr(_trace, "LOG_ENABLED", True)
+    note("refresh_error", submolt="s", error="boom")
+    assert json.loads(capsys.readouterr().out) == {"event": "refresh_error", "submolt": "s", "error": "boom"}
+
+
+class BrokenCache:
+    def get(self, key):
+        raise OSError("cache down")
+
+    def set(self, key, entry, ttl=None):
+        raise OSError("cache down")
+
+
+def test_store_errors_join_the_request_log_line(capsys):
+    @instrumented("test")
+    def store_handler(request):
+        assert load_store(BrokenCache(), "posts:s")["posts"] == []
+        save_store(BrokenCache(), "posts:s", {"posts": []}, 0)
+        return {"statusCode": 200, "headers": {}, "body": ""}
+
+    store_handler({})
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["events"] == [
+        {"event": "store_error", "op": "read", "key": "posts:s", "error": "cache down"},
+        {"event": "store_error", "op": "write", "key": "posts:s", "error": "cache down"},
+    ]
+
+
+def test_overlapping_profiled_requests_profile_one_at_a_time(capsys, monkeypatch):
+    monkeypatch.setattr(_trace, "PROFILE_MODE", "cprofile")
+    monkeypatch.setattr(_trace, "PROFILE_RATE", 1.0)
+    overlap = threading.Barrier(2, timeout=5)
+
+    @instrumented("test")
+    def slow(request):
+        overlap.wait()
+        overlap.wait()
+        return {"statusCode": 200, "headers": {}, "body": ""}
+
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(slow({}))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert not errors
+    assert [r["statusCode"] for r in results] == [200, 200]
+    records = [json.loads(line) for line in capsys.readouterr().out.strip().splitlines()]
+    assert sorted("profile" in record for record in records) == [False, True]
+
+    # The profiler is free again for the next sampled request
+    quick = instrumented("test")(lambda request: {"statusCode": 200, "headers": {}, "body": ""})
+    quick({})
+    assert json.loads(capsys.readouterr().out)["profile"]["mode"] == "cprofile"
@@ -0,0 +1,142 @@
+"""WebSub hub (_websub.py) against the feeds it is pinged for, over local HTTP."""
+
+import re
+import html
+import json
+import time
+
+import pytest
+import requests
+
+import build
+import feed
+import index
+import ingest
+from _feedcache import MemoryCache
+from _formats import FORMATS
+from _molthub_fake import FakeMolthub
+from _websub import Hub, feed_items
+from _websub_fake import Site, Subscriber
+
+HUB_URL = "http://hub.test/"
+LINK_RE = re.compile(r'<(?:atom:)?link\b[^>]*>')
+
+
+def self_and_hub(body):
+    """The ``rel="self"`` and ``rel="hub"`` URLs a feed document advertises."""
+    if body.lstrip().startswith("{"):
+        data = json.loads(body)
+        return data.get("feed_url"), [hub["url"] for hub in data.get("hubs", [])]
+    rels = {}
+    for tag in LINK_RE.findall(body):
+        rel = re.search(r'rel="([^"]*)"', tag)
+        href = re.search(r'href="([^"]*)"', tag)
+        if rel and href:
+            rels.setdefault(rel.group(1), []).append(html.unescape(href.group(1)))
+    return rels.get("self", [None])[0], rels.get("hub", [])
+
+
+@pytest.fixture
+def hub():
+    hub = Hub(HUB_URL, store_path=None)
+    yield hub
+    hub.close()
+
+
+@pytest.fixture
+def subscriber():
+    server = Subscriber()
+    yield server
+    server.close()
+
+
+def subscribe(hub, topic, callback):
+    form = {"hub.mode": ["subscribe"], "hub.topic": [topic], "hub.callback": [callback]}
+    assert hub.handle(form) == (202, "Accepted\n")
+    # Verified, and the baseline of already-published items recorded
+    deadline = time.monotonic() + 5
+    while hub.state["topics"].get(topic, {}).get("seen") is None:
+        assert time.monotonic() < deadline, f"subscription to {topic} not verified"
+        time.sleep(0.01)
+    assert hub.subscribers(topic) == [callback]
+
+
+def delivered_ids(delivery):
+    return [item_id for item_id, _ in feed_items(delivery["body"].decode("utf-8"))[1]]
+
+
+def test_ingest_pings_the_self_links_of_the_static_feeds(reports, tmp_path, monkeypatch, hub, subscriber):
+    out = tmp_path / "public"
+    site = Site(str(out))
+    try:
+        monkeypatch.setattr(index, "FEED_BASE_URL", site.url)
+        monkeypatch.setattr(index, "HUB_URL", HUB_URL)
+        monkeypatch.setattr(index, "PAGE_SIZE", 2)
+        for day in range(8, 12):
+            reports(day)
+        build.build_feeds(str(out))
+
+        topics = ingest.feed_topics()
+        for fmt, topic in zip(build.FEED_FILES, topics):
+            body = requests.get(topic).text
+            assert self_and_hub(body) == (topic, [HUB_URL])
+            subscribe(hub, topic, subscriber.callback(fmt))
+        # Archive pages don't change and aren't pinged, so they name no hub
+        for fmt in build.FEED_FILES:
+            archive = requests.get(index.static_feed_url(fmt, 1)).text
+            assert self_and_hub(archive) == (index.static_feed_url(fmt, 1), [])
+
+        reports(12)
+        build.build_feeds(str(out))
+        assert [hub.publish(topic) for topic in topics] == [1] * len(topics)
+
+        deliveries = subscriber.wait(len(topics))
+        assert sorted(d["path"] for d in deliveries) == sorted(f"/{fmt}" for fmt in build.FEED_FILES)
+        for delivery in deliveries:
+            assert delivered_ids(delivery) == [f"{site.url}/report/2026-02-12"]
+        # Nothing new: nothing delivered
+        assert [hub.publish(topic) for topic in topics] == [0] * len(topics)
+    finally:
+        site.close()
+
+
+def test_molthub_feed_pings_its_own_self_links(monkeypatch, hub, subscriber):
+    def post(n):
+        created = f"2026-02-{n:02d}T08:00:00Z"
+        return {"id": f"post-{n}", "title": f"Post {n}", "content": f"Body {n}",
+                "createdAt": created, "updatedAt": created}
+
+    molthub = FakeMolthub([post(2), post(1)])
+    site = Site(function=feed.handler)
+    try:
+        monkeypatch.setenv("MOLTHUB_API_KEY", "key")
+        monkeypatch.setattr(feed, "API_BASE", molthub.api_base)
+        monkeypatch.setattr(feed, "_cache", MemoryCache())
+        monkeypatch.setattr(feed, "_filtered", feed.VariantLRU())
+        monkeypatch.setattr(feed, "SUBMOLT_IDS", ["sub-1"])
+        monkeypatch.setattr(feed, "FEED_URL", f"{site.url}/api/feed")
+        monkeypatch.setattr(feed, "HUB_URL", HUB_URL)
+        pings = []
+        monkeypatch.setattr(feed, "ping_in_background", pings.extend)
+
+        feed.refresh_feed("sub-1", "key")
+        assert pings == []
+        topics = [feed.feed_url(fmt, "sub-1") for fmt in FORMATS]
+        for fmt, topic in zip(FORMATS, topics):
+            assert self_and_hub(requests.get(topic).text) == (topic, [HUB_URL])
+            subscribe(hub, topic, subscriber.callback(fmt))
+        # Filtered variants are never pinged, so they name no hub
+        filtered = requests.get(f"{site.url}/api/feed", params={"submolt": "sub-1", "author": "ezekiel_prophet"})
+        assert filtered.status_code == 200
+        assert self_and_hub(filtered.text)[1] == []
+
+        molthub.posts = [post(3), post(2), post(1)]
+        feed.refresh_feed("sub-1", "key")
+        assert pings == topics
+        assert [hub.publish(topic) for topic in pings] == [1] * len(topics)
+        deliveries = subscriber.wait(len(topics))
+        for delivery in deliveries:
+            assert delivered_ids(delivery) == ["https://molthub.studio/p/post-3"]
+    finally:
+        site.close()
+        molthub.close()